@@ -2,24 +2,43 @@ import os
 from flask import Flask
 from .config import Config
 from .extensions import db, migrate, bcrypt, cors
+from . import commands, compression, database, json_provider, metrics, preload
+from .services import export_jobs
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
-    db.init_app(app)
-    migrate.init_app(app, db)
+    json_provider.init_app(app)
+    database.init_app(app)
+    metrics.init_app(app)
+    migrate.init_app(app, db, render_as_batch=True)
     bcrypt.init_app(app)
     cors.init_app(app)
+    compression.init_app(app)
+    commands.init_app(app)
 
     from .routes.auth import auth_bp
     from .routes.presentations import presentations_bp
     from .routes.slides import slides_bp
     from .routes.elements import elements_bp
+    from .routes.exports import exports_bp
+    from .routes.media import media_bp
+    from .routes.changes import changes_bp
+    from .routes.metrics import metrics_bp
+    from .routes.search import search_bp
 
     app.register_blueprint(auth_bp, url_prefix='/api')
     app.register_blueprint(presentations_bp, url_prefix='/api')
     app.register_blueprint(slides_bp, url_prefix='/api')
     app.register_blueprint(elements_bp, url_prefix='/api')
+    app.register_blueprint(exports_bp, url_prefix='/api')
+    app.register_blueprint(media_bp, url_prefix='/api')
+    app.register_blueprint(changes_bp, url_prefix='/api')
+    app.register_blueprint(search_bp, url_prefix='/api')
+    app.register_blueprint(metrics_bp)
+
+    export_jobs.init_app(app)
+    preload.init_app(app)
 
     return app
\ No newline at end of file
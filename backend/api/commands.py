@@ -0,0 +1,72 @@
+import time
+import click
+from flask.cli import AppGroup
+from .services.changes import compact_changes
+from .services.images import regenerate_renditions
+from .services.search import rebuild_search_index
+from .services.slide_order import rebalance_crowded_presentations
+from .services.slide_thumbnails import remove_unreferenced_thumbnails
+from .services.storage import collect_orphan_media
+from .services.uploads import expire_stale_sessions
+
+uploads_cli = AppGroup('uploads')
+changes_cli = AppGroup('changes')
+thumbnails_cli = AppGroup('thumbnails')
+search_cli = AppGroup('search')
+slides_cli = AppGroup('slides')
+media_cli = AppGroup('media')
+
+@uploads_cli.command('gc')
+@click.option('--max-age', type=int, default=None, help='Seconds since the last chunk; defaults to UPLOAD_SESSION_TTL.')
+def gc_uploads(max_age):
+    sessions, orphans = expire_stale_sessions(max_age=max_age)
+    click.echo(f"Removed {sessions} stale upload sessions and {orphans} orphaned chunk files")
+
+@changes_cli.command('compact')
+@click.option('--max-age', type=int, default=None, help='Seconds to keep log entries; defaults to CHANGE_LOG_RETENTION.')
+def compact_change_log(max_age):
+    removed = compact_changes(max_age=max_age)
+    click.echo(f"Removed {removed} change log entries")
+
+@thumbnails_cli.command('gc')
+@click.option('--min-age', type=int, default=3600, help='Only remove unreferenced files older than this many seconds.')
+def gc_thumbnails(min_age):
+    removed = remove_unreferenced_thumbnails(min_age)
+    click.echo(f"Removed {removed} unreferenced slide thumbnails")
+
+@search_cli.command('reindex')
+def reindex_search():
+    started = time.perf_counter()
+    presentations, slides = rebuild_search_index()
+    click.echo(f"Indexed {presentations} presentation titles and {slides} slides in {time.perf_counter() - started:.1f}s")
+
+@slides_cli.command('rebalance')
+@click.option('--min-gap', type=int, default=None, help='Respace decks where two neighbouring slides are closer than this.')
+def rebalance_slides(min_gap):
+    kwargs = {} if min_gap is None else {'min_gap': min_gap}
+    rebalanced = rebalance_crowded_presentations(**kwargs)
+    click.echo(f"Respaced slide positions in {rebalanced} presentations")
+
+@media_cli.command('gc')
+@click.option('--dry-run', is_flag=True, help='Report what would be removed without deleting anything.')
+@click.option('--batch-size', type=int, default=None, help='Assets per transaction; defaults to MEDIA_GC_BATCH_SIZE.')
+@click.option('--min-age', type=int, default=None, help='Only reclaim media older than this many seconds; defaults to MEDIA_GC_MIN_AGE.')
+def gc_media(dry_run, batch_size, min_age):
+    stats = collect_orphan_media(dry_run=dry_run, batch_size=batch_size, min_age=min_age)
+    prefix = 'Would remove' if dry_run else 'Removed'
+    click.echo(f"{prefix} {stats['assets_removed']} orphaned media assets and {stats['files_removed']} files "
+               f"({stats['bytes_reclaimed'] / (1024 * 1024):.1f} MB); {stats['ref_counts_repaired']} reference counts out of date")
+
+@media_cli.command('renditions')
+@click.option('--batch-size', type=int, default=None, help='Assets per query; defaults to MEDIA_GC_BATCH_SIZE.')
+def create_missing_renditions(batch_size):
+    stats = regenerate_renditions(batch_size=batch_size)
+    click.echo(f"Created renditions for {stats['assets_updated']} images; {stats['assets_failed']} failed")
+
+def init_app(app):
+    app.cli.add_command(uploads_cli)
+    app.cli.add_command(changes_cli)
+    app.cli.add_command(thumbnails_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(slides_cli)
+    app.cli.add_command(media_cli)
\ No newline at end of file
@@ -7,4 +7,71 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'you-will-never-guess'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///site.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    UPLOAD_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'static/uploads')
\ No newline at end of file
+    DATABASE_PROFILE = (os.environ.get('DATABASE_PROFILE') or 'auto').lower()
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL'
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL'
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT') or 5000)
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE') or 256 * 1024 * 1024)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 10)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 20)
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT') or 30)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 1800)
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+    AUTH_CACHE_SIZE = int(os.environ.get('AUTH_CACHE_SIZE') or 10000)
+    AUTH_CACHE_TTL = int(os.environ.get('AUTH_CACHE_TTL') or 300)
+    PRELOAD_HEAVY_MODULES = os.environ.get('PRELOAD_HEAVY_MODULES', '').lower() in ('1', 'true', 'yes')
+    JSON_USE_ORJSON = os.environ.get('JSON_USE_ORJSON', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE') or 500)
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL') or 6)
+    CHANGE_LOG_KEEP_REVISIONS = int(os.environ.get('CHANGE_LOG_KEEP_REVISIONS') or 500)
+    CHANGE_LOG_COMPACT_EVERY = int(os.environ.get('CHANGE_LOG_COMPACT_EVERY') or 100)
+    CHANGE_LOG_RETENTION = int(os.environ.get('CHANGE_LOG_RETENTION') or 7 * 24 * 3600)
+    EVENTS_QUEUE_SIZE = int(os.environ.get('EVENTS_QUEUE_SIZE') or 16)
+    EVENTS_MAX_SUBSCRIBERS = int(os.environ.get('EVENTS_MAX_SUBSCRIBERS') or 2000)
+    EVENTS_HEARTBEAT_INTERVAL = float(os.environ.get('EVENTS_HEARTBEAT_INTERVAL') or 15)
+    EVENTS_TICKET_TTL = int(os.environ.get('EVENTS_TICKET_TTL') or 60)
+    UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or os.path.join(os.path.abspath(os.path.dirname(__file__)), 'uploads')
+    UPLOAD_INCOMING_FOLDER = os.environ.get('UPLOAD_INCOMING_FOLDER') or os.path.join(os.path.abspath(os.path.dirname(__file__)), 'incoming')
+    EXPORT_FOLDER = os.environ.get('EXPORT_FOLDER') or os.path.join(os.path.abspath(os.path.dirname(__file__)), 'exports')
+    UPLOAD_MAX_SIZE = int(os.environ.get('UPLOAD_MAX_SIZE') or 2 * 1024 * 1024 * 1024)
+    UPLOAD_CHUNK_MAX_SIZE = int(os.environ.get('UPLOAD_CHUNK_MAX_SIZE') or 16 * 1024 * 1024)
+    UPLOAD_CHUNK_CLAIM_TTL = int(os.environ.get('UPLOAD_CHUNK_CLAIM_TTL') or 300)
+    UPLOAD_SESSION_TTL = int(os.environ.get('UPLOAD_SESSION_TTL') or 24 * 3600)
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+    MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get('MEDIA_ACCEL_REDIRECT_PREFIX')
+    MEDIA_URL_TTL = int(os.environ.get('MEDIA_URL_TTL') or 3600)
+    MEDIA_IMMUTABLE_MAX_AGE = int(os.environ.get('MEDIA_IMMUTABLE_MAX_AGE') or 365 * 24 * 3600)
+    IMAGE_RENDITIONS = {'thumb': 320, 'editor': 1280, 'export': 1920}
+    IMAGE_RENDITIONS_WEBP = os.environ.get('IMAGE_RENDITIONS_WEBP', '').lower() in ('1', 'true', 'yes')
+    VIDEO_TRANSCODE_WORKERS = int(os.environ.get('VIDEO_TRANSCODE_WORKERS') or 2)
+    VIDEO_TRANSCODE_QUEUE_LIMIT = int(os.environ.get('VIDEO_TRANSCODE_QUEUE_LIMIT') or 8)
+    EXPORT_WORKERS = int(os.environ.get('EXPORT_WORKERS') or 2)
+    EXPORT_JOB_STALE_AFTER = int(os.environ.get('EXPORT_JOB_STALE_AFTER') or 900)
+    EXPORT_ARTIFACT_GRACE = int(os.environ.get('EXPORT_ARTIFACT_GRACE') or 3600)
+    EXPORT_STREAM_MEDIA = os.environ.get('EXPORT_STREAM_MEDIA', 'true').lower() in ('1', 'true', 'yes')
+    YOUTUBE_THUMBNAIL_BASE_URL = os.environ.get('YOUTUBE_THUMBNAIL_BASE_URL') or 'https://img.youtube.com/vi'
+    THUMBNAIL_CACHE_FOLDER = os.environ.get('THUMBNAIL_CACHE_FOLDER') or os.path.join(os.path.abspath(os.path.dirname(__file__)), 'cache/youtube')
+    THUMBNAIL_CACHE_TTL = int(os.environ.get('THUMBNAIL_CACHE_TTL') or 7 * 24 * 3600)
+    THUMBNAIL_NEGATIVE_CACHE_TTL = int(os.environ.get('THUMBNAIL_NEGATIVE_CACHE_TTL') or 3600)
+    THUMBNAIL_FETCH_TIMEOUT = float(os.environ.get('THUMBNAIL_FETCH_TIMEOUT') or 5)
+    THUMBNAIL_FETCH_WORKERS = int(os.environ.get('THUMBNAIL_FETCH_WORKERS') or 8)
+    SLIDE_THUMBNAIL_FOLDER = os.environ.get('SLIDE_THUMBNAIL_FOLDER') or os.path.join(os.path.abspath(os.path.dirname(__file__)), 'cache/slides')
+    SLIDE_THUMBNAIL_WIDTH = int(os.environ.get('SLIDE_THUMBNAIL_WIDTH') or 320)
+    SLIDE_THUMBNAIL_FORMAT = (os.environ.get('SLIDE_THUMBNAIL_FORMAT') or 'png').lower()
+    SLIDE_THUMBNAIL_FONT = os.environ.get('SLIDE_THUMBNAIL_FONT') or 'DejaVuSans.ttf'
+    SLIDE_THUMBNAIL_WORKERS = int(os.environ.get('SLIDE_THUMBNAIL_WORKERS') or 2)
+    SLIDE_THUMBNAIL_MAX_AGE = int(os.environ.get('SLIDE_THUMBNAIL_MAX_AGE') or 365 * 24 * 3600)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN') or ''
+    SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get('SLOW_REQUEST_THRESHOLD_MS') or 1000)
+    SLOW_REQUEST_LOG_SIZE = int(os.environ.get('SLOW_REQUEST_LOG_SIZE') or 100)
+    SLOW_REQUEST_QUERIES = int(os.environ.get('SLOW_REQUEST_QUERIES') or 10)
+    EXPORT_PHASE_TIMINGS = os.environ.get('EXPORT_PHASE_TIMINGS', '').lower() in ('1', 'true', 'yes')
+    PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', '').lower() in ('1', 'true', 'yes')
+    PROFILER_INTERVAL = float(os.environ.get('PROFILER_INTERVAL') or 0.005)
+    PROFILE_FOLDER = os.environ.get('PROFILE_FOLDER') or os.path.join(os.path.abspath(os.path.dirname(__file__)), 'cache/profiles')
+    SEARCH_TS_CONFIG = os.environ.get('SEARCH_TS_CONFIG') or 'simple'
+    SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS') or 50)
+    SEARCH_TITLE_WEIGHT = float(os.environ.get('SEARCH_TITLE_WEIGHT') or 2)
+    MEDIA_GC_MIN_AGE = int(os.environ.get('MEDIA_GC_MIN_AGE') or 3600)
+    MEDIA_GC_BATCH_SIZE = int(os.environ.get('MEDIA_GC_BATCH_SIZE') or 500)
\ No newline at end of file
@@ -0,0 +1,59 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from .extensions import db
+
+PROFILES = ('auto', 'sqlite', 'server', 'none')
+
+def resolve_profile(config):
+    profile = config['DATABASE_PROFILE']
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown DATABASE_PROFILE: {profile}")
+    if profile != 'auto':
+        return profile
+    if make_url(config['SQLALCHEMY_DATABASE_URI']).get_backend_name() == 'sqlite':
+        return 'sqlite'
+    return 'server'
+
+def engine_options(config, profile):
+    if profile != 'server':
+        return {}
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING']
+    }
+
+def sqlite_pragmas(config):
+    return [
+        f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}",
+        f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}"
+    ]
+
+def install_sqlite_pragmas(engine, pragmas):
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+def init_app(app):
+    profile = resolve_profile(app.config)
+    options = engine_options(app.config, profile)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    db.init_app(app)
+
+    pragmas = ['PRAGMA foreign_keys=ON']
+    if profile == 'sqlite':
+        pragmas += sqlite_pragmas(app.config)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                install_sqlite_pragmas(engine, pragmas)
\ No newline at end of file
@@ -0,0 +1,32 @@
+import hashlib
+from flask import request, make_response
+from .services.media_urls import media_url_expiry
+
+ENCODING_SUFFIXES = ('-gzip', '-br')
+
+def presentation_etag(presentation):
+    return f"{presentation.id}-{presentation.version}-{media_url_expiry()}"
+
+def listing_etag(user_id, count, last_updated_at, version_sum, *args):
+    raw = ':'.join(str(part) for part in (user_id, count, last_updated_at, version_sum, media_url_expiry()) + args)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def matching_etag(etag):
+    for candidate in request.if_none_match.as_set():
+        base = candidate
+        for suffix in ENCODING_SUFFIXES:
+            if base.endswith(suffix):
+                base = base[:-len(suffix)]
+                break
+        if base == etag:
+            return candidate
+    return None
+
+def not_modified(matched_etag):
+    response = make_response('', 304)
+    return with_etag(response, matched_etag)
+
+def with_etag(response, etag):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
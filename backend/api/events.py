@@ -0,0 +1,111 @@
+import json
+import queue
+import threading
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+RECONNECT_DELAY_MS = 3000
+
+class Subscription:
+    def __init__(self, channel, maxsize):
+        self.channel = channel
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize)
+
+    def push(self, message):
+        while True:
+            try:
+                self._queue.put_nowait(message)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class EventBroker:
+    def __init__(self, queue_size, max_subscribers):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._channels = {}
+        self._subscribers = 0
+        self.published = 0
+
+    def subscribe(self, channel):
+        with self._lock:
+            if self._subscribers >= self.max_subscribers:
+                return None
+            subscription = Subscription(channel, self.queue_size)
+            self._channels.setdefault(channel, set()).add(subscription)
+            self._subscribers += 1
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if not subscribers or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._channels[subscription.channel]
+            self._subscribers -= 1
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+            self.published += 1
+        for subscription in subscribers:
+            subscription.push(message)
+        return len(subscribers)
+
+    def stats(self):
+        with self._lock:
+            return {'channels': len(self._channels), 'subscribers': self._subscribers, 'published': self.published}
+
+_broker = None
+_broker_lock = threading.Lock()
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = EventBroker(current_app.config['EVENTS_QUEUE_SIZE'], current_app.config['EVENTS_MAX_SUBSCRIBERS'])
+        return _broker
+
+def presentation_channel(presentation_id):
+    return f"presentation:{presentation_id}"
+
+def publish_after_commit(session, presentation_id, revision):
+    pending = session.info.setdefault('pending_events', {})
+    pending[presentation_id] = max(revision, pending.get(presentation_id, 0))
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending_events(session):
+    pending = session.info.pop('pending_events', None)
+    if not pending or _broker is None:
+        return
+    for presentation_id, revision in pending.items():
+        _broker.publish(presentation_channel(presentation_id), json.dumps({'presentation_id': presentation_id, 'revision': revision}))
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_events(session):
+    session.info.pop('pending_events', None)
+
+def format_event(data):
+    return ''.join(f"data: {line}\n" for line in data.splitlines()) + '\n'
+
+def stream_events(subscription, initial, heartbeat_interval):
+    yield f"retry: {RECONNECT_DELAY_MS}\n"
+    yield format_event(initial)
+    while True:
+        message = subscription.get(heartbeat_interval)
+        yield format_event(message) if message is not None else ': heartbeat\n\n'
\ No newline at end of file
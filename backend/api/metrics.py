@@ -0,0 +1,307 @@
+import heapq
+import os
+import sys
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from .extensions import db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+PHASE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+BACKGROUND_ENDPOINT = 'background'
+UNMATCHED_ENDPOINT = 'unmatched'
+SLOW_STATEMENT_MAX_LENGTH = 500
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class PhaseTimings:
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def server_timing(self):
+        return ', '.join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.phases.items())
+
+class SamplingProfiler:
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def collapsed(self):
+        return '\n'.join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+class RequestMetrics:
+    def __init__(self, max_queries):
+        self.started = time.perf_counter()
+        self.max_queries = max_queries
+        self.statements = 0
+        self.statement_seconds = 0.0
+        self.slowest = []
+        self.profiler = None
+
+    def add_statement(self, statement, duration):
+        self.statements += 1
+        self.statement_seconds += duration
+        item = (duration, self.statements, statement)
+        if len(self.slowest) < self.max_queries:
+            heapq.heappush(self.slowest, item)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, item)
+
+    def slowest_statements(self):
+        return [{'duration_ms': round(duration * 1000, 2), 'statement': ' '.join(statement.split())[:SLOW_STATEMENT_MAX_LENGTH]}
+                for duration, _seq, statement in sorted(self.slowest, reverse=True)]
+
+class MetricsRegistry:
+    def __init__(self, slow_log_size):
+        self._lock = threading.Lock()
+        self.requests = Counter()
+        self.latency = {}
+        self.response_size = {}
+        self.statements = {}
+        self.statement_total = Counter()
+        self.statement_seconds = Counter()
+        self.export_phases = {}
+        self.slow_requests = deque(maxlen=slow_log_size)
+
+    def observe_request(self, endpoint, method, status, elapsed, size, request_metrics):
+        with self._lock:
+            self.requests[(endpoint, method, str(status))] += 1
+            self.latency.setdefault((endpoint, method), Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            if size is not None:
+                self.response_size.setdefault(endpoint, Histogram(SIZE_BUCKETS)).observe(size)
+            self.statements.setdefault(endpoint, Histogram(STATEMENT_BUCKETS)).observe(request_metrics.statements)
+            self.statement_total[endpoint] += request_metrics.statements
+            self.statement_seconds[endpoint] += request_metrics.statement_seconds
+
+    def observe_background_statement(self, duration):
+        with self._lock:
+            self.statement_total[BACKGROUND_ENDPOINT] += 1
+            self.statement_seconds[BACKGROUND_ENDPOINT] += duration
+
+    def observe_export_phases(self, timings):
+        with self._lock:
+            for phase, seconds in timings.phases.items():
+                self.export_phases.setdefault(phase, Histogram(PHASE_BUCKETS)).observe(seconds)
+
+    def record_slow_request(self, entry):
+        with self._lock:
+            self.slow_requests.append(entry)
+
+    def slow_request_log(self):
+        with self._lock:
+            return list(self.slow_requests)
+
+    def render(self, runtime_metrics):
+        with self._lock:
+            lines = []
+            write_counter(lines, 'http_requests_total', 'Requests by endpoint, method and status',
+                          {labels(endpoint=e, method=m, status=s): v for (e, m, s), v in self.requests.items()})
+            write_histograms(lines, 'http_request_duration_seconds', 'Request latency',
+                             {labels(endpoint=e, method=m): h for (e, m), h in self.latency.items()})
+            write_histograms(lines, 'http_response_size_bytes', 'Response body size',
+                             {labels(endpoint=e): h for e, h in self.response_size.items()})
+            write_histograms(lines, 'db_statements_per_request', 'SQL statements executed per request',
+                             {labels(endpoint=e): h for e, h in self.statements.items()})
+            write_counter(lines, 'db_statements_total', 'SQL statements executed',
+                          {labels(endpoint=e): v for e, v in self.statement_total.items()})
+            write_counter(lines, 'db_statement_duration_seconds_total', 'Time spent executing SQL statements',
+                          {labels(endpoint=e): round(v, 6) for e, v in self.statement_seconds.items()})
+            write_histograms(lines, 'export_phase_duration_seconds', 'PPTX export time per phase',
+                             {labels(phase=p): h for p, h in self.export_phases.items()})
+        for name, (metric_type, help_text, values) in runtime_metrics.items():
+            write_metric(lines, name, help_text, metric_type, values)
+        return '\n'.join(lines) + '\n'
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def labels(**values):
+    return ','.join(f'{key}="{escape_label(value)}"' for key, value in values.items())
+
+def write_metric(lines, name, help_text, metric_type, values):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {metric_type}")
+    for label_set, value in values.items():
+        lines.append(f"{name}{{{label_set}}} {value}" if label_set else f"{name} {value}")
+
+def write_counter(lines, name, help_text, values):
+    write_metric(lines, name, help_text, 'counter', values)
+
+def write_histograms(lines, name, help_text, histograms):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for label_set, histogram in histograms.items():
+        prefix = f"{label_set}," if label_set else ''
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{label_set}}} {round(histogram.sum, 6)}")
+        lines.append(f"{name}_count{{{label_set}}} {histogram.count}")
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry(current_app.config['SLOW_REQUEST_LOG_SIZE'])
+        return _registry
+
+def collect_runtime_metrics():
+    from .events import get_broker
+    from .security import get_token_cache
+
+    auth = get_token_cache().stats()
+    broker = get_broker().stats()
+    runtime_metrics = {
+        'auth_cache_entries': ('gauge', 'Cached authenticated tokens', {'': auth['size']}),
+        'auth_cache_lookups_total': ('counter', 'Token cache lookups by result',
+                                     {labels(result='hit'): auth['hits'], labels(result='miss'): auth['misses']}),
+        'auth_cache_evictions_total': ('counter', 'Token cache evictions', {'': auth['evictions']}),
+        'events_channels': ('gauge', 'Presentations with live subscribers', {'': broker['channels']}),
+        'events_subscribers': ('gauge', 'Open event stream subscriptions', {'': broker['subscribers']}),
+        'events_published_total': ('counter', 'Revision notifications published', {'': broker['published']})
+    }
+    checked_out = getattr(db.engine.pool, 'checkedout', None)
+    if checked_out is not None:
+        runtime_metrics['db_pool_checked_out'] = ('gauge', 'Connections checked out of the pool', {'': checked_out()})
+    return runtime_metrics
+
+def render_prometheus():
+    return get_registry().render(collect_runtime_metrics())
+
+def export_phase_timings():
+    return PhaseTimings() if current_app.config['EXPORT_PHASE_TIMINGS'] else None
+
+def record_export_phases(timings):
+    if timings is not None:
+        get_registry().observe_export_phases(timings)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_started')
+    if not started:
+        return
+    duration = time.perf_counter() - started.pop()
+    request_metrics = g.get('request_metrics') if has_request_context() else None
+    if request_metrics is not None:
+        request_metrics.add_statement(statement, duration)
+    elif _registry is not None:
+        _registry.observe_background_statement(duration)
+
+def _discard_failed_statement(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_started'):
+        connection.info['query_started'].pop()
+
+def start_request():
+    config = current_app.config
+    g.request_metrics = RequestMetrics(config['SLOW_REQUEST_QUERIES'])
+    if config['PROFILER_ENABLED'] and request.headers.get('X-Profile') == '1':
+        g.request_metrics.profiler = SamplingProfiler(threading.get_ident(), config['PROFILER_INTERVAL'])
+        g.request_metrics.profiler.start()
+
+def write_profile(profiler, endpoint):
+    folder = current_app.config['PROFILE_FOLDER']
+    os.makedirs(folder, exist_ok=True)
+    filename = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{endpoint}-{uuid.uuid4().hex[:8]}.folded"
+    with open(os.path.join(folder, filename), 'w') as f:
+        f.write(profiler.collapsed())
+    return filename
+
+def finish_request(response):
+    request_metrics = g.pop('request_metrics', None)
+    if request_metrics is None:
+        return response
+    elapsed = time.perf_counter() - request_metrics.started
+    endpoint = request.endpoint or UNMATCHED_ENDPOINT
+
+    if request_metrics.profiler is not None:
+        request_metrics.profiler.stop()
+        response.headers['X-Profile-File'] = write_profile(request_metrics.profiler, endpoint)
+
+    registry = get_registry()
+    registry.observe_request(endpoint, request.method, response.status_code, elapsed, response.content_length, request_metrics)
+
+    if elapsed * 1000 >= current_app.config['SLOW_REQUEST_THRESHOLD_MS']:
+        entry = {
+            'at': datetime.utcnow().isoformat(),
+            'endpoint': endpoint,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 1),
+            'statements': request_metrics.statements,
+            'statement_ms': round(request_metrics.statement_seconds * 1000, 1),
+            'slowest_statements': request_metrics.slowest_statements()
+        }
+        registry.record_slow_request(entry)
+        current_app.logger.warning(
+            'Slow request %s %s: %s ms, %s statements in %s ms%s',
+            entry['method'], entry['path'], entry['duration_ms'], entry['statements'], entry['statement_ms'],
+            ''.join(f"\n  {query['duration_ms']} ms: {query['statement']}" for query in entry['slowest_statements']),
+            extra={'slow_request': entry}
+        )
+    return response
+
+def init_app(app):
+    if not app.config['METRICS_ENABLED']:
+        return
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(engine, 'handle_error', _discard_failed_statement)
+    app.before_request(start_request)
+    app.after_request(finish_request)
\ No newline at end of file
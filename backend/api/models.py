@@ -10,19 +10,27 @@ class User(db.Model):
     presentations = db.relationship('Presentation', backref='owner', lazy=True, cascade="all, delete-orphan")
 
 class Presentation(db.Model):
+    __table_args__ = (db.Index('ix_presentation_user_id_updated_at', 'user_id', 'updated_at'),)
+
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     title = db.Column(db.String(150), nullable=False, default="Новая презентация")
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    slides = db.relationship('Slide', backref='presentation', lazy=True, cascade="all, delete-orphan")
+    slides = db.relationship('Slide', backref='presentation', lazy=True, cascade="all, delete-orphan", passive_deletes=True)
+    export_jobs = db.relationship('ExportJob', backref='presentation', lazy=True, cascade="all, delete-orphan", passive_deletes=True)
+    changes = db.relationship('PresentationChange', backref='presentation', lazy=True, cascade="all, delete-orphan", passive_deletes=True)
 
 class Slide(db.Model):
+    __table_args__ = (db.Index('ix_slide_presentation_id_position', 'presentation_id', 'position'),)
+
     id = db.Column(db.Integer, primary_key=True)
-    slide_number = db.Column(db.Integer, nullable=False)
+    position = db.Column(db.BigInteger, nullable=False)
     background_color = db.Column(db.String(7), nullable=False, default='#FFFFFF')
-    presentation_id = db.Column(db.String(36), db.ForeignKey('presentation.id'), nullable=False)
-    elements = db.relationship('SlideElement', backref='slide', lazy=True, cascade="all, delete-orphan")
+    thumbnail_hash = db.Column(db.String(64), nullable=True)
+    presentation_id = db.Column(db.String(36), db.ForeignKey('presentation.id', ondelete='CASCADE'), nullable=False)
+    elements = db.relationship('SlideElement', backref='slide', lazy=True, cascade="all, delete-orphan", passive_deletes=True)
 
 class SlideElement(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -33,4 +41,62 @@ class SlideElement(db.Model):
     height = db.Column(db.Integer, nullable=False, default=150)
     content = db.Column(db.Text, nullable=True)
     font_size = db.Column(db.Integer, nullable=False, default=24)
-    slide_id = db.Column(db.Integer, db.ForeignKey('slide.id'), nullable=False)
\ No newline at end of file
+    slide_id = db.Column(db.Integer, db.ForeignKey('slide.id', ondelete='CASCADE'), nullable=False, index=True)
+    media_id = db.Column(db.String(36), db.ForeignKey('media_asset.id', ondelete='SET NULL'), nullable=True, index=True)
+
+class PresentationChange(db.Model):
+    __table_args__ = (db.Index('ix_presentation_change_presentation_id_revision', 'presentation_id', 'revision'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    presentation_id = db.Column(db.String(36), db.ForeignKey('presentation.id', ondelete='CASCADE'), nullable=False)
+    revision = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(20), nullable=False)
+    target_id = db.Column(db.String(36), nullable=False)
+    payload = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+class ExportJob(db.Model):
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    presentation_id = db.Column(db.String(36), db.ForeignKey('presentation.id', ondelete='CASCADE'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='queued')
+    fingerprint = db.Column(db.String(64), nullable=False)
+    slides_total = db.Column(db.Integer, nullable=False, default=0)
+    slides_done = db.Column(db.Integer, nullable=False, default=0)
+    file_name = db.Column(db.String(64), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+class MediaAsset(db.Model):
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = db.Column(db.String(10), nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='processing')
+    filename = db.Column(db.String(128), nullable=False, unique=True)
+    content_hash = db.Column(db.String(64), nullable=False, index=True)
+    size = db.Column(db.BigInteger, nullable=False, default=0)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    width = db.Column(db.Integer, nullable=True)
+    height = db.Column(db.Integer, nullable=True)
+    poster_filename = db.Column(db.String(128), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    pinned_until = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class MediaUpload(db.Model):
+    media_id = db.Column(db.String(36), db.ForeignKey('media_asset.id', ondelete='CASCADE'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True, index=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class UploadSession(db.Model):
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    kind = db.Column(db.String(10), nullable=False)
+    extension = db.Column(db.String(16), nullable=False)
+    size = db.Column(db.BigInteger, nullable=False)
+    received = db.Column(db.BigInteger, nullable=False, default=0)
+    claim_token = db.Column(db.String(36), nullable=True)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
\ No newline at end of file
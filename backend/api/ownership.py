@@ -0,0 +1,44 @@
+from flask import abort, g, jsonify, make_response
+from .extensions import db
+from .models import Presentation, Slide, SlideElement, UploadSession
+
+def forbidden():
+    abort(make_response(jsonify({'message': 'Доступ запрещен'}), 403))
+
+def get_owned_presentation_or_404(presentation_id):
+    presentation = Presentation.query.get_or_404(presentation_id)
+    if presentation.user_id != g.current_user.id:
+        forbidden()
+    return presentation
+
+def get_owned_slide_or_404(slide_id):
+    row = (db.session.query(Slide, Presentation.user_id)
+           .join(Presentation, Slide.presentation_id == Presentation.id)
+           .filter(Slide.id == slide_id)
+           .first())
+    if row is None:
+        abort(404)
+    slide, owner_id = row
+    if owner_id != g.current_user.id:
+        forbidden()
+    return slide
+
+def get_owned_element_or_404(element_id):
+    row = (db.session.query(SlideElement, Presentation.user_id)
+           .join(Slide, SlideElement.slide_id == Slide.id)
+           .join(Presentation, Slide.presentation_id == Presentation.id)
+           .filter(SlideElement.id == element_id)
+           .first())
+    if row is None:
+        abort(404)
+    element, owner_id = row
+    if owner_id != g.current_user.id:
+        forbidden()
+    return element
+
+
+def get_owned_upload_or_404(upload_id):
+    session = UploadSession.query.get_or_404(upload_id)
+    if session.user_id != g.current_user.id:
+        forbidden()
+    return session
\ No newline at end of file
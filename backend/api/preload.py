@@ -0,0 +1,23 @@
+import importlib
+import logging
+import sys
+
+HEAVY_MODULES = (
+    'api.services.pptx_builder',
+    'api.services.slide_renderer',
+    'api.services.transcoding',
+)
+
+def preload_heavy_modules():
+    for name in HEAVY_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logging.getLogger(__name__).warning('Could not preload %s: %s', name, e)
+    image = sys.modules.get('PIL.Image')
+    if image is not None:
+        image.init()
+
+def init_app(app):
+    if app.config['PRELOAD_HEAVY_MODULES']:
+        preload_heavy_modules()
\ No newline at end of file
@@ -4,6 +4,7 @@ import jwt
 import re
 from ..models import User
 from ..extensions import db, bcrypt
+from ..security import password_version
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -47,6 +48,7 @@ def login():
     if user and bcrypt.check_password_hash(user.password_hash, password):
         token = jwt.encode({
             'user_id': user.id,
+            'pv': password_version(user.password_hash),
             'exp': datetime.now(timezone.utc) + timedelta(hours=24)
         }, current_app.config['SECRET_KEY'], algorithm="HS256")
 
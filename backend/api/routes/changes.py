@@ -0,0 +1,54 @@
+import json
+from flask import request, jsonify, Blueprint, current_app, g
+from ..events import get_broker, presentation_channel, stream_events
+from ..services.changes import changes_since
+from ..security import token_required, stream_ticket_required, issue_stream_ticket
+from ..ownership import get_owned_presentation_or_404
+
+changes_bp = Blueprint('changes', __name__)
+
+MAX_CHANGES_PER_RESPONSE = 1000
+
+def serialize_change(change):
+    return {'revision': change.revision, 'op': change.op, 'target_id': change.target_id, 'payload': change.payload}
+
+@changes_bp.route('/presentations/<string:presentation_id>/changes', methods=['GET'])
+@token_required
+def get_changes(presentation_id):
+    get_owned_presentation_or_404(presentation_id)
+
+    since = request.args.get('since', type=int)
+    if since is None or since < 0:
+        return jsonify({'message': 'Требуется параметр since'}), 400
+
+    revision, changes = changes_since(presentation_id, since, MAX_CHANGES_PER_RESPONSE)
+    if changes is None:
+        return jsonify({'revision': revision, 'reset': True, 'changes': []}), 200
+    return jsonify({'revision': revision, 'reset': False, 'changes': [serialize_change(c) for c in changes]}), 200
+
+@changes_bp.route('/presentations/<string:presentation_id>/events/ticket', methods=['POST'])
+@token_required
+def create_events_ticket(presentation_id):
+    presentation = get_owned_presentation_or_404(presentation_id)
+    return jsonify({'ticket': issue_stream_ticket(g.current_user.id, presentation.id),
+                    'expires_in': current_app.config['EVENTS_TICKET_TTL']}), 201
+
+@changes_bp.route('/presentations/<string:presentation_id>/events', methods=['GET'])
+@stream_ticket_required
+def stream_presentation_events(presentation_id):
+    presentation = get_owned_presentation_or_404(presentation_id)
+
+    broker = get_broker()
+    subscription = broker.subscribe(presentation_channel(presentation.id))
+    if subscription is None:
+        return jsonify({'message': 'Слишком много подключений, попробуйте позже'}), 503
+
+    initial = json.dumps({'presentation_id': presentation.id, 'revision': presentation.version})
+    response = current_app.response_class(
+        stream_events(subscription, initial, current_app.config['EVENTS_HEARTBEAT_INTERVAL']),
+        mimetype='text/event-stream'
+    )
+    response.call_on_close(lambda: broker.unsubscribe(subscription))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
\ No newline at end of file
@@ -1,12 +1,18 @@
-from flask import request, jsonify, Blueprint, g, current_app
-from ..models import SlideElement, Slide, Presentation
+from flask import request, jsonify, Blueprint
+from ..models import SlideElement, Slide
 from ..extensions import db
-from .presentations import token_required
+from ..services.media_urls import unsigned_media_content
+from ..services.storage import acquire_media, release_media
+from ..services.changes import touch_presentation, touch_slide_presentation
+from ..security import token_required
+from ..ownership import get_owned_presentation_or_404, get_owned_slide_or_404, get_owned_element_or_404
+from ..serializers import serialize_element
 import re
-import os
 
 elements_bp = Blueprint('elements', __name__)
 
+MAX_BATCH_OPERATIONS = 500
+
 def get_youtube_id(url):
     if url is None:
         return None
@@ -14,18 +20,10 @@ def get_youtube_id(url):
     match = re.search(regex, url)
     return match.group(1) if match else None
 
-@elements_bp.route('/slides/<int:slide_id>/elements', methods=['POST'])
-@token_required
-def add_element_to_slide(slide_id):
-    slide = Slide.query.get_or_404(slide_id)
-    presentation = Presentation.query.get_or_404(slide.presentation_id)
-    if presentation.user_id != g.current_user.id:
-        return jsonify({'message': 'Доступ запрещен'}), 403
-
-    data = request.get_json()
+def build_element(slide_id, data):
     element_type = data.get('element_type')
     if not element_type:
-        return jsonify({'message': 'Тип элемента обязателен'}), 400
+        return None, 'Тип элемента обязателен'
 
     new_element = SlideElement(
         slide_id=slide_id,
@@ -34,71 +32,155 @@ def add_element_to_slide(slide_id):
         pos_y=data.get('pos_y', 100),
         width=data.get('width', 400),
         height=data.get('height', 150),
-        content=data.get('content', 'Новый текст')
+        content=unsigned_media_content(data.get('content', 'Новый текст'))
     )
-    
-    response_data = {}
 
     if element_type == 'YOUTUBE_VIDEO':
         youtube_id = get_youtube_id(data.get('content'))
         if not youtube_id:
-            return jsonify({'message': 'Некорректная ссылка на YouTube'}), 400
+            return None, 'Некорректная ссылка на YouTube'
         new_element.content = youtube_id
-        response_data['thumbnailUrl'] = f"https://img.youtube.com/vi/{youtube_id}/0.jpg"
 
     db.session.add(new_element)
+    acquire_media(new_element)
+    return new_element, None
+
+def apply_element_update(element, data):
+    element.pos_x = data.get('pos_x', element.pos_x)
+    element.pos_y = data.get('pos_y', element.pos_y)
+    element.width = data.get('width', element.width)
+    element.height = data.get('height', element.height)
+    content = unsigned_media_content(data['content']) if 'content' in data else element.content
+    if content != element.content:
+        release_media(element)
+        element.content = content
+        acquire_media(element)
+
+def element_change(op, element):
+    if op == 'element.delete':
+        return op, element.id, {'slide_id': element.slide_id}
+    return op, element.id, {'slide_id': element.slide_id, **serialize_element(element)}
+
+def remove_element(element):
+    release_media(element)
+    db.session.delete(element)
+
+@elements_bp.route('/slides/<int:slide_id>/elements', methods=['POST'])
+@token_required
+def add_element_to_slide(slide_id):
+    get_owned_slide_or_404(slide_id)
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'message': 'Некорректные данные элемента'}), 400
+    new_element, error = build_element(slide_id, data)
+    if error:
+        return jsonify({'message': error}), 400
+
+    db.session.flush()
+    response_data = serialize_element(new_element)
+    touch_slide_presentation(slide_id, element_change('element.create', new_element))
     db.session.commit()
-    
-    response_data.update({
-        'id': new_element.id,
-        'element_type': new_element.element_type,
-        'pos_x': new_element.pos_x,
-        'pos_y': new_element.pos_y,
-        'width': new_element.width,
-        'height': new_element.height,
-        'content': new_element.content,
-        'font_size': new_element.font_size
-    })
-    
+
     return jsonify(response_data), 201
 
 @elements_bp.route('/elements/<string:element_id>', methods=['PUT'])
 @token_required
 def update_element(element_id):
-    element = SlideElement.query.get_or_404(element_id)
-    slide = Slide.query.get_or_404(element.slide_id)
-    presentation = Presentation.query.get_or_404(slide.presentation_id)
-    if presentation.user_id != g.current_user.id:
-        return jsonify({'message': 'Доступ запрещен'}), 403
+    element = get_owned_element_or_404(element_id)
         
-    data = request.get_json()
-    element.pos_x = data.get('pos_x', element.pos_x)
-    element.pos_y = data.get('pos_y', element.pos_y)
-    element.width = data.get('width', element.width)
-    element.height = data.get('height', element.height)
-    element.content = data.get('content', element.content)
-    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'message': 'Некорректные данные элемента'}), 400
+    apply_element_update(element, data)
+    touch_slide_presentation(element.slide_id, element_change('element.update', element))
     db.session.commit()
     return jsonify({'message': 'Элемент обновлен'}), 200
 
 @elements_bp.route('/elements/<string:element_id>', methods=['DELETE'])
 @token_required
 def delete_element(element_id):
-    element = SlideElement.query.get_or_404(element_id)
-    slide = Slide.query.get_or_404(element.slide_id)
-    presentation = Presentation.query.get_or_404(slide.presentation_id)
-    if presentation.user_id != g.current_user.id:
-        return jsonify({'message': 'Доступ запрещен'}), 403
-
-    if element.element_type in ['IMAGE', 'UPLOADED_VIDEO'] and element.content:
-        try:
-            filename = element.content.split('/')[-1]
-            filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-            if os.path.exists(filepath):
-                os.remove(filepath)
-        except Exception as e:
-            print(f"Error deleting file for element {element_id}: {e}")
-            
-    db.session.delete(element)
+    element = get_owned_element_or_404(element_id)
+
+    touch_slide_presentation(element.slide_id, element_change('element.delete', element))
+    remove_element(element)
     db.session.commit()
-    return jsonify({'message': 'Элемент удален'}), 204
\ No newline at end of file
+    return jsonify({'message': 'Элемент удален'}), 204
+
+@elements_bp.route('/presentations/<string:presentation_id>/elements', methods=['PATCH'])
+@token_required
+def batch_elements(presentation_id):
+    presentation = get_owned_presentation_or_404(presentation_id)
+
+    data = request.get_json(silent=True)
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'message': 'Требуется массив операций'}), 400
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return jsonify({'message': f'Не более {MAX_BATCH_OPERATIONS} операций за запрос'}), 400
+
+    valid_operations = [op for op in operations if isinstance(op, dict)]
+    element_ids = {op['id'] for op in valid_operations if op.get('op') in ('update', 'delete') and isinstance(op.get('id'), str)}
+    slide_ids = {op['slide_id'] for op in valid_operations if op.get('op') == 'create' and isinstance(op.get('slide_id'), int)}
+
+    elements = {}
+    if element_ids:
+        elements = {e.id: e for e in (SlideElement.query.join(Slide)
+                                      .filter(SlideElement.id.in_(element_ids), Slide.presentation_id == presentation.id)
+                                      .all())}
+    slides = set()
+    if slide_ids:
+        slides = {sid for (sid,) in (db.session.query(Slide.id)
+                                     .filter(Slide.id.in_(slide_ids), Slide.presentation_id == presentation.id)
+                                     .all())}
+
+    results = []
+    created = []
+    changes = []
+    for op in operations:
+        if not isinstance(op, dict):
+            results.append({'op': None, 'status': 400, 'message': 'Некорректная операция'})
+            continue
+        kind = op.get('op')
+        op_data = op.get('data') or {}
+        if kind in ('create', 'update') and not isinstance(op_data, dict):
+            results.append({'op': kind, 'status': 400, 'message': 'Некорректные данные элемента'})
+            continue
+        if kind == 'create':
+            if not isinstance(op.get('slide_id'), int) or op['slide_id'] not in slides:
+                results.append({'op': kind, 'status': 404, 'message': 'Слайд не найден'})
+                continue
+            new_element, error = build_element(op['slide_id'], op_data)
+            if error:
+                results.append({'op': kind, 'status': 400, 'message': error})
+                continue
+            result = {'op': kind, 'status': 201}
+            created.append((result, new_element))
+            results.append(result)
+        elif kind in ('update', 'delete'):
+            element = elements.get(op.get('id')) if isinstance(op.get('id'), str) else None
+            if element is None:
+                results.append({'op': kind, 'id': op.get('id'), 'status': 404, 'message': 'Элемент не найден'})
+                continue
+            if kind == 'update':
+                apply_element_update(element, op_data)
+                changes.append(element_change('element.update', element))
+                results.append({'op': kind, 'id': element.id, 'status': 200})
+            else:
+                changes.append(element_change('element.delete', element))
+                remove_element(element)
+                del elements[element.id]
+                results.append({'op': kind, 'id': element.id, 'status': 204})
+        else:
+            results.append({'op': kind, 'status': 400, 'message': 'Неизвестная операция'})
+
+    db.session.flush()
+    for result, new_element in created:
+        result['id'] = new_element.id
+        result['element'] = serialize_element(new_element)
+        changes.append(element_change('element.create', new_element))
+    if any(result['status'] < 400 for result in results):
+        touch_presentation(presentation.id, *changes)
+    db.session.commit()
+
+    return jsonify({'results': results}), 200
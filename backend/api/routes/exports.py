@@ -0,0 +1,41 @@
+import os
+from flask import jsonify, Blueprint, g, send_file
+from ..models import Presentation, ExportJob
+from ..services.export import PPTX_MIMETYPE
+from ..services.export_jobs import start_export, serialize_job, artifact_path
+from ..security import token_required
+
+exports_bp = Blueprint('exports', __name__)
+
+@exports_bp.route('/presentations/<string:presentation_id>/exports', methods=['POST'])
+@token_required
+def create_export(presentation_id):
+    presentation = Presentation.query.get_or_404(presentation_id)
+    if presentation.user_id != g.current_user.id:
+        return jsonify({'message': 'Доступ запрещен'}), 403
+
+    job, created = start_export(presentation, g.current_user.id)
+    return jsonify(serialize_job(job)), 202 if created else 200
+
+@exports_bp.route('/exports/<string:job_id>', methods=['GET'])
+@token_required
+def get_export(job_id):
+    job = ExportJob.query.get_or_404(job_id)
+    if job.user_id != g.current_user.id:
+        return jsonify({'message': 'Доступ запрещен'}), 403
+    return jsonify(serialize_job(job)), 200
+
+@exports_bp.route('/exports/<string:job_id>/file', methods=['GET'])
+@token_required
+def download_export(job_id):
+    job = ExportJob.query.get_or_404(job_id)
+    if job.user_id != g.current_user.id:
+        return jsonify({'message': 'Доступ запрещен'}), 403
+    if job.status != 'done':
+        return jsonify({'message': 'Экспорт еще не завершен'}), 409
+
+    path = artifact_path(job)
+    if not os.path.exists(path):
+        return jsonify({'message': 'Файл экспорта не найден'}), 410
+
+    return send_file(path, as_attachment=True, download_name=f"{job.presentation.title}.pptx", mimetype=PPTX_MIMETYPE)
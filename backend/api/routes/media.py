@@ -0,0 +1,242 @@
+import mimetypes
+import os
+import re
+from flask import request, jsonify, Blueprint, current_app, g, redirect, send_file
+from werkzeug.utils import secure_filename
+from ..extensions import db
+from ..models import MediaAsset, MediaUpload, Presentation, Slide, SlideElement
+from ..ownership import get_owned_upload_or_404
+from ..services.images import IMAGE_EXTENSIONS, available_rendition, create_renditions, image_format
+from ..services.media import enqueue_video, TranscodeQueueFull
+from ..services.media_urls import signed_media_url, valid_media_signature
+from ..services.slide_thumbnails import invalidate_media_thumbnails
+from ..services.storage import save_stream_hashed, commit_blob, reuse_asset, register_asset, record_uploader
+from ..services.uploads import (UPLOAD_KINDS, OPPORTUNISTIC_GC_BATCH, InvalidChunk, create_session, append_chunk,
+                                hash_file, upload_complete, claim_session_file, release_session_file, close_session,
+                                expire_stale_sessions)
+from ..security import token_required
+
+media_bp = Blueprint('media', __name__)
+
+CONTENT_ADDRESSED_NAME = re.compile(r'^([0-9a-f]{64})(?:_[a-z]+)?\.[a-z0-9]+$')
+
+def user_can_access_media(filename):
+    match = CONTENT_ADDRESSED_NAME.match(filename)
+    asset = MediaAsset.query.filter_by(filename=filename).first()
+    if asset is None and match:
+        asset = MediaAsset.query.filter_by(content_hash=match.group(1)).first()
+
+    query = (db.session.query(SlideElement.id)
+             .join(Slide, SlideElement.slide_id == Slide.id)
+             .join(Presentation, Slide.presentation_id == Presentation.id)
+             .filter(Presentation.user_id == g.current_user.id))
+    if asset is not None:
+        query = query.filter(SlideElement.media_id == asset.id)
+    else:
+        query = query.filter(SlideElement.content.like(f"%/{filename}"))
+    return db.session.query(query.exists()).scalar()
+
+def serialize_media(asset):
+    return {
+        'id': asset.id,
+        'kind': asset.kind,
+        'status': asset.status,
+        'url': signed_media_url(asset.filename),
+        'poster_url': signed_media_url(asset.poster_filename),
+        'error': asset.error,
+        'width': asset.width,
+        'height': asset.height,
+        'renditions': {
+            name: signed_media_url(available_rendition(asset, name))
+            for name in current_app.config['IMAGE_RENDITIONS']
+        } if asset.kind == 'image' else None
+    }
+
+def store_image(temp_path, content_hash, size):
+    extension = IMAGE_EXTENSIONS.get(image_format(temp_path))
+    if extension is None:
+        os.remove(temp_path)
+        return jsonify({'message': 'Файл не является изображением поддерживаемого формата'}), 400
+
+    asset = reuse_asset('image', content_hash)
+    if asset is None:
+        asset = register_asset(MediaAsset(
+            kind='image', status='ready', filename=f"{content_hash}{extension}",
+            content_hash=content_hash, size=size
+        ))
+    commit_blob(temp_path, asset.filename)
+    record_uploader(asset, g.current_user.id)
+    if asset.width is None:
+        try:
+            create_renditions(asset)
+            invalidate_media_thumbnails(asset)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.warning('Could not create renditions for %s: %s', asset.filename, e)
+
+    return jsonify(serialize_media(asset)), 200
+
+def transcoding_busy(**extra):
+    return jsonify({'message': 'Сервер занят обработкой видео, попробуйте позже', **extra}), 503
+
+def store_video(temp_path, content_hash, size):
+    asset = enqueue_video(temp_path, content_hash, size)
+    record_uploader(asset, g.current_user.id)
+    return jsonify(serialize_media(asset)), 202 if asset.status == 'processing' else 200
+
+def serialize_upload(session):
+    return {'id': session.id, 'kind': session.kind, 'size': session.size, 'received': session.received}
+
+@media_bp.route('/upload/image', methods=['POST'])
+@token_required
+def upload_image():
+    if 'file' not in request.files:
+        return jsonify({'message': 'Файл не найден'}), 400
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'message': 'Файл не выбран'}), 400
+    if file:
+        _root, extension = os.path.splitext(file.filename)
+        extension = extension.lower()
+        temp_path, content_hash, size = save_stream_hashed(file.stream, extension)
+        return store_image(temp_path, content_hash, size)
+
+@media_bp.route('/upload/video', methods=['POST'])
+@token_required
+def upload_video():
+    if 'file' not in request.files:
+        return jsonify({'message': 'Файл не найден'}), 400
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({'message': 'Файл не выбран'}), 400
+
+    if file:
+        _root, extension = os.path.splitext(file.filename)
+        temp_path, content_hash, size = save_stream_hashed(file.stream, extension.lower())
+        try:
+            return store_video(temp_path, content_hash, size)
+        except TranscodeQueueFull:
+            os.remove(temp_path)
+            return transcoding_busy()
+
+@media_bp.route('/uploads', methods=['POST'])
+@token_required
+def create_upload():
+    data = request.get_json() or {}
+    kind = data.get('kind')
+    size = data.get('size')
+    _root, extension = os.path.splitext(secure_filename(data.get('filename') or ''))
+    if kind not in UPLOAD_KINDS:
+        return jsonify({'message': 'Неизвестный тип файла'}), 400
+    if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+        return jsonify({'message': 'Не указан размер файла'}), 400
+    if size > current_app.config['UPLOAD_MAX_SIZE']:
+        return jsonify({'message': 'Файл слишком большой'}), 413
+
+    expire_stale_sessions(limit=OPPORTUNISTIC_GC_BATCH)
+    session = create_session(g.current_user.id, kind, extension.lower()[:16], size)
+    return jsonify(serialize_upload(session)), 201
+
+@media_bp.route('/uploads/<string:upload_id>', methods=['GET'])
+@token_required
+def get_upload(upload_id):
+    session = get_owned_upload_or_404(upload_id)
+    return jsonify(serialize_upload(session)), 200
+
+@media_bp.route('/uploads/<string:upload_id>', methods=['PUT'])
+@token_required
+def upload_chunk(upload_id):
+    session = get_owned_upload_or_404(upload_id)
+    offset = request.args.get('offset', type=int)
+    if offset != session.received:
+        return jsonify({'message': 'Неверное смещение', **serialize_upload(session)}), 409
+    length = request.content_length
+    if length is None or length > current_app.config['UPLOAD_CHUNK_MAX_SIZE'] or offset + length > session.size:
+        return jsonify({'message': 'Недопустимый размер фрагмента'}), 413
+
+    try:
+        advanced = append_chunk(session, request.stream, offset, length, request.headers.get('X-Chunk-SHA256'))
+    except InvalidChunk:
+        return jsonify({'message': 'Фрагмент поврежден', **serialize_upload(session)}), 400
+    db.session.refresh(session)
+    if not advanced:
+        return jsonify({'message': 'Неверное смещение', **serialize_upload(session)}), 409
+    return jsonify(serialize_upload(session)), 200
+
+@media_bp.route('/uploads/<string:upload_id>/finalize', methods=['POST'])
+@token_required
+def finalize_upload(upload_id):
+    session = get_owned_upload_or_404(upload_id)
+    if not upload_complete(session):
+        return jsonify({'message': 'Файл загружен не полностью', **serialize_upload(session)}), 409
+    temp_path = claim_session_file(session)
+    if temp_path is None:
+        return jsonify({'message': 'Загрузка уже завершается', **serialize_upload(session)}), 409
+
+    try:
+        content_hash = hash_file(temp_path)
+        if session.kind == 'image':
+            response = store_image(temp_path, content_hash, session.size)
+        else:
+            response = store_video(temp_path, content_hash, session.size)
+    except TranscodeQueueFull:
+        release_session_file(session, temp_path)
+        return transcoding_busy(**serialize_upload(session))
+    except BaseException:
+        db.session.rollback()
+        release_session_file(session, temp_path)
+        raise
+    close_session(session)
+    return response
+
+@media_bp.route('/uploads/<string:upload_id>', methods=['DELETE'])
+@token_required
+def cancel_upload(upload_id):
+    session = get_owned_upload_or_404(upload_id)
+    temp_path = close_session(session)
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    return jsonify({'message': 'Загрузка отменена'}), 200
+
+@media_bp.route('/media/renditions/<string:size>/<path:filename>', methods=['GET'])
+def get_rendition(size, filename):
+    if size not in current_app.config['IMAGE_RENDITIONS']:
+        return jsonify({'message': 'Неизвестный размер'}), 400
+    if not valid_media_signature(filename, request.args.get('expires', type=int), request.args.get('signature')):
+        return jsonify({'message': 'Доступ запрещен'}), 403
+    asset = MediaAsset.query.filter_by(filename=filename).first()
+    if asset is not None and asset.kind == 'image':
+        filename = available_rendition(asset, size)
+    return redirect(signed_media_url(filename))
+
+@media_bp.route('/media/<string:media_id>', methods=['GET'])
+@token_required
+def get_media(media_id):
+    asset = MediaAsset.query.get_or_404(media_id)
+    uploaded = db.session.get(MediaUpload, (asset.id, g.current_user.id)) is not None
+    if not uploaded and not user_can_access_media(asset.filename):
+        return jsonify({'message': 'Доступ запрещен'}), 403
+    return jsonify(serialize_media(asset)), 200
+
+@media_bp.route('/media/files/<path:filename>', methods=['GET'])
+def serve_media_file(filename):
+    if not valid_media_signature(filename, request.args.get('expires', type=int), request.args.get('signature')):
+        return jsonify({'message': 'Доступ запрещен'}), 403
+    filename = secure_filename(filename)
+    path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+    if not filename or not os.path.isfile(path):
+        return jsonify({'message': 'Файл не найден'}), 404
+
+    accel_prefix = current_app.config['MEDIA_ACCEL_REDIRECT_PREFIX']
+    if accel_prefix:
+        response = current_app.response_class(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{filename}"
+    else:
+        response = send_file(path, conditional=True)
+
+    if CONTENT_ADDRESSED_NAME.match(filename):
+        response.headers['Cache-Control'] = f"private, max-age={current_app.config['MEDIA_IMMUTABLE_MAX_AGE']}, immutable"
+    else:
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
\ No newline at end of file
@@ -0,0 +1,28 @@
+import hmac
+from flask import Blueprint, Response, abort, current_app, jsonify, request
+from ..metrics import get_registry, render_prometheus
+
+metrics_bp = Blueprint('metrics', __name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def metrics_authorized():
+    token = current_app.config['METRICS_TOKEN']
+    if not token:
+        return False
+    return hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}")
+
+@metrics_bp.before_request
+def check_metrics_access():
+    if not current_app.config['METRICS_ENABLED']:
+        abort(404)
+    if not metrics_authorized():
+        return jsonify({'message': 'Доступ запрещен'}), 403
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+@metrics_bp.route('/metrics/slow', methods=['GET'])
+def get_slow_requests():
+    return jsonify({'slow_requests': get_registry().slow_request_log()}), 200
\ No newline at end of file
@@ -1,38 +1,38 @@
-from functools import wraps
-from flask import request, jsonify, Blueprint, current_app, g, send_file, url_for
-import jwt
-import io
+from flask import request, jsonify, Blueprint, current_app, g, send_file
 import os
-import requests
-from werkzeug.utils import secure_filename
-from pptx import Presentation as PptxPresentation
-from pptx.util import Inches, Pt
-import uuid
-from PIL import Image
-import ffmpeg
-from ..models import User, Presentation, Slide, SlideElement
+import tempfile
+import base64
+import binascii
+from datetime import datetime
+from ..models import Presentation, Slide, SlideElement
 from ..extensions import db
+from ..security import token_required
+from ..metrics import export_phase_timings, record_export_phases
+from ..etags import presentation_etag, listing_etag, matching_etag, not_modified, with_etag
+from ..services.export import export_pptx, load_export_slides, PPTX_MIMETYPE
+from ..services.storage import release_element_media
+from ..services.changes import touch_presentation
+from ..services.search import queue_search_refresh
+from ..services.slide_order import POSITION_GAP, first_slide_condition
+from ..services.slide_thumbnails import schedule_regeneration
+from ..serializers import serialize_listing_item, load_slide_rows, load_first_slide_rows, LISTING_SLIDE_COLUMNS
 
 presentations_bp = Blueprint('presentations', __name__)
 
-PIXELS_PER_INCH = 80.0
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
 
-def px_to_inches(px):
-    return px / PIXELS_PER_INCH
+def encode_cursor(presentation):
+    raw = f"{presentation.updated_at.isoformat()}|{presentation.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
 
-def token_required(f):
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        token = None
-        if 'authorization' in request.headers: token = request.headers['authorization'].split(' ')[1]
-        if not token: return jsonify({'message': 'Токен аутентификации отсутствует'}), 401
-        try:
-            data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
-            g.current_user = User.query.get(data['user_id'])
-            if not g.current_user: return jsonify({'message': 'Пользователь не найден'}), 401
-        except: return jsonify({'message': 'Недействительный токен'}), 401
-        return f(*args, **kwargs)
-    return decorated
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        updated_at, presentation_id = raw.split('|', 1)
+        return datetime.fromisoformat(updated_at), presentation_id
+    except (UnicodeError, binascii.Error, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
 
 @presentations_bp.route('/presentations/<string:presentation_id>/download', methods=['GET'])
 @token_required
@@ -40,126 +40,38 @@ def download_presentation(presentation_id):
     presentation = Presentation.query.get_or_404(presentation_id)
     if presentation.user_id != g.current_user.id: return jsonify({'message': 'Доступ запрещен'}), 403
     
-    prs = PptxPresentation()
-    prs.slide_width = Inches(16)
-    prs.slide_height = Inches(9)
-    
-    slides = Slide.query.filter_by(presentation_id=presentation.id).order_by(Slide.slide_number).all()
-
-    for slide_data in slides:
-        slide = prs.slides.add_slide(prs.slide_layouts[6])
-        for element in slide_data.elements:
-            container_left = Inches(px_to_inches(element.pos_x))
-            container_top = Inches(px_to_inches(element.pos_y))
-            container_width = Inches(px_to_inches(element.width))
-            container_height = Inches(px_to_inches(element.height))
-
-            if element.element_type == 'TEXT':
-                txBox = slide.shapes.add_textbox(container_left, container_top, container_width, container_height)
-                tf = txBox.text_frame
-                tf.text = element.content or ""
-                tf.word_wrap = True
-                if tf.paragraphs:
-                    tf.paragraphs[0].font.size = Pt(element.font_size or 24)
-            
-            elif element.element_type == 'IMAGE' and element.content:
-                try:
-                    filename = element.content.split('/')[-1]
-                    image_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-                    
-                    if not os.path.exists(image_path):
-                        continue
-
-                    with Image.open(image_path) as img:
-                        img_width, img_height = img.size
-
-                    container_aspect = container_width / container_height
-                    img_aspect = img_width / img_height
-
-                    if img_aspect > container_aspect:
-                        new_width = container_width
-                        new_height = new_width / img_aspect
-                    else:
-                        new_height = container_height
-                        new_width = new_height * img_aspect
-
-                    left_offset = (container_width - new_width) / 2
-                    top_offset = (container_height - new_height) / 2
-                    
-                    final_left = container_left + left_offset
-                    final_top = container_top + top_offset
-
-                    slide.shapes.add_picture(image_path, final_left, final_top, width=new_width, height=new_height)
-
-                except Exception as e:
-                    print(f"Could not add image {element.content}: {e}")
-
-            elif element.element_type == 'YOUTUBE_VIDEO' and element.content:
-                image_stream = None
-                thumbnail_urls = [
-                    f"https://img.youtube.com/vi/{element.content}/maxresdefault.jpg",
-                    f"https://img.youtube.com/vi/{element.content}/hqdefault.jpg",
-                    f"https://img.youtube.com/vi/{element.content}/0.jpg"
-                ]
-                for url in thumbnail_urls:
-                    try:
-                        response = requests.get(url, stream=True)
-                        response.raise_for_status()
-                        image_stream = io.BytesIO(response.content)
-                        break
-                    except requests.exceptions.RequestException as e:
-                        print(f"Could not fetch thumbnail {url}: {e}")
-                        continue
-                
-                if image_stream:
-                    try:
-                        pic = slide.shapes.add_picture(image_stream, container_left, container_top, width=container_width, height=container_height)
-                        hlink = pic.click_action.hyperlink
-                        hlink.address = f"https://www.youtube.com/watch?v={element.content}"
-                    except Exception as e:
-                        print(f"Could not add video thumbnail for {element.content}: {e}")
-            
-            elif element.element_type == 'UPLOADED_VIDEO' and element.content:
-                try:
-                    filename = element.content.split('/')[-1]
-                    video_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-                    poster_path = os.path.join(current_app.root_path, 'static', 'video_poster.png')
-                    
-                    video_exists = os.path.exists(video_path)
-                    poster_exists = os.path.exists(poster_path)
-
-                    if video_exists and poster_exists:
-                        MIME_TYPES = { '.mp4': 'video/mp4', '.webm': 'video/webm' }
-                        _root, extension = os.path.splitext(filename)
-                        mime_type = MIME_TYPES.get(extension.lower(), 'video/mp4')
-
-                        slide.shapes.add_movie(
-                            video_path, 
-                            container_left, container_top, container_width, container_height,
-                            poster_frame_image=poster_path,
-                            mime_type=mime_type
-                        )
-                    else:
-                        if not video_exists: print(f"WARNING: Video file not found at {video_path}")
-                        if not poster_exists: print(f"WARNING: Poster frame not found at {poster_path}. UPLOADED_VIDEO will not be added.")
-                except Exception as e:
-                    print(f"Could not add uploaded video {element.content}: {e}")
-
-    file_stream = io.BytesIO()
-    prs.save(file_stream)
-    file_stream.seek(0)
-    return send_file(file_stream, as_attachment=True, download_name=f"{presentation.title}.pptx", mimetype='application/vnd.openxmlformats-officedocument-presentationml-presentation')
+    os.makedirs(current_app.config['EXPORT_FOLDER'], exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix='.pptx', dir=current_app.config['EXPORT_FOLDER'])
+    os.close(fd)
+    timings = export_phase_timings()
+    try:
+        export_pptx(load_export_slides(presentation.id), path, timings=timings)
+        response = send_file(path, as_attachment=True, download_name=f"{presentation.title}.pptx", mimetype=PPTX_MIMETYPE, conditional=False)
+    except Exception:
+        os.remove(path)
+        raise
+
+    def remove_artifact():
+        if os.path.exists(path):
+            os.remove(path)
+
+    response.direct_passthrough = False
+    response.call_on_close(remove_artifact)
+    if timings is not None:
+        record_export_phases(timings)
+        response.headers['Server-Timing'] = timings.server_timing()
+    return response
 
 @presentations_bp.route('/presentations', methods=['POST'])
 @token_required
 def create_presentation():
     data = request.get_json()
     title = data.get('title', 'Новая презентация')
-    new_presentation = Presentation(title=title, owner=g.current_user)
+    new_presentation = Presentation(title=title, user_id=g.current_user.id)
     db.session.add(new_presentation)
     db.session.flush()
 
-    first_slide = Slide(slide_number=1, presentation_id=new_presentation.id)
+    first_slide = Slide(position=POSITION_GAP, presentation_id=new_presentation.id)
     db.session.add(first_slide)
     db.session.flush()
 
@@ -167,25 +79,11 @@ def create_presentation():
     subtitle_element = SlideElement(slide_id=first_slide.id, element_type='TEXT', content='Ваш подзаголовок', pos_x=100, pos_y=260, width=1080, height=100, font_size=28)
     db.session.add(title_element)
     db.session.add(subtitle_element)
+    queue_search_refresh([first_slide.id], [new_presentation.id])
     
     db.session.commit()
 
-    first_slide_data = {
-        'id': first_slide.id,
-        'slide_number': first_slide.slide_number,
-        'background_color': first_slide.background_color,
-        'elements': [
-            {'id': e.id, 'element_type': e.element_type, 'pos_x': e.pos_x, 'pos_y': e.pos_y, 'width': e.width, 'height': e.height, 'content': e.content, 'font_size': e.font_size} 
-            for e in [title_element, subtitle_element]
-        ]
-    }
-    
-    return jsonify({
-        'id': new_presentation.id,
-        'title': new_presentation.title,
-        'updated_at': new_presentation.updated_at.isoformat(),
-        'first_slide': first_slide_data
-    }), 201
+    return jsonify(serialize_listing_item(new_presentation, first_slide)), 201
 
 @presentations_bp.route('/presentations/<string:presentation_id>', methods=['GET'])
 @token_required
@@ -194,68 +92,71 @@ def get_presentation_by_id(presentation_id):
     if presentation.user_id != g.current_user.id:
         return jsonify({'message': 'Доступ запрещен'}), 403
 
-    slides_output = []
-    slides = Slide.query.filter_by(presentation_id=presentation.id).order_by(Slide.slide_number).all()
-    for slide in slides:
-        elements_output = []
-        elements = SlideElement.query.filter_by(slide_id=slide.id).all()
-        for e in elements:
-            element_data = {
-                'id': e.id, 'element_type': e.element_type, 'pos_x': e.pos_x,
-                'pos_y': e.pos_y, 'width': e.width, 'height': e.height,
-                'content': e.content, 'font_size': e.font_size
-            }
-            if e.element_type == 'YOUTUBE_VIDEO':
-                element_data['thumbnailUrl'] = f"https://img.youtube.com/vi/{e.content}/0.jpg"
-            elements_output.append(element_data)
-        slides_output.append({
-            'id': slide.id, 'slide_number': slide.slide_number,
-            'background_color': slide.background_color, 'elements': elements_output
-        })
+    etag = presentation_etag(presentation)
+    matched_etag = matching_etag(etag)
+    if matched_etag:
+        return not_modified(matched_etag)
 
-    return jsonify({'id': presentation.id, 'title': presentation.title, 'slides': slides_output}), 200
+    response = jsonify({'id': presentation.id, 'title': presentation.title, 'version': presentation.version,
+                        'slides': load_slide_rows(presentation.id)})
+    return with_etag(response, etag), 200
 
 @presentations_bp.route('/presentations', methods=['GET'])
 @token_required
 def get_presentations():
-    presentations = Presentation.query.filter_by(user_id=g.current_user.id).order_by(Presentation.updated_at.desc()).all()
-    output = []
-    for p in presentations:
-        first_slide = Slide.query.filter_by(presentation_id=p.id, slide_number=1).first()
-        first_slide_data = None
-        if first_slide:
-            elements = SlideElement.query.filter_by(slide_id=first_slide.id).all()
-            elements_output = []
-            for e in elements:
-                element_data = {
-                    'id': e.id, 'element_type': e.element_type, 'pos_x': e.pos_x,
-                    'pos_y': e.pos_y, 'width': e.width, 'height': e.height,
-                    'content': e.content, 'font_size': e.font_size
-                }
-                if e.element_type == 'YOUTUBE_VIDEO':
-                    element_data['thumbnailUrl'] = f"https://img.youtube.com/vi/{e.content}/0.jpg"
-                elements_output.append(element_data)
-            
-            first_slide_data = {
-                'id': first_slide.id,
-                'slide_number': first_slide.slide_number,
-                'background_color': first_slide.background_color,
-                'elements': elements_output
-            }
-        
-        output.append({
-            'id': p.id,
-            'title': p.title,
-            'updated_at': p.updated_at.isoformat(),
-            'first_slide': first_slide_data
-        })
-    return jsonify(output), 200
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    if limit < 1:
+        return jsonify({'message': 'Некорректный лимит'}), 400
+    limit = min(limit, MAX_PAGE_SIZE)
+    cursor = request.args.get('cursor')
+
+    count, last_updated_at, version_sum = (db.session.query(
+        db.func.count(Presentation.id), db.func.max(Presentation.updated_at), db.func.sum(Presentation.version))
+        .filter_by(user_id=g.current_user.id)
+        .one())
+    pending_thumbnails = (db.session.query(db.func.count(Slide.id))
+                          .join(Presentation, Slide.presentation_id == Presentation.id)
+                          .filter(Presentation.user_id == g.current_user.id, first_slide_condition(), Slide.thumbnail_hash.is_(None))
+                          .scalar())
+    etag = listing_etag(g.current_user.id, count, last_updated_at, version_sum, pending_thumbnails, cursor, limit)
+    matched_etag = matching_etag(etag)
+    if matched_etag:
+        return not_modified(matched_etag)
+
+    query = Presentation.query.filter_by(user_id=g.current_user.id)
+    if cursor:
+        try:
+            cursor_updated_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            return jsonify({'message': 'Некорректный курсор'}), 400
+        query = query.filter(db.or_(
+            Presentation.updated_at < cursor_updated_at,
+            db.and_(Presentation.updated_at == cursor_updated_at, Presentation.id < cursor_id)
+        ))
+
+    presentations = query.order_by(Presentation.updated_at.desc(), Presentation.id.desc()).limit(limit + 1).all()
+    has_more = len(presentations) > limit
+    presentations = presentations[:limit]
+
+    first_slides = load_first_slide_rows([p.id for p in presentations])
+    if first_slides:
+        missing = [row.id for row in first_slides.values() if row.thumbnail_hash is None]
+        if missing:
+            schedule_regeneration(current_app._get_current_object(), missing)
+
+    output = [serialize_listing_item(p, first_slides.get(p.id)) for p in presentations]
+
+    next_cursor = encode_cursor(presentations[-1]) if has_more else None
+    return with_etag(jsonify({'presentations': output, 'next_cursor': next_cursor}), etag), 200
 
 @presentations_bp.route('/presentations/<string:presentation_id>', methods=['DELETE'])
 @token_required
 def delete_presentation(presentation_id):
     presentation = Presentation.query.get_or_404(presentation_id)
     if presentation.user_id != g.current_user.id: return jsonify({'message': 'Доступ запрещен'}), 403
+    release_element_media(Slide.presentation_id == presentation.id)
+    slide_ids = [slide_id for (slide_id,) in db.session.query(Slide.id).filter_by(presentation_id=presentation.id)]
+    queue_search_refresh(slide_ids, [presentation.id])
     db.session.delete(presentation)
     db.session.commit()
     return jsonify({'message': 'Презентация успешно удалена'}), 200
@@ -266,84 +167,13 @@ def update_presentation(presentation_id):
     presentation = Presentation.query.get_or_404(presentation_id)
     if presentation.user_id != g.current_user.id: return jsonify({'message': 'Доступ запрещен'}), 403
     data = request.get_json()
-    if 'title' in data: presentation.title = data['title']
+    if 'title' in data:
+        presentation.title = data['title']
+        touch_presentation(presentation.id, ('presentation.update', presentation.id, {'title': data['title']}))
     db.session.commit()
     
-    first_slide = Slide.query.filter_by(presentation_id=presentation.id, slide_number=1).first()
-    if first_slide:
-        elements = SlideElement.query.filter_by(slide_id=first_slide.id).all()
-        first_slide_data = {
-            'id': first_slide.id,
-            'slide_number': first_slide.slide_number,
-            'background_color': first_slide.background_color,
-            'elements': [{'id': e.id, 'element_type': e.element_type, 'pos_x': e.pos_x, 'pos_y': e.pos_y, 'width': e.width, 'height': e.height, 'content': e.content, 'font_size': e.font_size} for e in elements]
-        }
-    else:
-        first_slide_data = None
-
-    return jsonify({
-        'id': presentation.id,
-        'title': presentation.title,
-        'updated_at': presentation.updated_at.isoformat(),
-        'first_slide': first_slide_data
-    }), 200
-
-@presentations_bp.route('/upload/image', methods=['POST'])
-@token_required
-def upload_image():
-    if 'file' not in request.files:
-        return jsonify({'message': 'Файл не найден'}), 400
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'message': 'Файл не выбран'}), 400
-    if file:
-        _root, extension = os.path.splitext(file.filename)
-        filename = f"{uuid.uuid4()}{extension}"
-        
-        os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
-        save_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-        file.save(save_path)
-        file_url = url_for('static', filename=f'uploads/{filename}', _external=True)
-        return jsonify({'url': file_url}), 200
-
-@presentations_bp.route('/upload/video', methods=['POST'])
-@token_required
-def upload_video():
-    if 'file' not in request.files:
-        return jsonify({'message': 'Файл не найден'}), 400
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'message': 'Файл не выбран'}), 400
-
-    if file:
-        _root, extension = os.path.splitext(file.filename)
-        
-        temp_filename = f"{uuid.uuid4()}{extension}"
-        final_filename = f"{uuid.uuid4()}.mp4"
-
-        temp_path = os.path.join(current_app.config['UPLOAD_FOLDER'], temp_filename)
-        final_path = os.path.join(current_app.config['UPLOAD_FOLDER'], final_filename)
-
-        os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
-        file.save(temp_path)
-
-        try:
-            print(f"Starting conversion from {temp_path} to {final_path}")
-            ffmpeg.input(temp_path).output(
-                final_path, 
-                vcodec='libx264',
-                acodec='aac',
-                strict='experimental'
-            ).run(capture_stdout=True, capture_stderr=True)
-            print("Conversion successful")
-            
-            os.remove(temp_path)
-            
-            file_url = url_for('static', filename=f'uploads/{final_filename}', _external=True)
-            return jsonify({'url': file_url}), 200
-
-        except ffmpeg.Error as e:
-            os.remove(temp_path)
-            print("FFmpeg Error:")
-            print(e.stderr.decode())
-            return jsonify({'message': 'Не удалось обработать видеофайл'}), 500
\ No newline at end of file
+    first_slide = (db.session.query(*LISTING_SLIDE_COLUMNS)
+                   .filter(Slide.presentation_id == presentation.id)
+                   .order_by(Slide.position, Slide.id)
+                   .first())
+    return jsonify(serialize_listing_item(presentation, first_slide)), 200
\ No newline at end of file
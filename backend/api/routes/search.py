@@ -0,0 +1,19 @@
+from flask import request, jsonify, Blueprint, current_app, g
+from ..security import token_required
+from ..services.search import query_terms, search_presentations
+
+search_bp = Blueprint('search', __name__)
+
+@search_bp.route('/search', methods=['GET'])
+@token_required
+def search():
+    query = request.args.get('q', '')
+    terms = query_terms(query)
+    if not terms:
+        return jsonify({'message': 'Пустой поисковый запрос'}), 400
+    limit = min(max(request.args.get('limit', 20, type=int), 1), current_app.config['SEARCH_MAX_RESULTS'])
+
+    results = search_presentations(g.current_user.id, terms, limit)
+    if results is None:
+        return jsonify({'message': 'Поиск недоступен: индекс не построен'}), 503
+    return jsonify({'query': query, 'results': results}), 200
\ No newline at end of file
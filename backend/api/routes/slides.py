@@ -1,16 +1,37 @@
-from flask import request, jsonify, Blueprint, g
-from ..models import Presentation, Slide
+import os
+import re
+from flask import request, jsonify, Blueprint, current_app, send_file
+from ..models import Slide
 from ..extensions import db
-from .presentations import token_required
+from ..services.media_urls import valid_media_signature
+from ..services.storage import release_element_media
+from ..services.changes import touch_presentation
+from ..services.slide_order import POSITION_GAP, append_position, position_after, slide_number
+from ..services.slide_thumbnails import thumbnail_path
+from ..security import token_required
+from ..ownership import get_owned_presentation_or_404, get_owned_slide_or_404
+from ..serializers import serialize_slide
 
 slides_bp = Blueprint('slides', __name__)
 
+HEX_COLOR = re.compile(r'^#[0-9A-Fa-f]{6}$')
+THUMBNAIL_NAME = re.compile(r'^[0-9a-f]{64}\.(?:png|webp)$')
+
+def find_after_slide(presentation_id, data):
+    after_slide_id = data.get('after_slide_id')
+    if after_slide_id is None:
+        return None, None
+    if not isinstance(after_slide_id, int) or isinstance(after_slide_id, bool):
+        return None, 'Некорректный ID слайда'
+    after_slide = Slide.query.filter_by(id=after_slide_id, presentation_id=presentation_id).first()
+    if after_slide is None:
+        return None, 'Слайд не найден в этой презентации'
+    return after_slide, None
+
 @slides_bp.route('/presentations/<string:presentation_id>/slides/reorder', methods=['PUT'])
 @token_required
 def reorder_slides(presentation_id):
-    presentation = Presentation.query.get_or_404(presentation_id)
-    if presentation.user_id != g.current_user.id:
-        return jsonify({'message': 'Доступ запрещен'}), 403
+    get_owned_presentation_or_404(presentation_id)
 
     data = request.get_json()
     slide_ids = data.get('slide_ids')
@@ -25,48 +46,101 @@ def reorder_slides(presentation_id):
         return jsonify({'message': 'Некорректный набор ID слайдов'}), 400
 
     for index, slide_id in enumerate(slide_ids):
-        slide_map[slide_id].slide_number = index + 1
+        slide_map[slide_id].position = (index + 1) * POSITION_GAP
     
+    touch_presentation(presentation_id, ('slide.reorder', presentation_id, {'slide_ids': slide_ids}))
     db.session.commit()
 
     return jsonify({'message': 'Порядок слайдов обновлен'}), 200
 
+@slides_bp.route('/slides/<int:slide_id>/move', methods=['PUT'])
+@token_required
+def move_slide(slide_id):
+    slide = get_owned_slide_or_404(slide_id)
+
+    data = request.get_json() or {}
+    if 'after_slide_id' not in data:
+        return jsonify({'message': 'Требуется after_slide_id'}), 400
+    after_slide, error = find_after_slide(slide.presentation_id, data)
+    if error:
+        return jsonify({'message': error}), 400
+    if after_slide is not None and after_slide.id == slide.id:
+        return jsonify({'message': 'Нельзя переместить слайд после самого себя'}), 400
+
+    slide.position = position_after(slide.presentation_id, after_slide, exclude_id=slide.id)
+    touch_presentation(slide.presentation_id, ('slide.move', slide.id, {'after_slide_id': after_slide.id if after_slide else None}))
+    db.session.commit()
+
+    return jsonify({'message': 'Слайд перемещен'}), 200
+
 @slides_bp.route('/presentations/<string:presentation_id>/slides', methods=['POST'])
 @token_required
 def add_slide(presentation_id):
-    presentation = Presentation.query.get_or_404(presentation_id)
-    if presentation.user_id != g.current_user.id:
-        return jsonify({'message': 'Доступ запрещен'}), 403
+    presentation = get_owned_presentation_or_404(presentation_id)
 
-    max_slide_number = db.session.query(db.func.max(Slide.slide_number)).filter_by(presentation_id=presentation.id).scalar() or 0
-    
-    new_slide = Slide(
-        slide_number=max_slide_number + 1,
-        presentation_id=presentation.id
-    )
-    db.session.add(new_slide)
+    data = request.get_json(silent=True) or {}
+    if 'after_slide_id' in data:
+        after_slide, error = find_after_slide(presentation.id, data)
+        if error:
+            return jsonify({'message': error}), 400
+        new_slide = Slide(position=position_after(presentation.id, after_slide), presentation_id=presentation.id)
+        db.session.add(new_slide)
+        db.session.flush()
+        number = slide_number(new_slide)
+    else:
+        position, number = append_position(presentation.id)
+        new_slide = Slide(position=position, presentation_id=presentation.id)
+        db.session.add(new_slide)
+        db.session.flush()
+    response_data = serialize_slide(new_slide, number, [])
+    touch_presentation(presentation.id, ('slide.create', new_slide.id, response_data))
     db.session.commit()
 
-    return jsonify({
-        'id': new_slide.id,
-        'slide_number': new_slide.slide_number,
-        'background_color': new_slide.background_color,
-        'elements': []
-    }), 201
+    return jsonify(response_data), 201
+
+@slides_bp.route('/slides/<int:slide_id>', methods=['PUT'])
+@token_required
+def update_slide(slide_id):
+    slide = get_owned_slide_or_404(slide_id)
+
+    data = request.get_json() or {}
+    background_color = data.get('background_color')
+    if not isinstance(background_color, str) or not HEX_COLOR.match(background_color):
+        return jsonify({'message': 'Некорректный цвет фона'}), 400
+
+    slide.background_color = background_color
+    touch_presentation(slide.presentation_id, ('slide.update', slide.id, {'background_color': background_color}))
+    db.session.commit()
+
+    return jsonify({'message': 'Слайд обновлен'}), 200
 
 @slides_bp.route('/slides/<int:slide_id>', methods=['DELETE'])
 @token_required
 def delete_slide(slide_id):
-    slide = Slide.query.get_or_404(slide_id)
-    presentation = Presentation.query.get(slide.presentation_id)
+    slide = get_owned_slide_or_404(slide_id)
 
-    if presentation.user_id != g.current_user.id:
-        return jsonify({'message': 'Доступ запрещен'}), 403
-    
-    if Slide.query.filter_by(presentation_id=presentation.id).count() <= 1:
+    other_slide = (db.session.query(Slide.id)
+                   .filter(Slide.presentation_id == slide.presentation_id, Slide.id != slide.id)
+                   .first())
+    if other_slide is None:
         return jsonify({'message': 'Нельзя удалить последний слайд'}), 400
 
+    release_element_media(Slide.id == slide.id)
+    touch_presentation(slide.presentation_id, ('slide.delete', slide.id, None))
     db.session.delete(slide)
     db.session.commit()
 
-    return jsonify({'message': 'Слайд успешно удален'}), 204
\ No newline at end of file
+    return jsonify({'message': 'Слайд успешно удален'}), 204
+
+@slides_bp.route('/slides/thumbnails/<string:filename>', methods=['GET'])
+def get_slide_thumbnail(filename):
+    if not THUMBNAIL_NAME.match(filename):
+        return jsonify({'message': 'Миниатюра не найдена'}), 404
+    if not valid_media_signature(filename, request.args.get('expires', type=int), request.args.get('signature')):
+        return jsonify({'message': 'Доступ запрещен'}), 403
+    path = thumbnail_path(filename)
+    if not os.path.isfile(path):
+        return jsonify({'message': 'Миниатюра не найдена'}), 404
+    response = send_file(path, conditional=True)
+    response.headers['Cache-Control'] = f"private, max-age={current_app.config['SLIDE_THUMBNAIL_MAX_AGE']}, immutable"
+    return response
\ No newline at end of file
@@ -0,0 +1,163 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict, namedtuple
+from functools import wraps
+import jwt
+from flask import request, jsonify, current_app, g
+from sqlalchemy import event, inspect
+from .extensions import db
+from .models import User
+
+AuthenticatedUser = namedtuple('AuthenticatedUser', ['id', 'email'])
+
+def password_version(password_hash):
+    return hashlib.sha256(password_hash.encode('utf-8')).hexdigest()[:12]
+
+class TokenCache:
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, token):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, token, user, expires_in):
+        expires_at = time.monotonic() + min(self.ttl, max(expires_in, 0))
+        with self._lock:
+            self._entries[token] = (user, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            stale = [token for token, (user, _expires_at) in self._entries.items() if user.id == user_id]
+            for token in stale:
+                del self._entries[token]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+_token_cache = None
+_token_cache_lock = threading.Lock()
+
+def get_token_cache():
+    global _token_cache
+    with _token_cache_lock:
+        if _token_cache is None:
+            _token_cache = TokenCache(current_app.config['AUTH_CACHE_SIZE'], current_app.config['AUTH_CACHE_TTL'])
+        return _token_cache
+
+def invalidate_user(user_id):
+    if _token_cache is not None:
+        _token_cache.invalidate_user(user_id)
+
+@event.listens_for(User, 'after_delete')
+def _invalidate_deleted_user(mapper, connection, target):
+    invalidate_user(target.id)
+
+@event.listens_for(User, 'after_update')
+def _invalidate_updated_user(mapper, connection, target):
+    if inspect(target).attrs.password_hash.history.has_changes():
+        invalidate_user(target.id)
+
+STREAM_TICKET_SCOPE = 'events'
+
+def token_user(data):
+    row = db.session.query(User.id, User.email, User.password_hash).filter_by(id=data['user_id']).first()
+    if row is None:
+        return None
+    if 'pv' in data and data['pv'] != password_version(row.password_hash):
+        return None
+    return AuthenticatedUser(row.id, row.email)
+
+def authenticate(token):
+    cache = get_token_cache()
+    user = cache.get(token)
+    if user is not None:
+        return user
+
+    data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
+    if 'scope' in data:
+        return None
+    user = token_user(data)
+    if user is None:
+        return None
+
+    cache.set(token, user, data['exp'] - time.time() if 'exp' in data else cache.ttl)
+    return user
+
+def issue_stream_ticket(user_id, presentation_id):
+    password_hash = db.session.query(User.password_hash).filter_by(id=user_id).scalar()
+    expires = datetime.now(timezone.utc) + timedelta(seconds=current_app.config['EVENTS_TICKET_TTL'])
+    return jwt.encode({
+        'user_id': user_id,
+        'pv': password_version(password_hash),
+        'scope': STREAM_TICKET_SCOPE,
+        'presentation_id': presentation_id,
+        'exp': expires
+    }, current_app.config['SECRET_KEY'], algorithm="HS256")
+
+def stream_ticket_user(ticket, presentation_id):
+    data = jwt.decode(ticket, current_app.config['SECRET_KEY'], algorithms=["HS256"])
+    if data.get('scope') != STREAM_TICKET_SCOPE or data.get('presentation_id') != presentation_id:
+        return None
+    return token_user(data)
+
+def token_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = None
+        if 'authorization' in request.headers: token = request.headers['authorization'].split(' ')[1]
+        if not token: return jsonify({'message': 'Токен аутентификации отсутствует'}), 401
+        try:
+            g.current_user = authenticate(token)
+            if not g.current_user: return jsonify({'message': 'Пользователь не найден'}), 401
+        except: return jsonify({'message': 'Недействительный токен'}), 401
+        return f(*args, **kwargs)
+    return decorated
+
+def stream_ticket_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        ticket = request.args.get('ticket')
+        if not ticket: return jsonify({'message': 'Токен аутентификации отсутствует'}), 401
+        try:
+            g.current_user = stream_ticket_user(ticket, kwargs.get('presentation_id'))
+            if not g.current_user: return jsonify({'message': 'Недействительный токен'}), 401
+        except: return jsonify({'message': 'Недействительный токен'}), 401
+        return f(*args, **kwargs)
+    return decorated
\ No newline at end of file
@@ -0,0 +1,66 @@
+from itertools import groupby
+from .extensions import db
+from .models import Slide, SlideElement
+from .services.media_urls import is_uploaded_media, signed_media_url
+from .services.slide_order import first_slide_condition
+from .services.slide_thumbnails import thumbnail_url
+from .services.storage import MEDIA_ELEMENT_TYPES, media_filename
+
+ELEMENT_COLUMNS = (SlideElement.id, SlideElement.element_type, SlideElement.pos_x, SlideElement.pos_y,
+                   SlideElement.width, SlideElement.height, SlideElement.content, SlideElement.font_size)
+SLIDE_COLUMNS = (Slide.id, Slide.background_color, Slide.thumbnail_hash)
+LISTING_SLIDE_COLUMNS = (Slide.id, Slide.presentation_id, Slide.background_color, Slide.thumbnail_hash)
+YOUTUBE_THUMBNAIL_URL = "https://img.youtube.com/vi/{}/0.jpg"
+
+def serialize_element(e):
+    element_data = {
+        'id': e.id, 'element_type': e.element_type, 'pos_x': e.pos_x,
+        'pos_y': e.pos_y, 'width': e.width, 'height': e.height,
+        'content': e.content, 'font_size': e.font_size
+    }
+    if e.element_type == 'YOUTUBE_VIDEO':
+        element_data['thumbnailUrl'] = YOUTUBE_THUMBNAIL_URL.format(e.content)
+    elif e.element_type in MEDIA_ELEMENT_TYPES and is_uploaded_media(e.content):
+        element_data['content'] = signed_media_url(media_filename(e.content))
+    return element_data
+
+def serialize_slide(slide, number, elements=None):
+    if elements is None:
+        elements = slide.elements
+    return {
+        'id': slide.id, 'slide_number': number,
+        'background_color': slide.background_color,
+        'thumbnail_url': thumbnail_url(slide.thumbnail_hash),
+        'elements': [serialize_element(e) for e in elements]
+    }
+
+def serialize_listing_item(presentation, first_slide):
+    return {
+        'id': presentation.id,
+        'title': presentation.title,
+        'updated_at': presentation.updated_at.isoformat(),
+        'background_color': first_slide.background_color if first_slide else None,
+        'thumbnail_url': thumbnail_url(first_slide.thumbnail_hash) if first_slide else None
+    }
+
+def load_slide_rows(presentation_id):
+    slides = (db.session.query(*SLIDE_COLUMNS)
+              .filter(Slide.presentation_id == presentation_id)
+              .order_by(Slide.position, Slide.id)
+              .all())
+    if not slides:
+        return []
+    rows = (db.session.query(SlideElement.slide_id, *ELEMENT_COLUMNS)
+            .filter(SlideElement.slide_id.in_([slide.id for slide in slides]))
+            .all())
+    rows.sort(key=lambda row: row.slide_id)
+    elements = {slide_id: list(group) for slide_id, group in groupby(rows, key=lambda row: row.slide_id)}
+    return [serialize_slide(slide, number, elements.get(slide.id, ())) for number, slide in enumerate(slides, 1)]
+
+def load_first_slide_rows(presentation_ids):
+    if not presentation_ids:
+        return {}
+    return {row.presentation_id: row for row in (
+        db.session.query(*LISTING_SLIDE_COLUMNS)
+        .filter(Slide.presentation_id.in_(presentation_ids), first_slide_condition())
+        .all())}
\ No newline at end of file
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from ..extensions import db
+from ..events import publish_after_commit
+from ..models import Presentation, PresentationChange, Slide
+from .search import queue_changes_for_search
+from .slide_thumbnails import invalidate_slide_thumbnails
+
+def touch_presentation(presentation_id, *changes):
+    (Presentation.query
+        .filter_by(id=presentation_id)
+        .update({Presentation.version: Presentation.version + 1, Presentation.updated_at: datetime.utcnow()},
+                synchronize_session=False))
+    revision = db.session.query(Presentation.version).filter_by(id=presentation_id).scalar()
+    db.session.add_all([
+        PresentationChange(presentation_id=presentation_id, revision=revision, op=op, target_id=str(target_id), payload=payload)
+        for op, target_id, payload in changes
+    ])
+    publish_after_commit(db.session, presentation_id, revision)
+    invalidate_slide_thumbnails(changed_slide_ids(changes))
+    queue_changes_for_search(presentation_id, changes)
+    if revision % current_app.config['CHANGE_LOG_COMPACT_EVERY'] == 0:
+        compact_presentation_changes(presentation_id, revision - current_app.config['CHANGE_LOG_KEEP_REVISIONS'])
+    return revision
+
+def changed_slide_ids(changes):
+    for op, target_id, payload in changes:
+        if op.startswith('element.'):
+            yield payload['slide_id']
+        elif op in ('slide.create', 'slide.update'):
+            yield target_id
+
+def touch_slide_presentation(slide_id, *changes):
+    presentation_id = db.session.query(Slide.presentation_id).filter_by(id=slide_id).scalar()
+    return touch_presentation(presentation_id, *changes)
+
+def changes_since(presentation_id, since, limit):
+    revision = db.session.query(Presentation.version).filter_by(id=presentation_id).scalar()
+    if since == revision:
+        return revision, []
+    if since > revision:
+        return revision, None
+    changes = (PresentationChange.query
+               .filter(PresentationChange.presentation_id == presentation_id,
+                       PresentationChange.revision > since,
+                       PresentationChange.revision <= revision)
+               .order_by(PresentationChange.revision, PresentationChange.id)
+               .limit(limit + 1)
+               .all())
+    if not changes or changes[0].revision != since + 1 or len(changes) > limit:
+        return revision, None
+    return revision, changes
+
+def compact_presentation_changes(presentation_id, up_to_revision):
+    return (PresentationChange.query
+            .filter(PresentationChange.presentation_id == presentation_id, PresentationChange.revision <= up_to_revision)
+            .delete(synchronize_session=False))
+
+def compact_changes(max_age=None):
+    max_age = current_app.config['CHANGE_LOG_RETENTION'] if max_age is None else max_age
+    cutoff = datetime.utcnow() - timedelta(seconds=max_age)
+    removed = PresentationChange.query.filter(PresentationChange.created_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return removed
\ No newline at end of file
@@ -0,0 +1,46 @@
+import hashlib
+import json
+from flask import current_app
+from sqlalchemy.orm import selectinload
+from ..metrics import PhaseTimings
+from ..models import MediaAsset, Slide
+from .storage import MEDIA_ELEMENT_TYPES, media_filename
+
+PPTX_MIMETYPE = 'application/vnd.openxmlformats-officedocument-presentationml-presentation'
+
+def load_export_slides(presentation_id):
+    return (Slide.query
+            .options(selectinload(Slide.elements))
+            .filter_by(presentation_id=presentation_id)
+            .order_by(Slide.position, Slide.id)
+            .all())
+
+def media_states(slides):
+    filenames = {media_filename(e.content) for slide in slides for e in slide.elements
+                 if e.element_type in MEDIA_ELEMENT_TYPES and e.content}
+    if not filenames:
+        return []
+    return sorted([asset.filename, asset.status, asset.poster_filename, asset.width, asset.height]
+                  for asset in MediaAsset.query.filter(MediaAsset.filename.in_(filenames)))
+
+def presentation_fingerprint(presentation, slides):
+    payload = {
+        'title': presentation.title,
+        'media': media_states(slides),
+        'slides': [
+            [slide.id, slide.background_color, [
+                [e.id, e.element_type, e.pos_x, e.pos_y, e.width, e.height, e.content, e.font_size]
+                for e in sorted(slide.elements, key=lambda e: e.id)
+            ]]
+            for slide in slides
+        ]
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def export_pptx(slides, path, on_slide=None, timings=None):
+    from .pptx_builder import build_pptx, write_pptx
+
+    timings = timings or PhaseTimings()
+    prs, deferred_media = build_pptx(slides, on_slide=on_slide, stream_media=current_app.config['EXPORT_STREAM_MEDIA'], timings=timings)
+    with timings.phase('save'):
+        write_pptx(prs, deferred_media, path)
@@ -0,0 +1,146 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+from ..extensions import db
+from ..metrics import export_phase_timings, record_export_phases
+from ..models import ExportJob
+from .export import export_pptx, load_export_slides, presentation_fingerprint
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor(app):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=app.config['EXPORT_WORKERS'], thread_name_prefix='pptx-export')
+        return _executor
+
+def artifact_path(job):
+    return os.path.join(current_app.config['EXPORT_FOLDER'], job.file_name)
+
+def init_app(app):
+    with app.app_context():
+        try:
+            if db.inspect(db.engine).has_table(ExportJob.__tablename__):
+                fail_abandoned_jobs()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            app.logger.warning('Could not fail abandoned export jobs: %s', e)
+        finally:
+            db.session.remove()
+
+def heartbeat_cutoff():
+    return datetime.utcnow() - timedelta(seconds=current_app.config['EXPORT_JOB_STALE_AFTER'])
+
+def fail_abandoned_jobs():
+    failed = (ExportJob.query
+              .filter(ExportJob.status.in_(['queued', 'running']), ExportJob.updated_at < heartbeat_cutoff())
+              .update({ExportJob.status: 'failed', ExportJob.error: 'Экспорт прерван',
+                       ExportJob.finished_at: datetime.utcnow()}, synchronize_session=False))
+    db.session.commit()
+    return failed
+
+def find_reusable_job(presentation_id, fingerprint):
+    jobs = (ExportJob.query
+            .filter_by(presentation_id=presentation_id, fingerprint=fingerprint)
+            .filter(db.or_(ExportJob.status == 'done',
+                           db.and_(ExportJob.status.in_(['queued', 'running']), ExportJob.updated_at >= heartbeat_cutoff())))
+            .order_by(ExportJob.created_at.desc())
+            .all())
+    for job in jobs:
+        if job.status != 'done' or os.path.exists(artifact_path(job)):
+            return job
+    return None
+
+def start_export(presentation, user_id):
+    slides = load_export_slides(presentation.id)
+    fingerprint = presentation_fingerprint(presentation, slides)
+
+    job = find_reusable_job(presentation.id, fingerprint)
+    if job:
+        return job, False
+
+    job = ExportJob(presentation_id=presentation.id, user_id=user_id, fingerprint=fingerprint, slides_total=len(slides))
+    db.session.add(job)
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    get_executor(app).submit(run_export, app, job.id)
+    return job, True
+
+def run_export(app, job_id):
+    with app.app_context():
+        job = db.session.get(ExportJob, job_id)
+        if job is None or job.status != 'queued':
+            return
+        job.status = 'running'
+        db.session.commit()
+
+        file_name = f"{job.id}.pptx"
+        final_path = os.path.join(app.config['EXPORT_FOLDER'], file_name)
+        temp_path = f"{final_path}.part"
+        try:
+            slides = load_export_slides(job.presentation_id)
+            job.slides_total = len(slides)
+            db.session.commit()
+
+            def on_slide(done, total):
+                job.slides_done = done
+                db.session.commit()
+
+            os.makedirs(app.config['EXPORT_FOLDER'], exist_ok=True)
+            timings = export_phase_timings()
+            export_pptx(slides, temp_path, on_slide=on_slide, timings=timings)
+            record_export_phases(timings)
+            os.replace(temp_path, final_path)
+
+            job.file_name = file_name
+            job.status = 'done'
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+
+            discard_stale_artifacts(job)
+        except Exception as e:
+            db.session.rollback()
+            app.logger.exception('Export job %s failed', job_id, extra={'export_job_id': job_id})
+            job = db.session.get(ExportJob, job_id)
+            if job is not None:
+                job.status = 'failed'
+                job.error = str(e)
+                job.finished_at = datetime.utcnow()
+                db.session.commit()
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+def discard_stale_artifacts(job):
+    grace_cutoff = datetime.utcnow() - timedelta(seconds=current_app.config['EXPORT_ARTIFACT_GRACE'])
+    stale_jobs = (ExportJob.query
+                  .filter(ExportJob.presentation_id == job.presentation_id, ExportJob.id != job.id)
+                  .filter(db.or_(ExportJob.status == 'failed',
+                                 db.and_(ExportJob.status == 'done', ExportJob.finished_at < grace_cutoff)))
+                  .all())
+    for stale in stale_jobs:
+        if stale.file_name:
+            try:
+                os.remove(artifact_path(stale))
+            except FileNotFoundError:
+                pass
+        db.session.delete(stale)
+    db.session.commit()
+
+def serialize_job(job):
+    return {
+        'id': job.id,
+        'presentation_id': job.presentation_id,
+        'status': job.status,
+        'slides_total': job.slides_total,
+        'slides_done': job.slides_done,
+        'error': job.error,
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
@@ -0,0 +1,119 @@
+import os
+from flask import current_app
+from ..extensions import db
+from ..models import MediaAsset
+
+EXPORT_RENDITION = 'export'
+PPTX_IMAGE_FORMATS = ('PNG', 'JPEG', 'GIF', 'BMP', 'TIFF')
+IMAGE_EXTENSIONS = {'PNG': '.png', 'JPEG': '.jpg', 'GIF': '.gif', 'BMP': '.bmp', 'TIFF': '.tiff', 'WEBP': '.webp'}
+EXTENSION_FORMATS = {'.jpeg': 'JPEG', '.tif': 'TIFF', **{extension: name for name, extension in IMAGE_EXTENSIONS.items()}}
+
+def upload_path(filename):
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+
+def image_format(path):
+    from PIL import Image
+
+    try:
+        with Image.open(path) as img:
+            img.verify()
+            return img.format
+    except Exception:
+        return None
+
+def source_format(asset):
+    return EXTENSION_FORMATS.get(os.path.splitext(asset.filename)[1].lower())
+
+def rendition_format(name, source, webp=None):
+    webp = current_app.config['IMAGE_RENDITIONS_WEBP'] if webp is None else webp
+    if name != EXPORT_RENDITION and webp:
+        return 'WEBP'
+    if source == 'JPEG':
+        return 'JPEG'
+    return 'PNG'
+
+def needs_rendition(asset, name, max_size):
+    if name == EXPORT_RENDITION and source_format(asset) not in PPTX_IMAGE_FORMATS:
+        return True
+    return max(asset.width, asset.height) > max_size
+
+def rendition_filename(asset, name, webp=None):
+    max_size = current_app.config['IMAGE_RENDITIONS'].get(name)
+    if max_size is None or not asset.width or not asset.height or not needs_rendition(asset, name, max_size):
+        return asset.filename
+    root, extension = os.path.splitext(asset.filename)
+    source = source_format(asset)
+    target = rendition_format(name, source, webp)
+    if target != source:
+        extension = IMAGE_EXTENSIONS[target]
+    return f"{root}_{name}{extension}"
+
+def available_rendition(asset, name):
+    webp = current_app.config['IMAGE_RENDITIONS_WEBP']
+    for candidate in (webp, not webp):
+        filename = rendition_filename(asset, name, candidate)
+        if filename == asset.filename or os.path.exists(upload_path(filename)):
+            return filename
+    return asset.filename
+
+def create_renditions(asset):
+    from PIL import Image
+
+    with Image.open(upload_path(asset.filename)) as img:
+        asset.width, asset.height = img.size
+        for name in current_app.config['IMAGE_RENDITIONS']:
+            filename = rendition_filename(asset, name)
+            if filename == asset.filename:
+                continue
+            path = upload_path(filename)
+            if os.path.exists(path):
+                continue
+            rendition = img.copy()
+            rendition.thumbnail((current_app.config['IMAGE_RENDITIONS'][name],) * 2, Image.LANCZOS)
+            target_format = rendition_format(name, source_format(asset))
+            if target_format == 'JPEG' and rendition.mode not in ('RGB', 'L'):
+                rendition = rendition.convert('RGB')
+            elif rendition.mode == 'P':
+                rendition = rendition.convert('RGBA')
+            temp_path = f"{path}.part"
+            rendition.save(temp_path, format=target_format, quality=85)
+            os.replace(temp_path, path)
+
+def rendition_filenames(asset):
+    return {rendition_filename(asset, name, webp)
+            for name in current_app.config['IMAGE_RENDITIONS'] for webp in (False, True)} - {asset.filename}
+
+def missing_renditions(asset):
+    if not asset.width or not asset.height:
+        return True
+    return any(not os.path.exists(upload_path(rendition_filename(asset, name))) for name in current_app.config['IMAGE_RENDITIONS'])
+
+def regenerate_renditions(batch_size=None):
+    from .slide_thumbnails import invalidate_media_thumbnails
+
+    batch_size = batch_size or current_app.config['MEDIA_GC_BATCH_SIZE']
+    stats = {'assets_updated': 0, 'assets_failed': 0}
+    after_id = ''
+    while True:
+        assets = (MediaAsset.query
+                  .filter(MediaAsset.kind == 'image', MediaAsset.status == 'ready', MediaAsset.id > after_id)
+                  .order_by(MediaAsset.id)
+                  .limit(batch_size)
+                  .all())
+        if not assets:
+            break
+        after_id = assets[-1].id
+        for asset in assets:
+            if not missing_renditions(asset) or not os.path.exists(upload_path(asset.filename)):
+                continue
+            try:
+                create_renditions(asset)
+                invalidate_media_thumbnails(asset)
+                db.session.commit()
+                stats['assets_updated'] += 1
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.warning('Could not create renditions for %s: %s', asset.filename, e)
+                stats['assets_failed'] += 1
+        db.session.expunge_all()
+    return stats
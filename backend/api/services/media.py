@@ -0,0 +1,64 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from ..extensions import db
+from ..models import MediaAsset
+from .storage import reuse_asset, register_asset
+
+class TranscodeQueueFull(Exception):
+    pass
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+def get_executor(app):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=app.config['VIDEO_TRANSCODE_WORKERS'], thread_name_prefix='video-transcode')
+        return _executor
+
+def enqueue_video(source_path, content_hash, size):
+    global _pending
+    app = current_app._get_current_object()
+
+    asset = reuse_asset('video', content_hash)
+    if asset is not None and asset.status != 'failed':
+        os.remove(source_path)
+        return asset
+
+    with _pending_lock:
+        if _pending >= app.config['VIDEO_TRANSCODE_QUEUE_LIMIT']:
+            raise TranscodeQueueFull()
+        _pending += 1
+
+    try:
+        if asset is None:
+            asset = register_asset(MediaAsset(
+                kind='video', status='processing', filename=f"{content_hash}.mp4",
+                content_hash=content_hash, size=size
+            ))
+        else:
+            asset.status = 'processing'
+            asset.error = None
+            db.session.commit()
+        get_executor(app).submit(process_video, app, asset.id, source_path)
+    except Exception:
+        with _pending_lock:
+            _pending -= 1
+        raise
+    return asset
+
+def process_video(app, asset_id, source_path):
+    global _pending
+    try:
+        from .transcoding import transcode_asset
+
+        with app.app_context():
+            transcode_asset(asset_id, source_path)
+    finally:
+        with _pending_lock:
+            _pending -= 1
\ No newline at end of file
@@ -0,0 +1,33 @@
+import hashlib
+import hmac
+import time
+from flask import current_app, url_for
+
+MEDIA_URL_MARKERS = ('/static/uploads/', '/media/files/')
+
+def media_url_expiry():
+    ttl = current_app.config['MEDIA_URL_TTL']
+    return (int(time.time()) // ttl + 2) * ttl
+
+def media_signature(filename, expires):
+    message = f"{filename}:{expires}".encode('utf-8')
+    return hmac.new(current_app.config['SECRET_KEY'].encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+def valid_media_signature(filename, expires, signature):
+    if expires is None or not signature or expires < time.time():
+        return False
+    return hmac.compare_digest(media_signature(filename, expires), signature)
+
+def signed_url(endpoint, filename, **values):
+    expires = media_url_expiry()
+    return url_for(endpoint, filename=filename, expires=expires, signature=media_signature(filename, expires),
+                   _external=True, **values)
+
+def signed_media_url(filename):
+    return signed_url('media.serve_media_file', filename) if filename else None
+
+def is_uploaded_media(content):
+    return bool(content) and any(marker in content for marker in MEDIA_URL_MARKERS)
+
+def unsigned_media_content(content):
+    return content.split('?', 1)[0] if is_uploaded_media(content) else content
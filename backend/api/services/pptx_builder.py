@@ -0,0 +1,193 @@
+import hashlib
+import io
+import os
+import shutil
+import zipfile
+from flask import current_app
+from pptx import Presentation as PptxPresentation
+from pptx.util import Inches, Pt
+from PIL import Image
+from ..extensions import db
+from ..metrics import PhaseTimings
+from ..models import MediaAsset
+from .images import available_rendition, EXPORT_RENDITION
+from .storage import media_filename
+from .youtube_thumbnails import get_thumbnail_fetcher
+
+PIXELS_PER_INCH = 80.0
+MEDIA_PLACEHOLDER_PREFIX = b'pptx-deferred-media:'
+COPY_CHUNK_SIZE = 1024 * 1024
+ELEMENT_PHASES = {'TEXT': 'text', 'IMAGE': 'images', 'YOUTUBE_VIDEO': 'thumbnails', 'UPLOADED_VIDEO': 'video'}
+
+def px_to_inches(px):
+    return px / PIXELS_PER_INCH
+
+def build_pptx(slides, on_slide=None, stream_media=True, timings=None):
+    timings = timings or PhaseTimings()
+    deferred_media = {}
+    prs = PptxPresentation()
+    prs.slide_width = Inches(16)
+    prs.slide_height = Inches(9)
+
+    with timings.phase('thumbnails'):
+        thumbnails = get_thumbnail_fetcher().fetch_many([
+            element.content
+            for slide_data in slides
+            for element in slide_data.elements
+            if element.element_type == 'YOUTUBE_VIDEO' and element.content
+        ])
+
+    video_filenames = [
+        media_filename(element.content)
+        for slide_data in slides
+        for element in slide_data.elements
+        if element.element_type == 'UPLOADED_VIDEO' and element.content
+    ]
+    posters = {}
+    if video_filenames:
+        posters = dict(db.session.query(MediaAsset.filename, MediaAsset.poster_filename)
+                       .filter(MediaAsset.filename.in_(video_filenames), MediaAsset.poster_filename.isnot(None))
+                       .all())
+    image_filenames = [
+        media_filename(element.content)
+        for slide_data in slides
+        for element in slide_data.elements
+        if element.element_type == 'IMAGE' and element.content
+    ]
+    image_assets = {}
+    if image_filenames:
+        image_assets = {asset.filename: asset for asset in MediaAsset.query.filter(MediaAsset.filename.in_(image_filenames)).all()}
+    default_poster_path = os.path.join(current_app.root_path, 'static', 'video_poster.png')
+
+    for index, slide_data in enumerate(slides):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        for element in slide_data.elements:
+            with timings.phase(ELEMENT_PHASES.get(element.element_type, 'text')):
+                container_left = Inches(px_to_inches(element.pos_x))
+                container_top = Inches(px_to_inches(element.pos_y))
+                container_width = Inches(px_to_inches(element.width))
+                container_height = Inches(px_to_inches(element.height))
+
+                if element.element_type == 'TEXT':
+                    txBox = slide.shapes.add_textbox(container_left, container_top, container_width, container_height)
+                    tf = txBox.text_frame
+                    tf.text = element.content or ""
+                    tf.word_wrap = True
+                    if tf.paragraphs:
+                        tf.paragraphs[0].font.size = Pt(element.font_size or 24)
+            
+                elif element.element_type == 'IMAGE' and element.content:
+                    try:
+                        filename = media_filename(element.content)
+                        image_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+                        image_asset = image_assets.get(filename)
+
+                        if image_asset and image_asset.width and image_asset.height:
+                            img_width, img_height = image_asset.width, image_asset.height
+                            image_path = os.path.join(current_app.config['UPLOAD_FOLDER'], available_rendition(image_asset, EXPORT_RENDITION))
+                        else:
+                            if not os.path.exists(image_path):
+                                continue
+                            with Image.open(image_path) as img:
+                                img_width, img_height = img.size
+
+                        if not os.path.exists(image_path):
+                            continue
+
+                        container_aspect = container_width / container_height
+                        img_aspect = img_width / img_height
+
+                        if img_aspect > container_aspect:
+                            new_width = container_width
+                            new_height = new_width / img_aspect
+                        else:
+                            new_height = container_height
+                            new_width = new_height * img_aspect
+
+                        left_offset = (container_width - new_width) / 2
+                        top_offset = (container_height - new_height) / 2
+                    
+                        final_left = container_left + left_offset
+                        final_top = container_top + top_offset
+
+                        slide.shapes.add_picture(image_path, final_left, final_top, width=new_width, height=new_height)
+
+                    except Exception as e:
+                        current_app.logger.warning('Could not add image %s: %s', element.content, e)
+
+                elif element.element_type == 'YOUTUBE_VIDEO' and element.content:
+                    thumbnail = thumbnails.get(element.content)
+                    image_stream = io.BytesIO(thumbnail) if thumbnail else None
+
+                    if image_stream:
+                        try:
+                            pic = slide.shapes.add_picture(image_stream, container_left, container_top, width=container_width, height=container_height)
+                            hlink = pic.click_action.hyperlink
+                            hlink.address = f"https://www.youtube.com/watch?v={element.content}"
+                        except Exception as e:
+                            current_app.logger.warning('Could not add video thumbnail for %s: %s', element.content, e)
+            
+                elif element.element_type == 'UPLOADED_VIDEO' and element.content:
+                    try:
+                        filename = media_filename(element.content)
+                        video_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+                        poster_path = default_poster_path
+                        if filename in posters:
+                            poster_path = os.path.join(current_app.config['UPLOAD_FOLDER'], posters[filename])
+                    
+                        video_exists = os.path.exists(video_path)
+                        poster_exists = os.path.exists(poster_path)
+
+                        if video_exists and poster_exists:
+                            MIME_TYPES = { '.mp4': 'video/mp4', '.webm': 'video/webm' }
+                            _root, extension = os.path.splitext(filename)
+                            mime_type = MIME_TYPES.get(extension.lower(), 'video/mp4')
+
+                            movie_file = video_path
+                            if stream_media:
+                                placeholder = MEDIA_PLACEHOLDER_PREFIX + hashlib.sha1(video_path.encode('utf-8')).hexdigest().encode('ascii')
+                                deferred_media[placeholder] = video_path
+                                movie_file = io.BytesIO(placeholder)
+
+                            slide.shapes.add_movie(
+                                movie_file, 
+                                container_left, container_top, container_width, container_height,
+                                poster_frame_image=poster_path,
+                                mime_type=mime_type
+                            )
+                        else:
+                            if not video_exists: current_app.logger.warning('Video file not found at %s', video_path)
+                            if not poster_exists: current_app.logger.warning('Poster frame not found at %s. UPLOADED_VIDEO will not be added.', poster_path)
+                    except Exception as e:
+                        current_app.logger.warning('Could not add uploaded video %s: %s', element.content, e)
+
+        if on_slide:
+            on_slide(index + 1, len(slides))
+
+    return prs, deferred_media
+
+def write_pptx(prs, deferred_media, path):
+    if not deferred_media:
+        prs.save(path)
+        return
+
+    skeleton_path = f"{path}.skeleton"
+    prs.save(skeleton_path)
+    try:
+        placeholder_size = len(next(iter(deferred_media)))
+        with zipfile.ZipFile(skeleton_path) as source, zipfile.ZipFile(path, 'w', allowZip64=True) as target:
+            for info in source.infolist():
+                media_path = None
+                if info.filename.startswith('ppt/media/') and info.file_size == placeholder_size:
+                    media_path = deferred_media.get(source.read(info))
+
+                if media_path:
+                    entry = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                    entry.compress_type = zipfile.ZIP_STORED
+                    with open(media_path, 'rb') as src, target.open(entry, 'w', force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+                else:
+                    with source.open(info) as src, target.open(info, 'w', force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+    finally:
+        os.remove(skeleton_path)
\ No newline at end of file
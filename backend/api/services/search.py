@@ -0,0 +1,264 @@
+import html
+import re
+from flask import current_app
+from sqlalchemy import bindparam, event, text
+from sqlalchemy.orm import Session
+from ..extensions import db
+from ..models import Presentation, SlideElement
+
+MAX_QUERY_TERMS = 8
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+SNIPPET_WORDS = 12
+TOKEN_PATTERN = re.compile(r'\w+')
+SLIDE_NUMBER = 'SELECT count(*) FROM slide o WHERE o.presentation_id = s.presentation_id AND o.position <= s.position'
+
+_ready_engines = set()
+
+class SqliteSearchIndex:
+    schema = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS slide_search USING fts5(content, tokenize='unicode61 remove_diacritics 2')",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS presentation_search USING fts5(title, presentation_id UNINDEXED, "
+        "tokenize='unicode61 remove_diacritics 2')"
+    ]
+    drop = ["DROP TABLE IF EXISTS slide_search", "DROP TABLE IF EXISTS presentation_search"]
+    exists = "SELECT 1 FROM sqlite_master WHERE name = 'slide_search'"
+    insert_slide = "INSERT INTO slide_search (rowid, content) VALUES (:slide_id, :content)"
+    delete_slides = "DELETE FROM slide_search WHERE rowid IN :slide_ids"
+    insert_title = "INSERT INTO presentation_search (title, presentation_id) VALUES (:title, :presentation_id)"
+    delete_titles = "DELETE FROM presentation_search WHERE presentation_id IN :presentation_ids"
+    rebuild = [
+        "DELETE FROM slide_search",
+        "DELETE FROM presentation_search",
+        "INSERT INTO presentation_search (title, presentation_id) SELECT title, id FROM presentation",
+        "INSERT INTO slide_search (rowid, content) "
+        "SELECT slide_id, group_concat(content, char(10)) FROM slide_element "
+        "WHERE element_type = 'TEXT' AND content IS NOT NULL AND content != '' GROUP BY slide_id"
+    ]
+    search_titles = (
+        "SELECT p.id AS presentation_id, p.title, -bm25(presentation_search) AS score, "
+        "highlight(presentation_search, 0, char(2), char(3)) AS snippet "
+        "FROM presentation_search JOIN presentation p ON p.id = presentation_search.presentation_id "
+        "WHERE presentation_search MATCH :match AND p.user_id = :user_id "
+        "ORDER BY bm25(presentation_search) LIMIT :limit"
+    )
+    search_slides = (
+        "SELECT p.id AS presentation_id, p.title, s.id AS slide_id, s.thumbnail_hash, "
+        f"({SLIDE_NUMBER}) AS slide_number, "
+        f"-bm25(slide_search) AS score, snippet(slide_search, 0, char(2), char(3), '…', {SNIPPET_WORDS}) AS snippet "
+        "FROM slide_search JOIN slide s ON s.id = slide_search.rowid JOIN presentation p ON p.id = s.presentation_id "
+        "WHERE slide_search MATCH :match AND p.user_id = :user_id "
+        "ORDER BY bm25(slide_search) LIMIT :limit"
+    )
+
+    @staticmethod
+    def match(terms):
+        return ' '.join(f'"{term}"*' for term in terms)
+
+class PostgresSearchIndex:
+    schema = [
+        "CREATE TABLE IF NOT EXISTS slide_search (slide_id INTEGER PRIMARY KEY, content TEXT NOT NULL, document TSVECTOR NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_slide_search_document ON slide_search USING GIN (document)",
+        "CREATE TABLE IF NOT EXISTS presentation_search (presentation_id VARCHAR(36) PRIMARY KEY, title TEXT NOT NULL, "
+        "document TSVECTOR NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_presentation_search_document ON presentation_search USING GIN (document)"
+    ]
+    drop = ["DROP TABLE IF EXISTS slide_search", "DROP TABLE IF EXISTS presentation_search"]
+    exists = "SELECT to_regclass('slide_search') IS NOT NULL"
+    insert_slide = ("INSERT INTO slide_search (slide_id, content, document) "
+                    "VALUES (:slide_id, :content, to_tsvector(CAST(:config AS regconfig), :content))")
+    delete_slides = "DELETE FROM slide_search WHERE slide_id IN :slide_ids"
+    insert_title = ("INSERT INTO presentation_search (presentation_id, title, document) "
+                    "VALUES (:presentation_id, :title, to_tsvector(CAST(:config AS regconfig), :title))")
+    delete_titles = "DELETE FROM presentation_search WHERE presentation_id IN :presentation_ids"
+    rebuild = [
+        "DELETE FROM slide_search",
+        "DELETE FROM presentation_search",
+        "INSERT INTO presentation_search (presentation_id, title, document) "
+        "SELECT id, title, to_tsvector(CAST(:config AS regconfig), title) FROM presentation",
+        "INSERT INTO slide_search (slide_id, content, document) "
+        "SELECT slide_id, string_agg(content, E'\\n' ORDER BY id), "
+        "to_tsvector(CAST(:config AS regconfig), string_agg(content, E'\\n' ORDER BY id)) FROM slide_element "
+        "WHERE element_type = 'TEXT' AND content IS NOT NULL AND content != '' GROUP BY slide_id"
+    ]
+    search_titles = (
+        "SELECT p.id AS presentation_id, p.title, ts_rank(ps.document, q.query) AS score, "
+        "ts_headline(CAST(:config AS regconfig), ps.title, q.query, "
+        "'HighlightAll=true,StartSel=' || chr(2) || ',StopSel=' || chr(3)) AS snippet "
+        "FROM presentation_search ps JOIN presentation p ON p.id = ps.presentation_id "
+        "CROSS JOIN (SELECT to_tsquery(CAST(:config AS regconfig), :match) AS query) q "
+        "WHERE ps.document @@ q.query AND p.user_id = :user_id "
+        "ORDER BY score DESC LIMIT :limit"
+    )
+    search_slides = (
+        "SELECT p.id AS presentation_id, p.title, s.id AS slide_id, s.thumbnail_hash, "
+        f"({SLIDE_NUMBER}) AS slide_number, "
+        "ts_rank(ss.document, q.query) AS score, "
+        "ts_headline(CAST(:config AS regconfig), ss.content, q.query, "
+        f"'MaxWords={SNIPPET_WORDS},MinWords=4,MaxFragments=1,StartSel=' || chr(2) || ',StopSel=' || chr(3)) AS snippet "
+        "FROM slide_search ss JOIN slide s ON s.id = ss.slide_id JOIN presentation p ON p.id = s.presentation_id "
+        "CROSS JOIN (SELECT to_tsquery(CAST(:config AS regconfig), :match) AS query) q "
+        "WHERE ss.document @@ q.query AND p.user_id = :user_id "
+        "ORDER BY score DESC LIMIT :limit"
+    )
+
+    @staticmethod
+    def match(terms):
+        return ' & '.join(f'{term}:*' for term in terms)
+
+BACKENDS = {'sqlite': SqliteSearchIndex, 'postgresql': PostgresSearchIndex}
+
+def backend_for(connection):
+    return BACKENDS.get(connection.dialect.name)
+
+def statement(sql, *expanding):
+    return text(sql).bindparams(*(bindparam(name, expanding=True) for name in expanding))
+
+def config_params():
+    return {'config': current_app.config['SEARCH_TS_CONFIG']}
+
+def create_search_schema(connection):
+    backend = backend_for(connection)
+    if backend is None:
+        return
+    for sql in backend.schema:
+        connection.execute(text(sql))
+
+def drop_search_schema(connection):
+    backend = backend_for(connection)
+    if backend is None:
+        return
+    for sql in backend.drop:
+        connection.execute(text(sql))
+    _ready_engines.discard(connection.engine.url)
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_search_schema(target, connection, **kw):
+    create_search_schema(connection)
+
+@event.listens_for(db.metadata, 'before_drop')
+def _drop_search_schema(target, connection, **kw):
+    drop_search_schema(connection)
+
+def search_index_ready(session):
+    connection = session.connection()
+    if connection.engine.url in _ready_engines:
+        return True
+    backend = backend_for(connection)
+    if backend is None or not connection.execute(text(backend.exists)).scalar():
+        return False
+    _ready_engines.add(connection.engine.url)
+    return True
+
+def queue_search_refresh(slide_ids=(), presentation_ids=()):
+    db.session.info.setdefault('search_slides', set()).update(slide_ids)
+    db.session.info.setdefault('search_presentations', set()).update(presentation_ids)
+
+def queue_changes_for_search(presentation_id, changes):
+    slide_ids = set()
+    presentation_ids = set()
+    for op, target_id, payload in changes:
+        if op.startswith('element.'):
+            slide_ids.add(payload['slide_id'])
+        elif op in ('slide.create', 'slide.update', 'slide.delete'):
+            slide_ids.add(int(target_id))
+        elif op == 'presentation.update':
+            presentation_ids.add(presentation_id)
+    if slide_ids or presentation_ids:
+        queue_search_refresh(slide_ids, presentation_ids)
+
+def refresh_slides(session, backend, slide_ids):
+    params = config_params()
+    contents = {}
+    for slide_id, content in (session.query(SlideElement.slide_id, SlideElement.content)
+                              .filter(SlideElement.slide_id.in_(slide_ids), SlideElement.element_type == 'TEXT')
+                              .order_by(SlideElement.slide_id, SlideElement.id)):
+        if content:
+            contents.setdefault(slide_id, []).append(content)
+    session.execute(statement(backend.delete_slides, 'slide_ids'), {'slide_ids': list(slide_ids)})
+    rows = [{'slide_id': slide_id, 'content': '\n'.join(parts), **params} for slide_id, parts in contents.items()]
+    if rows:
+        session.execute(text(backend.insert_slide), rows)
+
+def refresh_titles(session, backend, presentation_ids):
+    params = config_params()
+    session.execute(statement(backend.delete_titles, 'presentation_ids'), {'presentation_ids': list(presentation_ids)})
+    rows = [{'presentation_id': pid, 'title': title, **params}
+            for pid, title in session.query(Presentation.id, Presentation.title).filter(Presentation.id.in_(presentation_ids))]
+    if rows:
+        session.execute(text(backend.insert_title), rows)
+
+@event.listens_for(Session, 'before_commit')
+def _refresh_search_index(session):
+    slide_ids = session.info.pop('search_slides', None)
+    presentation_ids = session.info.pop('search_presentations', None)
+    if not slide_ids and not presentation_ids:
+        return
+    session.flush()
+    if not search_index_ready(session):
+        return
+    backend = backend_for(session.connection())
+    if slide_ids:
+        refresh_slides(session, backend, slide_ids)
+    if presentation_ids:
+        refresh_titles(session, backend, presentation_ids)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_search_refresh(session):
+    session.info.pop('search_slides', None)
+    session.info.pop('search_presentations', None)
+
+def rebuild_search_index():
+    connection = db.session.connection()
+    backend = backend_for(connection)
+    if backend is None:
+        raise RuntimeError(f"Full-text search is not supported on {connection.dialect.name}")
+    create_search_schema(connection)
+    for sql in backend.rebuild:
+        db.session.execute(text(sql), config_params() if ':config' in sql else {})
+    slides = db.session.execute(text('SELECT count(*) FROM slide_search')).scalar()
+    presentations = db.session.execute(text('SELECT count(*) FROM presentation_search')).scalar()
+    db.session.commit()
+    return presentations, slides
+
+def query_terms(query):
+    return TOKEN_PATTERN.findall(query.lower())[:MAX_QUERY_TERMS]
+
+def format_snippet(snippet):
+    return html.escape(snippet or '').replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>')
+
+def weighted_scores(rows, weight):
+    return [(row, float(row.score) * weight) for row in rows]
+
+def search_presentations(user_id, terms, limit):
+    from .slide_thumbnails import thumbnail_url
+
+    if not search_index_ready(db.session):
+        return None
+    backend = backend_for(db.session.connection())
+    params = {'match': backend.match(terms), 'user_id': user_id, 'limit': limit, **config_params()}
+    titles = weighted_scores(db.session.execute(text(backend.search_titles), params),
+                             current_app.config['SEARCH_TITLE_WEIGHT'])
+    slides = weighted_scores(db.session.execute(text(backend.search_slides), params), 1)
+    top = max((score for _row, score in titles + slides), default=0)
+    scale = 1 / top if top > 0 else 0
+    results = [{
+        'presentation_id': row.presentation_id,
+        'title': row.title,
+        'slide_id': None,
+        'slide_number': None,
+        'thumbnail_url': None,
+        'snippet': format_snippet(row.snippet),
+        'score': round(score * scale, 6)
+    } for row, score in titles]
+    results.extend({
+        'presentation_id': row.presentation_id,
+        'title': row.title,
+        'slide_id': row.slide_id,
+        'slide_number': row.slide_number,
+        'thumbnail_url': thumbnail_url(row.thumbnail_hash),
+        'snippet': format_snippet(row.snippet),
+        'score': round(score * scale, 6)
+    } for row, score in slides)
+    results.sort(key=lambda result: -result['score'])
+    return results[:limit]
\ No newline at end of file
@@ -0,0 +1,63 @@
+from sqlalchemy.orm import aliased
+from ..extensions import db
+from ..models import Slide
+
+POSITION_GAP = 1 << 20
+
+def first_slide_condition():
+    earlier = aliased(Slide)
+    return ~(db.session.query(earlier.id)
+             .filter(earlier.presentation_id == Slide.presentation_id, earlier.position < Slide.position)
+             .exists())
+
+def slide_number(slide):
+    return (db.session.query(db.func.count(Slide.id))
+            .filter(Slide.presentation_id == slide.presentation_id, Slide.position <= slide.position)
+            .scalar())
+
+def append_position(presentation_id):
+    last_position, count = (db.session.query(db.func.max(Slide.position), db.func.count(Slide.id))
+                            .filter_by(presentation_id=presentation_id)
+                            .one())
+    return (last_position or 0) + POSITION_GAP, count + 1
+
+def neighbour_positions(presentation_id, after_position, exclude_id):
+    query = db.session.query(db.func.min(Slide.position)).filter(Slide.presentation_id == presentation_id, Slide.id != exclude_id)
+    if after_position is not None:
+        query = query.filter(Slide.position > after_position)
+    return after_position, query.scalar()
+
+def position_after(presentation_id, after_slide, exclude_id=None):
+    after_position = after_slide.position if after_slide is not None else None
+    lower, upper = neighbour_positions(presentation_id, after_position, exclude_id)
+    if upper is None:
+        return POSITION_GAP if lower is None else lower + POSITION_GAP
+    if lower is None:
+        return upper - POSITION_GAP
+    if upper - lower > 1:
+        return (lower + upper) // 2
+    rebalance_positions(presentation_id)
+    lower, upper = neighbour_positions(presentation_id, after_slide.position, exclude_id)
+    return (lower + upper) // 2 if upper is not None else lower + POSITION_GAP
+
+def rebalance_positions(presentation_id):
+    slides = (Slide.query
+              .filter_by(presentation_id=presentation_id)
+              .order_by(Slide.position, Slide.id)
+              .all())
+    for index, slide in enumerate(slides):
+        slide.position = (index + 1) * POSITION_GAP
+    db.session.flush()
+    return len(slides)
+
+def rebalance_crowded_presentations(min_gap=POSITION_GAP >> 10):
+    previous = aliased(Slide)
+    crowded = [pid for (pid,) in (db.session.query(Slide.presentation_id)
+                                  .join(previous, db.and_(previous.presentation_id == Slide.presentation_id,
+                                                          previous.position < Slide.position,
+                                                          previous.position > Slide.position - min_gap))
+                                  .distinct())]
+    for presentation_id in crowded:
+        rebalance_positions(presentation_id)
+    db.session.commit()
+    return len(crowded)
\ No newline at end of file
@@ -0,0 +1,123 @@
+import io
+import os
+import threading
+from functools import lru_cache
+from flask import current_app
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+from ..models import MediaAsset
+from .images import available_rendition, upload_path
+from .storage import media_filename
+from .youtube_thumbnails import get_thumbnail_fetcher
+
+SLIDE_WIDTH = 1280
+SLIDE_HEIGHT = 720
+TEXT_PADDING = 8
+PLACEHOLDER_COLOR = '#000000'
+PLAY_ICON_COLOR = '#FFFFFF'
+
+@lru_cache(maxsize=64)
+def load_font(font_path, size):
+    try:
+        return ImageFont.truetype(font_path, size)
+    except OSError:
+        return ImageFont.load_default(size)
+
+def wrap_text(draw, text, font, max_width):
+    lines = []
+    for paragraph in text.split('\n'):
+        line = ''
+        for word in paragraph.split(' '):
+            candidate = f"{line} {word}" if line else word
+            if line and draw.textlength(candidate, font=font) > max_width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+def draw_text(draw, box, text, font_size, scale):
+    font = load_font(current_app.config['SLIDE_THUMBNAIL_FONT'], max(1, round(font_size * scale)))
+    left, top, right, bottom = box
+    padding = TEXT_PADDING * scale
+    line_height = font.size * 1.2
+    y = top + padding
+    for line in wrap_text(draw, text or '', font, right - left - 2 * padding):
+        if y + font.size > bottom:
+            break
+        draw.text((left + padding, y), line, fill='#000000', font=font)
+        y += line_height
+
+def paste_contained(canvas, box, source, cover=False):
+    left, top, right, bottom = box
+    size = (max(1, right - left), max(1, bottom - top))
+    with Image.open(source) as img:
+        img = img.convert('RGBA')
+        fitted = ImageOps.fit(img, size) if cover else ImageOps.contain(img, size)
+    offset = (left + (size[0] - fitted.width) // 2, top + (size[1] - fitted.height) // 2)
+    canvas.paste(fitted, offset, fitted)
+
+def draw_video_placeholder(canvas, draw, box, poster=None):
+    draw.rectangle(box, fill=PLACEHOLDER_COLOR)
+    if poster is not None:
+        try:
+            paste_contained(canvas, box, poster, cover=True)
+        except (OSError, ValueError) as e:
+            current_app.logger.warning('Could not draw video poster: %s', e)
+    left, top, right, bottom = box
+    radius = max(2, min(right - left, bottom - top) // 6)
+    cx, cy = (left + right) // 2, (top + bottom) // 2
+    draw.polygon([(cx - radius // 2, cy - radius), (cx - radius // 2, cy + radius), (cx + radius, cy)], fill=PLAY_ICON_COLOR)
+
+def media_sources(elements):
+    filenames = {media_filename(e['content']) for e in elements if e['element_type'] in ('IMAGE', 'UPLOADED_VIDEO') and e['content']}
+    assets = {a.filename: a for a in MediaAsset.query.filter(MediaAsset.filename.in_(filenames)).all()} if filenames else {}
+    sources = {}
+    for filename in filenames:
+        asset = assets.get(filename)
+        if asset is None:
+            candidate = filename
+        elif asset.kind == 'image':
+            candidate = available_rendition(asset, 'thumb')
+        else:
+            candidate = asset.poster_filename
+        if candidate and os.path.exists(upload_path(candidate)):
+            sources[filename] = upload_path(candidate)
+        elif asset is not None and asset.kind == 'image' and os.path.exists(upload_path(asset.filename)):
+            sources[filename] = upload_path(asset.filename)
+    return sources
+
+def render_slide(snapshot, path):
+    width = current_app.config['SLIDE_THUMBNAIL_WIDTH']
+    scale = width / SLIDE_WIDTH
+    canvas = Image.new('RGB', (width, round(SLIDE_HEIGHT * scale)), snapshot['background_color'])
+    draw = ImageDraw.Draw(canvas)
+
+    elements = snapshot['elements']
+    sources = media_sources(elements)
+    youtube_ids = [e['content'] for e in elements if e['element_type'] == 'YOUTUBE_VIDEO']
+    youtube = get_thumbnail_fetcher().fetch_many(youtube_ids) if youtube_ids else {}
+
+    for element in elements:
+        box = tuple(round(v * scale) for v in (element['pos_x'], element['pos_y'],
+                                               element['pos_x'] + element['width'], element['pos_y'] + element['height']))
+        element_type = element['element_type']
+        if element_type == 'IMAGE':
+            source = sources.get(media_filename(element['content']))
+            if source:
+                try:
+                    paste_contained(canvas, box, source)
+                except (OSError, ValueError) as e:
+                    current_app.logger.warning('Could not draw image %s: %s', source, e)
+        elif element_type == 'UPLOADED_VIDEO':
+            draw_video_placeholder(canvas, draw, box, sources.get(media_filename(element['content'])))
+        elif element_type == 'YOUTUBE_VIDEO':
+            content = youtube.get(element['content'])
+            draw_video_placeholder(canvas, draw, box, io.BytesIO(content) if content else None)
+        else:
+            draw_text(draw, box, element['content'], element['font_size'], scale)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{threading.get_ident()}.part"
+    canvas.save(temp_path, format=current_app.config['SLIDE_THUMBNAIL_FORMAT'].upper())
+    os.replace(temp_path, path)
\ No newline at end of file
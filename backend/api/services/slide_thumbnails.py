@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from ..extensions import db
+from ..models import MediaAsset, Slide, SlideElement
+from .media_urls import signed_url
+from .storage import MEDIA_ELEMENT_TYPES, media_filename
+
+RENDER_VERSION = 1
+REGENERATE_ATTEMPTS = 3
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = set()
+_pending_lock = threading.Lock()
+
+def get_executor(app):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=app.config['SLIDE_THUMBNAIL_WORKERS'], thread_name_prefix='slide-thumbnail')
+        return _executor
+
+def thumbnail_filename(content_hash):
+    return f"{content_hash}.{current_app.config['SLIDE_THUMBNAIL_FORMAT']}"
+
+def thumbnail_url(content_hash):
+    if not content_hash:
+        return None
+    return signed_url('slides.get_slide_thumbnail', thumbnail_filename(content_hash))
+
+def thumbnail_path(filename):
+    return os.path.join(current_app.config['SLIDE_THUMBNAIL_FOLDER'], filename)
+
+def load_snapshot(slide_id):
+    slide = db.session.query(Slide.id, Slide.background_color).filter_by(id=slide_id).first()
+    if slide is None:
+        return None
+    elements = (db.session.query(SlideElement.id, SlideElement.element_type, SlideElement.pos_x, SlideElement.pos_y,
+                                 SlideElement.width, SlideElement.height, SlideElement.content, SlideElement.font_size)
+                .filter_by(slide_id=slide_id)
+                .order_by(SlideElement.id)
+                .all())
+    return {'background_color': slide.background_color, 'elements': [e._asdict() for e in elements],
+            'media': media_states(elements)}
+
+def media_states(elements):
+    filenames = {media_filename(e.content) for e in elements if e.element_type in MEDIA_ELEMENT_TYPES and e.content}
+    if not filenames:
+        return []
+    return sorted([asset.filename, asset.status, asset.poster_filename, asset.width, asset.height]
+                  for asset in MediaAsset.query.filter(MediaAsset.filename.in_(filenames)))
+
+def snapshot_hash(snapshot):
+    raw = json.dumps({
+        'slide': snapshot,
+        'renderer': [RENDER_VERSION, current_app.config['SLIDE_THUMBNAIL_WIDTH'], current_app.config['SLIDE_THUMBNAIL_FORMAT']]
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def regenerate_slide(slide_id):
+    from .slide_renderer import render_slide
+
+    for _attempt in range(REGENERATE_ATTEMPTS):
+        snapshot = load_snapshot(slide_id)
+        if snapshot is None:
+            return None
+        content_hash = snapshot_hash(snapshot)
+        path = thumbnail_path(thumbnail_filename(content_hash))
+        if not os.path.exists(path):
+            render_slide(snapshot, path)
+        db.session.commit()
+
+        current = load_snapshot(slide_id)
+        if current is not None and snapshot_hash(current) == content_hash:
+            Slide.query.filter_by(id=slide_id).update({Slide.thumbnail_hash: content_hash}, synchronize_session=False)
+            db.session.commit()
+            return content_hash
+    return None
+
+def run_regeneration(app, slide_ids):
+    with app.app_context():
+        for slide_id in slide_ids:
+            with _pending_lock:
+                _pending.discard(slide_id)
+            try:
+                regenerate_slide(slide_id)
+            except Exception:
+                db.session.rollback()
+                app.logger.exception('Could not render thumbnail for slide %s', slide_id)
+
+def schedule_regeneration(app, slide_ids):
+    with _pending_lock:
+        slide_ids = [slide_id for slide_id in slide_ids if slide_id not in _pending]
+        _pending.update(slide_ids)
+    if slide_ids:
+        get_executor(app).submit(run_regeneration, app, slide_ids)
+
+def invalidate_slide_thumbnails(slide_ids):
+    slide_ids = set(slide_ids)
+    if not slide_ids:
+        return
+    Slide.query.filter(Slide.id.in_(slide_ids)).update({Slide.thumbnail_hash: None}, synchronize_session=False)
+    db.session.info.setdefault('pending_thumbnails', set()).update(slide_ids)
+    db.session.info['thumbnail_app'] = current_app._get_current_object()
+
+def invalidate_media_thumbnails(asset):
+    slide_ids = [slide_id for (slide_id,) in (db.session.query(SlideElement.slide_id)
+                                              .filter(db.or_(SlideElement.media_id == asset.id,
+                                                             SlideElement.content.like(f"%/{asset.filename}")))
+                                              .distinct())]
+    invalidate_slide_thumbnails(slide_ids)
+
+@event.listens_for(Session, 'after_commit')
+def _regenerate_after_commit(session):
+    slide_ids = session.info.pop('pending_thumbnails', None)
+    app = session.info.pop('thumbnail_app', None)
+    if slide_ids and app is not None:
+        schedule_regeneration(app, slide_ids)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_thumbnails(session):
+    session.info.pop('pending_thumbnails', None)
+    session.info.pop('thumbnail_app', None)
+
+def remove_unreferenced_thumbnails(min_age):
+    folder = current_app.config['SLIDE_THUMBNAIL_FOLDER']
+    if not os.path.isdir(folder):
+        return 0
+    referenced = {h for (h,) in db.session.query(Slide.thumbnail_hash).filter(Slide.thumbnail_hash.isnot(None)).distinct()}
+    removed = 0
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        if name.split('.', 1)[0] in referenced or os.path.getmtime(path) >= time.time() - min_age:
+            continue
+        os.remove(path)
+        removed += 1
+    return removed
\ No newline at end of file
@@ -0,0 +1,266 @@
+import hashlib
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..extensions import db
+from ..models import MediaAsset, MediaUpload, Slide, SlideElement
+from .images import rendition_filenames
+
+CHUNK_SIZE = 1024 * 1024
+MEDIA_ELEMENT_TYPES = ('IMAGE', 'UPLOADED_VIDEO')
+
+def upload_path(filename):
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+
+def save_stream_hashed(stream, extension):
+    os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
+    temp_path = upload_path(f"incoming-{uuid.uuid4()}{extension}.part")
+    digest = hashlib.sha256()
+    size = 0
+    with open(temp_path, 'wb') as f:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            f.write(chunk)
+            size += len(chunk)
+    return temp_path, digest.hexdigest(), size
+
+def commit_blob(temp_path, filename):
+    os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
+    final_path = upload_path(filename)
+    if os.path.exists(final_path):
+        os.remove(temp_path)
+    else:
+        shutil.move(temp_path, final_path)
+    return final_path
+
+def find_asset(kind, content_hash):
+    return MediaAsset.query.filter_by(kind=kind, content_hash=content_hash).first()
+
+def reuse_asset(kind, content_hash):
+    asset = find_asset(kind, content_hash)
+    if asset is None:
+        return None
+    pinned_until = datetime.utcnow() + timedelta(seconds=current_app.config['MEDIA_GC_MIN_AGE'])
+    pinned = (MediaAsset.query
+              .filter_by(id=asset.id)
+              .update({MediaAsset.pinned_until: pinned_until}, synchronize_session=False))
+    db.session.commit()
+    return asset if pinned else None
+
+def register_asset(asset):
+    db.session.add(asset)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return find_asset(asset.kind, asset.content_hash)
+    return asset
+
+def record_uploader(asset, user_id):
+    if db.session.get(MediaUpload, (asset.id, user_id)) is not None:
+        return
+    db.session.add(MediaUpload(media_id=asset.id, user_id=user_id))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+
+def media_filename(content):
+    return content.split('?', 1)[0].split('/')[-1] if content else None
+
+def acquire_media(element):
+    if element.element_type not in MEDIA_ELEMENT_TYPES or not element.content:
+        return
+    asset_id = db.session.query(MediaAsset.id).filter_by(filename=media_filename(element.content)).scalar()
+    element.media_id = asset_id
+    if asset_id:
+        (MediaAsset.query
+            .filter_by(id=asset_id)
+            .update({MediaAsset.ref_count: MediaAsset.ref_count + 1}, synchronize_session=False))
+
+def release_media(element):
+    if element.element_type not in MEDIA_ELEMENT_TYPES or not element.content:
+        return
+    filename = media_filename(element.content)
+    released = (MediaAsset.query
+                .filter(MediaAsset.filename == filename, MediaAsset.ref_count > 0)
+                .update({MediaAsset.ref_count: MediaAsset.ref_count - 1}, synchronize_session=False))
+    element.media_id = None
+    if released:
+        schedule_asset_removal(asset_id for (asset_id,) in (db.session.query(MediaAsset.id)
+                                                            .filter_by(filename=filename, ref_count=0)))
+
+def release_element_media(*criteria):
+    released = (db.session.query(SlideElement.media_id, db.func.count(SlideElement.id))
+                .join(Slide, Slide.id == SlideElement.slide_id)
+                .filter(SlideElement.media_id.isnot(None), *criteria)
+                .group_by(SlideElement.media_id)
+                .all())
+    for media_id, count in released:
+        (MediaAsset.query
+            .filter_by(id=media_id)
+            .update({MediaAsset.ref_count: db.case((MediaAsset.ref_count > count, MediaAsset.ref_count - count), else_=0)},
+                    synchronize_session=False))
+    if not released:
+        return 0
+    asset_ids = [asset_id for (asset_id,) in (db.session.query(MediaAsset.id)
+                                              .filter(MediaAsset.id.in_([media_id for media_id, _count in released]),
+                                                      MediaAsset.ref_count == 0))]
+    schedule_asset_removal(asset_ids)
+    return len(asset_ids)
+
+def schedule_asset_removal(asset_ids):
+    db.session.info.setdefault('released_media', set()).update(asset_ids)
+    db.session.info['media_app'] = current_app._get_current_object()
+
+def purge_released_assets(asset_ids):
+    purged = 0
+    for asset_id in asset_ids:
+        asset = db.session.get(MediaAsset, asset_id)
+        if asset is None:
+            continue
+        files = asset_files(asset)
+        if delete_orphan(asset_id):
+            for filename in files:
+                remove_upload(filename)
+            purged += 1
+        db.session.commit()
+    return purged
+
+@event.listens_for(Session, 'after_commit')
+def _purge_after_commit(session):
+    asset_ids = session.info.pop('released_media', None)
+    app = session.info.pop('media_app', None)
+    if asset_ids and app is not None:
+        with app.app_context():
+            purge_released_assets(asset_ids)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_released_media(session):
+    session.info.pop('released_media', None)
+    session.info.pop('media_app', None)
+
+def remove_upload(filename):
+    try:
+        filepath = upload_path(filename)
+        if os.path.exists(filepath):
+            os.remove(filepath)
+    except Exception as e:
+        current_app.logger.warning('Error deleting file %s: %s', filename, e)
+
+
+def media_root(filename):
+    return filename.split('.', 1)[0].split('_', 1)[0]
+
+def asset_files(asset):
+    files = {asset.filename}
+    if asset.poster_filename:
+        files.add(asset.poster_filename)
+    if asset.kind == 'image':
+        files |= rendition_filenames(asset)
+    return files
+
+def file_size(filename):
+    try:
+        return os.path.getsize(upload_path(filename))
+    except OSError:
+        return 0
+
+def asset_referenced():
+    return db.session.query(SlideElement.id).filter(SlideElement.media_id == MediaAsset.id).exists()
+
+def orphan_assets(cutoff, after_id, limit):
+    return (MediaAsset.query
+            .filter(~asset_referenced(), MediaAsset.status != 'processing', MediaAsset.created_at < cutoff, MediaAsset.id > after_id)
+            .order_by(MediaAsset.id)
+            .limit(limit)
+            .all())
+
+def delete_orphan(asset_id):
+    deleted = (MediaAsset.query
+               .filter(MediaAsset.id == asset_id, MediaAsset.ref_count == 0, MediaAsset.status != 'processing',
+                       db.or_(MediaAsset.pinned_until.is_(None), MediaAsset.pinned_until < datetime.utcnow()),
+                       ~asset_referenced())
+               .delete(synchronize_session=False))
+    return deleted == 1
+
+def repair_ref_counts(dry_run):
+    actual = (db.session.query(db.func.count(SlideElement.id))
+              .filter(SlideElement.media_id == MediaAsset.id)
+              .scalar_subquery())
+    drifted = MediaAsset.query.filter(MediaAsset.ref_count != actual)
+    if dry_run:
+        return drifted.count()
+    repaired = drifted.update({MediaAsset.ref_count: actual}, synchronize_session=False)
+    db.session.commit()
+    return repaired
+
+def referenced_roots(batch_size, excluded_asset_ids):
+    roots = set()
+    for asset_id, filename in db.session.query(MediaAsset.id, MediaAsset.filename).yield_per(batch_size):
+        if asset_id not in excluded_asset_ids:
+            roots.add(media_root(filename))
+    for (content,) in (db.session.query(SlideElement.content)
+                       .filter(SlideElement.element_type.in_(MEDIA_ELEMENT_TYPES), SlideElement.media_id.is_(None))
+                       .yield_per(batch_size)):
+        filename = media_filename(content)
+        if filename:
+            roots.add(media_root(filename))
+    return roots
+
+def collect_orphan_media(dry_run=False, batch_size=None, min_age=None):
+    batch_size = batch_size or current_app.config['MEDIA_GC_BATCH_SIZE']
+    min_age = current_app.config['MEDIA_GC_MIN_AGE'] if min_age is None else min_age
+    cutoff = datetime.utcnow() - timedelta(seconds=min_age)
+    stats = {'ref_counts_repaired': repair_ref_counts(dry_run), 'assets_removed': 0, 'files_removed': 0, 'bytes_reclaimed': 0}
+
+    removed_asset_ids = set()
+    asset_filenames = set()
+    after_id = ''
+    while True:
+        assets = orphan_assets(cutoff, after_id, batch_size)
+        if not assets:
+            break
+        after_id = assets[-1].id
+        for asset in assets:
+            files = {filename for filename in asset_files(asset) if os.path.exists(upload_path(filename))}
+            if not dry_run and not delete_orphan(asset.id):
+                continue
+            removed_asset_ids.add(asset.id)
+            asset_filenames |= files
+            stats['assets_removed'] += 1
+            stats['files_removed'] += len(files)
+            stats['bytes_reclaimed'] += sum(file_size(filename) for filename in files)
+            if not dry_run:
+                for filename in files:
+                    remove_upload(filename)
+        if not dry_run:
+            db.session.commit()
+        db.session.expunge_all()
+
+    folder = current_app.config['UPLOAD_FOLDER']
+    if not os.path.isdir(folder):
+        return stats
+    keep = referenced_roots(batch_size, removed_asset_ids)
+    cutoff_timestamp = time.time() - min_age
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if not entry.is_file() or entry.name in asset_filenames or media_root(entry.name) in keep:
+                continue
+            info = entry.stat()
+            if info.st_mtime >= cutoff_timestamp:
+                continue
+            stats['files_removed'] += 1
+            stats['bytes_reclaimed'] += info.st_size
+            if not dry_run:
+                remove_upload(entry.name)
+    return stats
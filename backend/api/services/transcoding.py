@@ -0,0 +1,68 @@
+import os
+import ffmpeg
+from flask import current_app
+from ..extensions import db
+from ..models import MediaAsset
+from .slide_thumbnails import invalidate_media_thumbnails
+
+def is_h264_aac_mp4(path):
+    try:
+        probe = ffmpeg.probe(path)
+    except ffmpeg.Error:
+        return False
+    if 'mp4' not in probe.get('format', {}).get('format_name', '').split(','):
+        return False
+    video_codecs = [s.get('codec_name') for s in probe.get('streams', []) if s.get('codec_type') == 'video']
+    audio_codecs = [s.get('codec_name') for s in probe.get('streams', []) if s.get('codec_type') == 'audio']
+    return video_codecs == ['h264'] and all(codec == 'aac' for codec in audio_codecs)
+
+def transcode_video(source_path, final_path):
+    if is_h264_aac_mp4(source_path):
+        output = ffmpeg.input(source_path).output(final_path, c='copy', movflags='+faststart')
+    else:
+        output = ffmpeg.input(source_path).output(
+            final_path,
+            vcodec='libx264',
+            acodec='aac',
+            strict='experimental',
+            movflags='+faststart'
+        )
+    output.overwrite_output().run(capture_stdout=True, capture_stderr=True)
+
+def extract_poster(video_path, poster_path):
+    for offset in (1, 0):
+        try:
+            (ffmpeg.input(video_path, ss=offset)
+                .output(poster_path, vframes=1)
+                .overwrite_output()
+                .run(capture_stdout=True, capture_stderr=True))
+            if os.path.exists(poster_path) and os.path.getsize(poster_path) > 0:
+                return True
+        except ffmpeg.Error as e:
+            current_app.logger.warning('Could not extract poster from %s: %s', video_path, e.stderr.decode(errors='replace'))
+    return False
+
+def transcode_asset(asset_id, source_path):
+    asset = db.session.get(MediaAsset, asset_id)
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    os.makedirs(upload_folder, exist_ok=True)
+    final_path = os.path.join(upload_folder, asset.filename)
+    try:
+        transcode_video(source_path, final_path)
+        poster_filename = f"{asset.content_hash}_poster.jpg"
+        if extract_poster(final_path, os.path.join(upload_folder, poster_filename)):
+            asset.poster_filename = poster_filename
+        asset.status = 'ready'
+    except ffmpeg.Error as e:
+        current_app.logger.error('FFmpeg could not transcode %s: %s', asset_id, e.stderr.decode(errors='replace'))
+        asset.status = 'failed'
+        asset.error = 'Не удалось обработать видеофайл'
+    except Exception:
+        current_app.logger.exception('Video processing failed for %s', asset_id)
+        asset.status = 'failed'
+        asset.error = 'Не удалось обработать видеофайл'
+    finally:
+        if os.path.exists(source_path):
+            os.remove(source_path)
+    invalidate_media_thumbnails(asset)
+    db.session.commit()
\ No newline at end of file
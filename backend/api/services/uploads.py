@@ -0,0 +1,148 @@
+import hashlib
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from ..extensions import db
+from ..models import UploadSession
+from .storage import CHUNK_SIZE
+
+UPLOAD_KINDS = ('image', 'video')
+OPPORTUNISTIC_GC_BATCH = 20
+
+class InvalidChunk(Exception):
+    pass
+
+def incoming_folder():
+    return current_app.config['UPLOAD_INCOMING_FOLDER']
+
+def session_path(session):
+    return os.path.join(incoming_folder(), f"{session.id}{session.extension}.part")
+
+def create_session(user_id, kind, extension, size):
+    os.makedirs(incoming_folder(), exist_ok=True)
+    session = UploadSession(user_id=user_id, kind=kind, extension=extension, size=size)
+    db.session.add(session)
+    db.session.commit()
+    open(session_path(session), 'wb').close()
+    return session
+
+def claim_offset(session, offset, token):
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=current_app.config['UPLOAD_CHUNK_CLAIM_TTL'])
+    claimed = (UploadSession.query
+               .filter(UploadSession.id == session.id, UploadSession.received == offset,
+                       db.or_(UploadSession.claim_token.is_(None), UploadSession.claimed_at < stale))
+               .update({UploadSession.claim_token: token, UploadSession.claimed_at: now}, synchronize_session=False))
+    db.session.commit()
+    return claimed == 1
+
+def hold_claim(session, token):
+    held = (UploadSession.query
+            .filter_by(id=session.id, claim_token=token)
+            .update({UploadSession.claimed_at: datetime.utcnow()}, synchronize_session=False))
+    db.session.commit()
+    return held == 1
+
+def settle_claim(session, token, values=None):
+    settled = (UploadSession.query
+               .filter_by(id=session.id, claim_token=token)
+               .update({UploadSession.claim_token: None, UploadSession.claimed_at: None, **(values or {})},
+                       synchronize_session=False))
+    db.session.commit()
+    return settled == 1
+
+def write_chunk(session, stream, offset, length, expected_sha256):
+    digest = hashlib.sha256()
+    written = 0
+    with open(session_path(session), 'r+b') as f:
+        f.seek(offset)
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if written + len(chunk) > length:
+                raise InvalidChunk()
+            digest.update(chunk)
+            f.write(chunk)
+            written += len(chunk)
+    if written != length or (expected_sha256 and digest.hexdigest() != expected_sha256.lower()):
+        raise InvalidChunk()
+
+def append_chunk(session, stream, offset, length, expected_sha256=None):
+    token = str(uuid.uuid4())
+    if not claim_offset(session, offset, token):
+        return False
+    try:
+        write_chunk(session, stream, offset, length, expected_sha256)
+    except BaseException:
+        db.session.rollback()
+        if hold_claim(session, token):
+            with open(session_path(session), 'r+b') as f:
+                f.truncate(offset)
+            settle_claim(session, token)
+        raise
+    return settle_claim(session, token, {UploadSession.received: offset + length,
+                                         UploadSession.updated_at: datetime.utcnow()})
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def upload_complete(session):
+    path = session_path(session)
+    return session.received == session.size and os.path.exists(path) and os.path.getsize(path) >= session.size
+
+def claim_session_file(session):
+    handoff_path = os.path.join(incoming_folder(), f"{session.id}.{uuid.uuid4()}.handoff{session.extension}")
+    try:
+        os.rename(session_path(session), handoff_path)
+    except FileNotFoundError:
+        return None
+    return handoff_path
+
+def release_session_file(session, handoff_path):
+    if not os.path.exists(handoff_path):
+        return
+    if db.session.query(UploadSession.query.filter_by(id=session.id).exists()).scalar():
+        os.replace(handoff_path, session_path(session))
+    else:
+        os.remove(handoff_path)
+
+def close_session(session):
+    path = session_path(session)
+    db.session.delete(session)
+    db.session.commit()
+    return path
+
+def expire_stale_sessions(max_age=None, limit=None):
+    max_age = current_app.config['UPLOAD_SESSION_TTL'] if max_age is None else max_age
+    cutoff = datetime.utcnow() - timedelta(seconds=max_age)
+    query = UploadSession.query.filter(UploadSession.updated_at < cutoff).order_by(UploadSession.updated_at)
+    if limit:
+        query = query.limit(limit)
+    stale = query.all()
+    for session in stale:
+        path = session_path(session)
+        if os.path.exists(path):
+            os.remove(path)
+        db.session.delete(session)
+    db.session.commit()
+
+    orphans = 0
+    if limit is None and os.path.isdir(incoming_folder()):
+        known = {session_id for (session_id,) in db.session.query(UploadSession.id)}
+        for name in os.listdir(incoming_folder()):
+            path = os.path.join(incoming_folder(), name)
+            if name.split('.', 1)[0] in known or os.path.getmtime(path) >= time.time() - max_age:
+                continue
+            os.remove(path)
+            orphans += 1
+    return len(stale), orphans
\ No newline at end of file
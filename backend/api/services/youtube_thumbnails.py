@@ -0,0 +1,114 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from flask import current_app
+
+THUMBNAIL_NAMES = ['maxresdefault.jpg', 'hqdefault.jpg', '0.jpg']
+VIDEO_ID_PATTERN = re.compile(r'^[a-zA-Z0-9_-]{11}$')
+
+class ThumbnailFetcher:
+    def __init__(self, base_url, cache_folder, ttl, negative_ttl, timeout, max_workers, logger):
+        self.base_url = base_url.rstrip('/')
+        self.cache_folder = cache_folder
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.logger = logger
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _cache_path(self, video_id, suffix):
+        return os.path.join(self.cache_folder, f"{video_id}.{suffix}")
+
+    def _is_fresh(self, path, ttl):
+        try:
+            return time.time() - os.path.getmtime(path) < ttl
+        except OSError:
+            return False
+
+    def _read_cache(self, video_id):
+        image_path = self._cache_path(video_id, 'jpg')
+        if self._is_fresh(image_path, self.ttl):
+            try:
+                with open(image_path, 'rb') as f:
+                    return True, f.read()
+            except OSError:
+                pass
+        if self._is_fresh(self._cache_path(video_id, 'miss'), self.negative_ttl):
+            return True, None
+        return False, None
+
+    def _write_cache(self, video_id, content):
+        os.makedirs(self.cache_folder, exist_ok=True)
+        path = self._cache_path(video_id, 'jpg' if content is not None else 'miss')
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content or b'')
+        os.replace(temp_path, path)
+
+    def _download(self, video_id):
+        definitive = True
+        for name in THUMBNAIL_NAMES:
+            url = f"{self.base_url}/{video_id}/{name}"
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                response.raise_for_status()
+                return response.content, True
+            except requests.exceptions.RequestException as e:
+                self.logger.warning('Could not fetch thumbnail %s: %s', url, e)
+                if e.response is None or e.response.status_code != 404:
+                    definitive = False
+        return None, definitive
+
+    def fetch(self, video_id):
+        return self.fetch_many([video_id]).get(video_id)
+
+    def fetch_many(self, video_ids):
+        results = {}
+        missing = []
+        for video_id in set(video_ids):
+            if not video_id or not VIDEO_ID_PATTERN.match(video_id):
+                results[video_id] = None
+                continue
+            cached, content = self._read_cache(video_id)
+            if cached:
+                results[video_id] = content
+            else:
+                missing.append(video_id)
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                for video_id, (content, definitive) in zip(missing, executor.map(self._download, missing)):
+                    if definitive:
+                        try:
+                            self._write_cache(video_id, content)
+                        except OSError as e:
+                            self.logger.warning('Could not cache thumbnail for %s: %s', video_id, e)
+                    results[video_id] = content
+        return results
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+def get_thumbnail_fetcher():
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            config = current_app.config
+            _fetcher = ThumbnailFetcher(
+                base_url=config['YOUTUBE_THUMBNAIL_BASE_URL'],
+                cache_folder=config['THUMBNAIL_CACHE_FOLDER'],
+                ttl=config['THUMBNAIL_CACHE_TTL'],
+                negative_ttl=config['THUMBNAIL_NEGATIVE_CACHE_TTL'],
+                timeout=config['THUMBNAIL_FETCH_TIMEOUT'],
+                max_workers=config['THUMBNAIL_FETCH_WORKERS'],
+                logger=current_app.logger
+            )
+        return _fetcher
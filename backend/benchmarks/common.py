@@ -0,0 +1,43 @@
+import os
+import statistics
+import time
+from api import create_app
+from api.config import Config
+
+def make_app(workdir, **overrides):
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'benchmark.db')}"
+        UPLOAD_FOLDER = os.path.join(workdir, 'uploads')
+        UPLOAD_INCOMING_FOLDER = os.path.join(workdir, 'incoming')
+        EXPORT_FOLDER = os.path.join(workdir, 'exports')
+        THUMBNAIL_CACHE_FOLDER = os.path.join(workdir, 'cache')
+        SLIDE_THUMBNAIL_FOLDER = os.path.join(workdir, 'slides')
+        PROFILE_FOLDER = os.path.join(workdir, 'profiles')
+
+    for key, value in overrides.items():
+        setattr(BenchmarkConfig, key, value)
+    return create_app(BenchmarkConfig)
+
+def measure(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+def percentile(sorted_samples, fraction):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+def summarize(samples_ms):
+    ordered = sorted(samples_ms)
+    return {
+        'count': len(ordered),
+        'mean_ms': round(statistics.fmean(ordered), 4) if ordered else 0.0,
+        'p50_ms': round(percentile(ordered, 0.50), 4),
+        'p95_ms': round(percentile(ordered, 0.95), 4),
+        'p99_ms': round(percentile(ordered, 0.99), 4)
+    }
@@ -0,0 +1,75 @@
+import argparse
+import json
+import sys
+
+LOWER_IS_BETTER_SUFFIXES = ('_ms', '_mb', 'error_rate')
+HIGHER_IS_BETTER_SUFFIXES = ('_rps',)
+IGNORED_SECTIONS = ('meta',)
+
+def flatten(value, prefix=''):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not prefix and key in IGNORED_SECTIONS:
+                continue
+            yield from flatten(item, f'{prefix}.{key}' if prefix else key)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, value
+
+def direction(path):
+    name = path.rsplit('.', 1)[-1]
+    if name.endswith(LOWER_IS_BETTER_SUFFIXES):
+        return -1
+    if name.endswith(HIGHER_IS_BETTER_SUFFIXES):
+        return 1
+    return 0
+
+def compare(baseline, current, threshold, min_delta_ms):
+    baseline_metrics = dict(flatten(baseline))
+    rows = []
+    for path, value in flatten(current):
+        sign = direction(path)
+        if sign == 0 or path not in baseline_metrics:
+            continue
+        before = baseline_metrics[path]
+        change = (value - before) / before * 100 if before else (0.0 if value == before else float('inf'))
+        worse = -change * sign
+        regressed = worse > threshold
+        if regressed and path.endswith('_ms') and abs(value - before) < min_delta_ms:
+            regressed = False
+        rows.append({'metric': path, 'baseline': before, 'current': value, 'change_pct': round(change, 1), 'regressed': regressed})
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare two benchmark JSON results and flag regressions')
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Allowed worsening in percent')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='Ignore latency changes smaller than this')
+    parser.add_argument('--only', help='Only compare metrics whose path contains this substring')
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold, args.min_delta_ms)
+    if args.only:
+        rows = [row for row in rows if args.only in row['metric']]
+    regressions = [row for row in rows if row['regressed']]
+
+    width = max((len(row['metric']) for row in rows), default=10)
+    for row in rows:
+        marker = '  REGRESSION' if row['regressed'] else ''
+        print(f"{row['metric']:<{width}}  {row['baseline']:>12}  {row['current']:>12}  {row['change_pct']:>+8}%{marker}")
+    print(f"{len(regressions)} regression(s) over {args.threshold}% in {len(rows)} metrics")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'threshold_pct': args.threshold, 'metrics': rows, 'regressions': len(regressions)}, f, indent=2)
+    if regressions:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
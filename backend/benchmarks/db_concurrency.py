@@ -0,0 +1,124 @@
+import argparse
+import json
+import logging
+import multiprocessing
+import tempfile
+import threading
+import time
+from collections import Counter
+from api.extensions import db
+from .common import make_app, summarize
+
+def prepare(app, count):
+    client = app.test_client()
+    client.post('/api/register', json={'email': 'bench@example.com', 'password': 'benchmark'})
+    token = client.post('/api/login', json={'email': 'bench@example.com', 'password': 'benchmark'}).get_json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+    presentation = client.post('/api/presentations', json={'title': 'Concurrency'}, headers=headers).get_json()
+    slide_id = client.get(f"/api/presentations/{presentation['id']}", headers=headers).get_json()['slides'][0]['id']
+    element_ids = []
+    for i in range(count):
+        response = client.post(f'/api/slides/{slide_id}/elements', headers=headers,
+                               json={'element_type': 'TEXT', 'content': f'Element {i}', 'pos_x': 0, 'pos_y': 0})
+        element_ids.append(response.get_json()['id'])
+    return headers, element_ids
+
+def hammer(app, headers, element_id, deadline, samples, statuses, lock):
+    client = app.test_client()
+    local_samples, local_statuses = [], Counter()
+    i = 0
+    while time.perf_counter() < deadline:
+        i += 1
+        started = time.perf_counter()
+        response = client.put(f'/api/elements/{element_id}', headers=headers,
+                              json={'content': f'Autosave {i}', 'pos_x': i % 1280, 'pos_y': i % 720})
+        local_samples.append((time.perf_counter() - started) * 1000)
+        local_statuses[response.status_code] += 1
+    with lock:
+        samples.extend(local_samples)
+        statuses.update(local_statuses)
+
+def run_process(app, headers, element_ids, deadline, results):
+    samples, statuses, lock = [], Counter(), threading.Lock()
+    workers = [threading.Thread(target=hammer, args=(app, headers, element_id, deadline, samples, statuses, lock))
+               for element_id in element_ids]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    results.put((samples, statuses))
+
+def run_profile(profile, processes, threads, duration, database_url):
+    workdir = tempfile.mkdtemp(prefix=f'bench-db-{profile}-')
+    overrides = {'DATABASE_PROFILE': profile}
+    if database_url:
+        overrides['SQLALCHEMY_DATABASE_URI'] = database_url
+    app = make_app(workdir, **overrides)
+    app.logger.disabled = True
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        journal_mode = None
+        if db.engine.dialect.name == 'sqlite':
+            journal_mode = db.session.execute(db.text('PRAGMA journal_mode')).scalar()
+        db.session.remove()
+    headers, element_ids = prepare(app, processes * threads)
+
+    with app.app_context():
+        db.engine.dispose()
+
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    started = time.perf_counter()
+    deadline = started + duration
+    children = [context.Process(target=run_process, args=(app, headers, element_ids[i * threads:(i + 1) * threads], deadline, results))
+                for i in range(processes)]
+    for child in children:
+        child.start()
+    samples, statuses = [], Counter()
+    for _ in children:
+        child_samples, child_statuses = results.get()
+        samples.extend(child_samples)
+        statuses.update(child_statuses)
+    for child in children:
+        child.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+    total = sum(statuses.values())
+    errors = total - statuses[200]
+    return {
+        'journal_mode': journal_mode,
+        'requests': total,
+        'throughput_rps': round(total / elapsed, 1),
+        'error_rate': round(errors / total, 4) if total else 0.0,
+        'statuses': {str(code): count for code, count in sorted(statuses.items())},
+        'latency': summarize(samples)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent element autosave throughput per database engine profile')
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--profiles', default='none,auto')
+    parser.add_argument('--database-url', help='Server database to test instead of a temporary SQLite file')
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    logging.getLogger('werkzeug').disabled = True
+    results = {'processes': args.processes, 'threads': args.threads, 'duration_s': args.duration, 'profiles': {}}
+    for profile in args.profiles.split(','):
+        results['profiles'][profile] = run_profile(profile, args.processes, args.threads, args.duration, args.database_url)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
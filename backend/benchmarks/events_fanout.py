@@ -0,0 +1,181 @@
+import argparse
+import importlib.util
+import json
+import os
+import selectors
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import requests
+
+def serve(workdir, port, server, heartbeat):
+    if server == 'gevent':
+        from gevent import monkey
+        monkey.patch_all()
+    from api.extensions import db
+    from .common import make_app
+    from .media_serving import QuietRequestHandler
+
+    app = make_app(workdir, EVENTS_HEARTBEAT_INTERVAL=heartbeat)
+    with app.app_context():
+        db.create_all()
+
+    if server == 'gevent':
+        from gevent.pywsgi import WSGIServer
+        WSGIServer(('127.0.0.1', port), app, log=None).serve_forever()
+    else:
+        from werkzeug.serving import make_server
+        make_server('127.0.0.1', port, app, threaded=True, request_handler=QuietRequestHandler).serve_forever()
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def process_stats(pid):
+    stats = {}
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                key, _sep, value = line.partition(':')
+                if key == 'VmRSS':
+                    stats['rss_mb'] = round(int(value.split()[0]) / 1024, 1)
+                elif key == 'Threads':
+                    stats['threads'] = int(value)
+    except OSError:
+        pass
+    return stats
+
+def wait_for_server(base_url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(f'{base_url}/api/presentations', timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    raise RuntimeError('server did not start')
+
+class Subscriber:
+    def __init__(self, port, path):
+        self.sock = socket.create_connection(('127.0.0.1', port))
+        self.sock.sendall(f'GET {path} HTTP/1.0\r\nHost: 127.0.0.1\r\nAccept: text/event-stream\r\n\r\n'.encode())
+        self.sock.setblocking(False)
+        self.buffer = b''
+
+    def read(self):
+        try:
+            chunk = self.sock.recv(65536)
+        except BlockingIOError:
+            return
+        self.buffer += chunk
+
+def wait_until(selector, subscribers, predicate, timeout):
+    started = time.perf_counter()
+    arrivals = {}
+    pending = set(subscribers)
+    while pending and time.perf_counter() - started < timeout:
+        for key, _events in selector.select(timeout=0.5):
+            subscriber = key.data
+            subscriber.read()
+            if subscriber in pending and predicate(subscriber):
+                arrivals[subscriber] = (time.perf_counter() - started) * 1000
+                pending.discard(subscriber)
+    return arrivals, len(pending)
+
+def main():
+    parser = argparse.ArgumentParser(description='SSE fan-out latency and footprint with many idle subscribers')
+    parser.add_argument('--subscribers', type=int, default=500)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--heartbeat', type=float, default=1.0)
+    parser.add_argument('--idle-seconds', type=float, default=3.0)
+    parser.add_argument('--server', choices=['gevent', 'threaded'], default=None)
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.workdir, args.port, args.server, args.heartbeat)
+        return
+
+    from .common import summarize
+
+    server = args.server or ('gevent' if importlib.util.find_spec('gevent') else 'threaded')
+
+    workdir = tempfile.mkdtemp(prefix='bench-events-')
+    port = free_port()
+    child = subprocess.Popen([sys.executable, '-m', 'benchmarks.events_fanout', '--serve', '--workdir', workdir,
+                              '--port', str(port), '--server', server, '--heartbeat', str(args.heartbeat)],
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    base_url = f'http://127.0.0.1:{port}'
+    selector = selectors.DefaultSelector()
+    subscribers = []
+    try:
+        wait_for_server(base_url)
+        session = requests.Session()
+        session.post(f'{base_url}/api/register', json={'email': 'bench@example.com', 'password': 'benchmark'})
+        token = session.post(f'{base_url}/api/login', json={'email': 'bench@example.com', 'password': 'benchmark'}).json()['token']
+        headers = {'Authorization': f'Bearer {token}'}
+        presentation_id = session.post(f'{base_url}/api/presentations', json={'title': 'Events'}, headers=headers).json()['id']
+        ticket = session.post(f'{base_url}/api/presentations/{presentation_id}/events/ticket', headers=headers).json()['ticket']
+        baseline = process_stats(child.pid)
+
+        started = time.perf_counter()
+        for _ in range(args.subscribers):
+            subscriber = Subscriber(port, f'/api/presentations/{presentation_id}/events?ticket={ticket}')
+            selector.register(subscriber.sock, selectors.EVENT_READ, subscriber)
+            subscribers.append(subscriber)
+        connected, failed = wait_until(selector, subscribers, lambda s: b'"revision": 1' in s.buffer, timeout=60)
+        connect_ms = (time.perf_counter() - started) * 1000
+
+        time.sleep(args.idle_seconds)
+        for subscriber in subscribers:
+            subscriber.read()
+        idle = process_stats(child.pid)
+        heartbeats = [s.buffer.count(b': heartbeat') for s in subscribers]
+
+        write_samples, fanout_samples, missed = [], [], 0
+        for revision in range(2, args.rounds + 2):
+            for subscriber in subscribers:
+                subscriber.buffer = b''
+            write_started = time.perf_counter()
+            response = session.put(f'{base_url}/api/presentations/{presentation_id}', json={'title': f'Events {revision}'}, headers=headers)
+            assert response.status_code == 200, response.status_code
+            write_samples.append((time.perf_counter() - write_started) * 1000)
+            marker = f'"revision": {revision}'.encode()
+            arrivals, pending = wait_until(selector, subscribers, lambda s: marker in s.buffer, timeout=30)
+            fanout_samples.extend(write_samples[-1] + ms for ms in arrivals.values())
+            missed += pending
+
+        results = {
+            'server': server,
+            'subscribers': args.subscribers,
+            'connected': len(connected),
+            'failed_to_connect': failed,
+            'connect_all_ms': round(connect_ms, 1),
+            'server_baseline': baseline,
+            'server_idle': idle,
+            'heartbeats_per_subscriber': {'min': min(heartbeats), 'max': max(heartbeats)},
+            'write_latency': summarize(write_samples),
+            'fanout_latency': summarize(fanout_samples),
+            'missed_notifications': missed
+        }
+    finally:
+        for subscriber in subscribers:
+            selector.unregister(subscriber.sock)
+            subscriber.sock.close()
+        child.terminate()
+        child.wait()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
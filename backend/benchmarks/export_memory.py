@@ -0,0 +1,95 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+import uuid
+from PIL import Image
+from api.extensions import db
+from api.models import User, Presentation, Slide, SlideElement, MediaAsset
+from api.services.export import export_pptx, load_export_slides
+from api.services.slide_order import POSITION_GAP
+from .common import make_app
+
+CHUNK = 1024 * 1024
+
+def write_fixture(path, size_mb):
+    with open(path, 'wb') as f:
+        for _ in range(size_mb):
+            f.write(os.urandom(CHUNK))
+
+def seed(workdir, videos, video_mb):
+    upload_folder = os.path.join(workdir, 'uploads')
+    os.makedirs(upload_folder, exist_ok=True)
+    poster = 'poster.png'
+    Image.new('RGB', (64, 36), 'black').save(os.path.join(upload_folder, poster))
+
+    user = User(email='bench@example.com', password_hash='x' * 60)
+    presentation = Presentation(title='Media deck', owner=user)
+    db.session.add(presentation)
+    db.session.flush()
+    for index in range(videos):
+        filename = f"{uuid.uuid4().hex}.mp4"
+        write_fixture(os.path.join(upload_folder, filename), video_mb)
+        db.session.add(MediaAsset(kind='video', status='ready', filename=filename, content_hash=filename[:-4],
+                                  size=video_mb * CHUNK, poster_filename=poster))
+        slide = Slide(position=(index + 1) * POSITION_GAP, presentation_id=presentation.id)
+        db.session.add(slide)
+        db.session.flush()
+        db.session.add(SlideElement(slide_id=slide.id, element_type='UPLOADED_VIDEO',
+                                    content=f"http://localhost/api/media/files/{filename}",
+                                    pos_x=0, pos_y=0, width=1280, height=720))
+    db.session.commit()
+    return presentation.id
+
+def run_export(workdir, stream_media, queue):
+    app = make_app(workdir, EXPORT_STREAM_MEDIA=stream_media)
+    with app.app_context():
+        presentation_id = Presentation.query.first().id
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        output = os.path.join(workdir, f"export-{stream_media}.pptx")
+        started = time.perf_counter()
+        export_pptx(load_export_slides(presentation_id), output)
+        elapsed = time.perf_counter() - started
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        queue.put({
+            'stream_media': stream_media,
+            'seconds': round(elapsed, 3),
+            'baseline_rss_mb': round(baseline / 1024, 1),
+            'peak_rss_mb': round(peak / 1024, 1),
+            'output_mb': round(os.path.getsize(output) / CHUNK, 1)
+        })
+        os.remove(output)
+
+def main():
+    parser = argparse.ArgumentParser(description='Peak RSS of PPTX export for a deck with large embedded videos')
+    parser.add_argument('--videos', type=int, default=3)
+    parser.add_argument('--video-mb', type=int, default=200)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-export-')
+    app = make_app(workdir)
+    with app.app_context():
+        db.create_all()
+        seed(workdir, args.videos, args.video_mb)
+
+    context = multiprocessing.get_context('spawn')
+    results = {'videos': args.videos, 'video_mb': args.video_mb, 'runs': []}
+    for stream_media in (True, False):
+        queue = context.Queue()
+        process = context.Process(target=run_export, args=(workdir, stream_media, queue))
+        process.start()
+        results['runs'].append(queue.get())
+        process.join()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime
+from PIL import Image
+from api.extensions import db
+from api.models import Presentation, Slide, SlideElement
+from .common import make_app, summarize
+from .seed import add_scale_arguments, generate, load_manifest, user_email
+
+SCENARIOS = ('listing', 'fetch', 'autosave', 'reorder', 'move', 'upload', 'export')
+SAMPLE_LIMIT = 500
+
+class TestClientTransport:
+    def __init__(self, app):
+        self.app = app
+        self.local = threading.local()
+
+    def request(self, method, path, **kwargs):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.open(path, method=method, **kwargs)
+        body = response.get_data()
+        response.close()
+        return response.status_code, len(body), response.get_json(silent=True)
+
+    def close(self):
+        pass
+
+class HttpTransport:
+    def __init__(self, app):
+        import requests
+        from werkzeug.serving import make_server
+        from .media_serving import QuietRequestHandler
+
+        self.requests = requests
+        self.server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler)
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.local = threading.local()
+
+    def request(self, method, path, json=None, headers=None, data=None, content_type=None):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = self.requests.Session()
+        files = None
+        if content_type == 'multipart/form-data':
+            files = {name: (filename, stream) for name, (stream, filename) in data.items()}
+            data = None
+        response = session.request(method, self.base_url + path, json=json, headers=headers, data=data, files=files)
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        return response.status_code, len(response.content), payload
+
+    def close(self):
+        self.server.shutdown()
+
+def png_bytes(rng):
+    buffer = io.BytesIO()
+    Image.new('RGB', (640, 480), tuple(rng.randrange(256) for _ in range(3))).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+class Workload:
+    def __init__(self, app, transport, manifest, concurrency):
+        self.transport = transport
+        self.upload_rng = random.Random(time.time_ns())
+        self.upload_lock = threading.Lock()
+        self.users = []
+        for index in range(min(concurrency, manifest['users'])):
+            status, _size, payload = transport.request('POST', '/api/login', json={'email': user_email(index), 'password': manifest['password']})
+            assert status == 200, f'login failed with {status}'
+            self.users.append(self.load_user(app, index + 1, {'Authorization': f"Bearer {payload['token']}"}))
+
+    def load_user(self, app, user_id, headers):
+        with app.app_context():
+            deck_ids = [pid for (pid,) in db.session.query(Presentation.id).filter_by(user_id=user_id).limit(SAMPLE_LIMIT)]
+            slides = {}
+            for presentation_id, slide_id in (db.session.query(Slide.presentation_id, Slide.id)
+                                              .filter(Slide.presentation_id.in_(deck_ids))
+                                              .order_by(Slide.presentation_id, Slide.position)):
+                slides.setdefault(presentation_id, []).append(slide_id)
+            element_ids = [eid for (eid,) in (db.session.query(SlideElement.id)
+                                              .join(Slide, SlideElement.slide_id == Slide.id)
+                                              .filter(Slide.presentation_id.in_(deck_ids), SlideElement.element_type == 'TEXT')
+                                              .limit(SAMPLE_LIMIT))]
+            db.session.remove()
+        return {'headers': headers, 'deck_ids': deck_ids, 'slides': slides, 'element_ids': element_ids,
+                'lock': threading.Lock()}
+
+    def listing(self, user, rng, i):
+        return self.transport.request('GET', '/api/presentations?limit=24', headers=user['headers'])
+
+    def fetch(self, user, rng, i):
+        return self.transport.request('GET', f"/api/presentations/{rng.choice(user['deck_ids'])}", headers=user['headers'])
+
+    def autosave(self, user, rng, i):
+        return self.transport.request('PUT', f"/api/elements/{rng.choice(user['element_ids'])}", headers=user['headers'],
+                                      json={'content': f'Автосохранение {i}', 'pos_x': rng.randrange(1000), 'pos_y': rng.randrange(600)})
+
+    def reorder(self, user, rng, i):
+        presentation_id = rng.choice(user['deck_ids'])
+        with user['lock']:
+            order = user['slides'][presentation_id]
+            order.insert(rng.randrange(len(order)), order.pop(rng.randrange(len(order))))
+            slide_ids = list(order)
+        return self.transport.request('PUT', f'/api/presentations/{presentation_id}/slides/reorder',
+                                      headers=user['headers'], json={'slide_ids': slide_ids})
+
+    def move(self, user, rng, i):
+        presentation_id = rng.choice(user['deck_ids'])
+        with user['lock']:
+            order = user['slides'][presentation_id]
+            slide_id = order.pop(rng.randrange(len(order)))
+            index = rng.randrange(len(order) + 1)
+            order.insert(index, slide_id)
+            after_slide_id = order[index - 1] if index else None
+        return self.transport.request('PUT', f'/api/slides/{slide_id}/move', headers=user['headers'],
+                                      json={'after_slide_id': after_slide_id})
+
+    def upload(self, user, rng, i):
+        with self.upload_lock:
+            payload = png_bytes(self.upload_rng)
+        return self.transport.request('POST', '/api/upload/image', headers=user['headers'],
+                                      data={'file': (io.BytesIO(payload), f'upload-{i}.png')}, content_type='multipart/form-data')
+
+    def export(self, user, rng, i):
+        return self.transport.request('GET', f"/api/presentations/{rng.choice(user['deck_ids'])}/download", headers=user['headers'])
+
+def run_scenario(workload, name, iterations, concurrency, seed):
+    operation = getattr(workload, name)
+    samples, statuses, sizes = [], {}, []
+    lock = threading.Lock()
+    counter = iter(range(iterations))
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        user = workload.users[index % len(workload.users)]
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            started = time.perf_counter()
+            status, size, _payload = operation(user, rng, i)
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                samples.append(elapsed)
+                sizes.append(size)
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    errors = sum(count for status, count in statuses.items() if int(status) >= 400)
+    return {
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+        'statuses': statuses,
+        'mean_response_bytes': round(sum(sizes) / len(sizes)) if sizes else 0,
+        'latency': summarize(samples)
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Throughput and latency of the hot API routes against a synthetic dataset')
+    parser.add_argument('--workdir', help='Seeded directory to reuse (seeded on first use)')
+    add_scale_arguments(parser)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--export-iterations', type=int, default=5)
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--transport', choices=['client', 'http'], default='client')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    scenarios = [name for name in args.scenarios.split(',') if name]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='bench-routes-')
+    os.makedirs(workdir, exist_ok=True)
+    app = make_app(workdir, SLOW_REQUEST_THRESHOLD_MS=float('inf'))
+    app.logger.disabled = True
+    logging.getLogger('werkzeug').disabled = True
+    manifest = load_manifest(workdir)
+    if manifest is None:
+        manifest = generate(app, workdir, args.users, args.decks, args.slides, args.elements, args.images, args.videos, args.seed)
+
+    transport = HttpTransport(app) if args.transport == 'http' else TestClientTransport(app)
+    try:
+        workload = Workload(app, transport, manifest, args.concurrency)
+        results = {
+            'meta': {
+                'timestamp': datetime.utcnow().isoformat(),
+                'git_commit': git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+                'transport': args.transport,
+                'concurrency': args.concurrency,
+                'dataset': manifest
+            },
+            'scenarios': {}
+        }
+        for name in scenarios:
+            iterations = args.export_iterations if name == 'export' else args.iterations
+            if args.warmup:
+                run_scenario(workload, name, min(args.warmup, iterations), 1, args.seed)
+            results['scenarios'][name] = run_scenario(workload, name, iterations, args.concurrency, args.seed)
+    finally:
+        transport.close()
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import requests
+from werkzeug.serving import make_server, WSGIRequestHandler
+from api.extensions import db
+from api.models import MediaAsset
+from .common import make_app, measure
+
+CHUNK = 1024 * 1024
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+def prepare(app, workdir, size_mb):
+    upload_folder = os.path.join(workdir, 'uploads')
+    os.makedirs(upload_folder, exist_ok=True)
+    content = os.urandom(size_mb * CHUNK)
+    content_hash = hashlib.sha256(content).hexdigest()
+    filename = f"{content_hash}.mp4"
+    with open(os.path.join(upload_folder, filename), 'wb') as f:
+        f.write(content)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(MediaAsset(kind='video', status='ready', filename=filename, content_hash=content_hash, size=len(content)))
+        db.session.commit()
+
+    client = app.test_client()
+    client.post('/api/register', json={'email': 'bench@example.com', 'password': 'benchmark'})
+    token = client.post('/api/login', json={'email': 'bench@example.com', 'password': 'benchmark'}).get_json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+    presentation_id = client.post('/api/presentations', json={'title': 'Media'}, headers=headers).get_json()['id']
+    slide_id = client.get(f'/api/presentations/{presentation_id}', headers=headers).get_json()['slides'][0]['id']
+    element = client.post(f'/api/slides/{slide_id}/elements', headers=headers, json={
+        'element_type': 'UPLOADED_VIDEO', 'content': f'http://localhost/api/media/files/{filename}'
+    }).get_json()
+    return filename, element['content'].replace('http://localhost', '', 1)
+
+def main():
+    parser = argparse.ArgumentParser(description='Static vs authorized media endpoint serving latency')
+    parser.add_argument('--size-mb', type=int, default=50)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-media-')
+    app = make_app(workdir)
+    app.static_folder = workdir
+    filename, signed_path = prepare(app, workdir, args.size_mb)
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+    session = requests.Session()
+
+    targets = {
+        'static': (f'{base_url}/static/uploads/{filename}', {}),
+        'media_endpoint': (f'{base_url}{signed_path}', {})
+    }
+    results = {'size_mb': args.size_mb, 'iterations': args.iterations}
+    for name, (url, target_headers) in targets.items():
+        def full_get():
+            response = session.get(url, headers=target_headers)
+            assert response.status_code == 200, response.status_code
+
+        def range_get():
+            response = session.get(url, headers={**target_headers, 'Range': 'bytes=1048576-2097151'})
+            assert response.status_code == 206, response.status_code
+
+        full = measure(full_get, args.iterations)
+        full['throughput_mb_s'] = round(args.size_mb / (full['mean_ms'] / 1000), 1) if full['mean_ms'] else None
+        results[name] = {'full': full, 'range_1mb': measure(range_get, args.iterations * 4)}
+
+    server.shutdown()
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
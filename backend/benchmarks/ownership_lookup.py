@@ -0,0 +1,91 @@
+import argparse
+import json
+import random
+import tempfile
+import uuid
+from flask import g
+from api.extensions import db
+from api.models import User, Presentation, Slide, SlideElement
+from api.ownership import get_owned_element_or_404, get_owned_slide_or_404
+from api.security import AuthenticatedUser
+from api.services.slide_order import POSITION_GAP
+from .common import make_app, measure
+
+BATCH_SIZE = 50000
+
+def seed(total_elements, elements_per_slide, slides_per_presentation):
+    user = User(email='bench@example.com', password_hash='x' * 60)
+    db.session.add(user)
+    db.session.commit()
+
+    slide_count = max(1, total_elements // elements_per_slide)
+    presentation_count = max(1, slide_count // slides_per_presentation)
+    presentation_ids = [str(uuid.uuid4()) for _ in range(presentation_count)]
+    db.session.execute(db.insert(Presentation), [
+        {'id': pid, 'title': f'Deck {i}', 'user_id': user.id} for i, pid in enumerate(presentation_ids)
+    ])
+    db.session.execute(db.insert(Slide), [
+        {'id': i + 1, 'position': (i % slides_per_presentation + 1) * POSITION_GAP, 'presentation_id': presentation_ids[min(i // slides_per_presentation, presentation_count - 1)]}
+        for i in range(slide_count)
+    ])
+    element_ids = []
+    rows = []
+    for i in range(total_elements):
+        element_id = str(uuid.uuid4())
+        element_ids.append(element_id)
+        rows.append({'id': element_id, 'element_type': 'TEXT', 'content': f'Text {i}', 'slide_id': i % slide_count + 1})
+        if len(rows) >= BATCH_SIZE:
+            db.session.execute(db.insert(SlideElement), rows)
+            rows = []
+    if rows:
+        db.session.execute(db.insert(SlideElement), rows)
+    db.session.commit()
+    return user.id, slide_count, element_ids
+
+def chained_element_lookup(element_id, user_id):
+    element = db.session.get(SlideElement, element_id)
+    slide = db.session.get(Slide, element.slide_id)
+    presentation = db.session.get(Presentation, slide.presentation_id)
+    assert presentation.user_id == user_id
+
+def main():
+    parser = argparse.ArgumentParser(description='Element/slide ownership lookup latency')
+    parser.add_argument('--elements', type=int, default=1_000_000)
+    parser.add_argument('--elements-per-slide', type=int, default=20)
+    parser.add_argument('--slides-per-presentation', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-ownership-')
+    app = make_app(workdir)
+    with app.app_context():
+        db.create_all()
+        user_id, slide_count, element_ids = seed(args.elements, args.elements_per_slide, args.slides_per_presentation)
+
+        with app.test_request_context():
+            g.current_user = AuthenticatedUser(user_id, 'bench@example.com')
+
+            def sample(fn, pool):
+                def run():
+                    fn(random.choice(pool))
+                    db.session.expunge_all()
+                return run
+
+            results = {
+                'elements': args.elements,
+                'slides': slide_count,
+                'element_chain_get_or_404': measure(sample(lambda eid: chained_element_lookup(eid, user_id), element_ids), args.iterations),
+                'element_owned_join': measure(sample(get_owned_element_or_404, element_ids), args.iterations),
+                'slide_owned_join': measure(sample(get_owned_slide_or_404, range(1, slide_count + 1)), args.iterations),
+                'slide_elements_by_slide_id': measure(sample(lambda sid: SlideElement.query.filter_by(slide_id=sid).all(), range(1, slide_count + 1)), args.iterations)
+            }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+from urllib.parse import quote
+from sqlalchemy import text
+from api.extensions import db
+from api.models import Presentation, Slide
+from api.services.search import rebuild_search_index
+from .common import make_app, measure
+from .seed import add_scale_arguments, generate, load_manifest, user_email
+
+NEEDLE = 'Синхрофазотрон'
+QUERIES = {
+    'common': 'выручки',
+    'prefix': 'выруч',
+    'multiword': 'рост выручки команда',
+    'rare': NEEDLE.lower(),
+    'missing': 'несуществующееслово'
+}
+LIKE_SCAN = text(
+    "SELECT s.id FROM slide_element e JOIN slide s ON s.id = e.slide_id JOIN presentation p ON p.id = s.presentation_id "
+    "WHERE p.user_id = :user_id AND e.element_type = 'TEXT' AND lower(e.content) LIKE :pattern LIMIT :limit"
+)
+
+def login(client, manifest):
+    payload = client.post('/api/login', json={'email': user_email(0), 'password': manifest['password']}).get_json()
+    return {'Authorization': f"Bearer {payload['token']}"}
+
+def plant_needles(app, client, headers, count):
+    with app.app_context():
+        slide_ids = [sid for (sid,) in (db.session.query(Slide.id)
+                                        .join(Presentation, Presentation.id == Slide.presentation_id)
+                                        .filter(Presentation.user_id == 1)
+                                        .order_by(Slide.id)
+                                        .limit(count))]
+        db.session.remove()
+    element_ids = []
+    for index, slide_id in enumerate(slide_ids):
+        response = client.post(f'/api/slides/{slide_id}/elements', headers=headers,
+                               json={'element_type': 'TEXT', 'content': f'{NEEDLE} {index}', 'pos_x': 0, 'pos_y': 0})
+        assert response.status_code == 201, response.status_code
+        element_ids.append(response.get_json()['id'])
+    return element_ids
+
+def main():
+    parser = argparse.ArgumentParser(description='Full-text search latency over a synthetic corpus against a LIKE scan')
+    parser.add_argument('--workdir', help='Seeded directory to reuse (seeded on first use)')
+    add_scale_arguments(parser)
+    parser.set_defaults(decks=1000, slides=50, elements=20)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--like-iterations', type=int, default=5)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--needles', type=int, default=5)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='bench-search-')
+    os.makedirs(workdir, exist_ok=True)
+    app = make_app(workdir, SLOW_REQUEST_THRESHOLD_MS=float('inf'))
+    app.logger.disabled = True
+    logging.getLogger('werkzeug').disabled = True
+    manifest = load_manifest(workdir)
+    if manifest is None:
+        manifest = generate(app, workdir, args.users, args.decks, args.slides, args.elements, args.images, args.videos, args.seed)
+
+    with app.app_context():
+        started = time.perf_counter()
+        presentations, slides = rebuild_search_index()
+        reindex_seconds = time.perf_counter() - started
+        elements = db.session.execute(text("SELECT count(*) FROM slide_element WHERE element_type = 'TEXT'")).scalar()
+        db.session.remove()
+
+    client = app.test_client()
+    headers = login(client, manifest)
+    element_ids = plant_needles(app, client, headers, args.needles)
+
+    autosave_counter = iter(range(args.iterations))
+    autosave = measure(lambda: client.put(f'/api/elements/{element_ids[0]}', headers=headers,
+                                          json={'content': f'{NEEDLE} {next(autosave_counter)}'}), args.iterations)
+
+    queries = {}
+    for name, query in QUERIES.items():
+        path = f'/api/search?q={quote(query)}&limit={args.limit}'
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200, response.status_code
+        hits = len(response.get_json()['results'])
+        search_latency = measure(lambda: client.get(path, headers=headers), args.iterations)
+        with app.app_context():
+            params = {'user_id': 1, 'pattern': f'%{query.split()[0]}%', 'limit': args.limit}
+            like_latency = measure(lambda: db.session.execute(LIKE_SCAN, params).all(), args.like_iterations)
+            db.session.remove()
+        queries[name] = {'query': query, 'hits': hits, 'search': search_latency, 'like_scan': like_latency}
+
+    results = {
+        'meta': {'dataset': manifest, 'text_elements': elements, 'indexed_slides': slides,
+                 'indexed_presentations': presentations},
+        'reindex': {'seconds': round(reindex_seconds, 2)},
+        'autosave': autosave,
+        'queries': queries
+    }
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
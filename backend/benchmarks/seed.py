@@ -0,0 +1,188 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from PIL import Image
+from api.extensions import db, bcrypt
+from api.models import User, Presentation, Slide, SlideElement, MediaAsset
+from api.services.slide_order import POSITION_GAP
+from .common import make_app
+
+BATCH_SIZE = 20000
+PASSWORD = 'benchmark'
+MANIFEST = 'seed.json'
+ELEMENT_MIX = (('TEXT', 0.8), ('IMAGE', 0.15), ('UPLOADED_VIDEO', 0.05))
+VIDEO_FIXTURE_SIZE = 256 * 1024
+
+def user_email(index):
+    return f'bench-{index}@example.com'
+
+def media_url(filename):
+    return f'http://localhost/api/media/files/{filename}'
+
+def random_id(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def write_image_fixtures(rng, upload_folder, count):
+    assets = []
+    for index in range(count):
+        color = tuple(rng.randrange(256) for _ in range(3))
+        width, height = rng.choice([(1920, 1080), (1280, 960), (800, 800)])
+        path = os.path.join(upload_folder, f'fixture-{index}.png')
+        Image.new('RGB', (width, height), color).save(path)
+        with open(path, 'rb') as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        filename = f'{content_hash}.png'
+        os.replace(path, os.path.join(upload_folder, filename))
+        assets.append({'id': random_id(rng), 'kind': 'image', 'status': 'ready', 'filename': filename,
+                       'content_hash': content_hash, 'size': os.path.getsize(os.path.join(upload_folder, filename)),
+                       'width': width, 'height': height, 'ref_count': 0})
+    return assets
+
+def write_video_fixtures(rng, upload_folder, count):
+    assets = []
+    for index in range(count):
+        payload = rng.randbytes(VIDEO_FIXTURE_SIZE)
+        content_hash = hashlib.sha256(payload).hexdigest()
+        with open(os.path.join(upload_folder, f'{content_hash}.mp4'), 'wb') as f:
+            f.write(payload)
+        poster_filename = f'{content_hash}_poster.jpg'
+        Image.new('RGB', (640, 360), (index * 40 % 256, 0, 0)).save(os.path.join(upload_folder, poster_filename))
+        assets.append({'id': random_id(rng), 'kind': 'video', 'status': 'ready', 'filename': f'{content_hash}.mp4',
+                       'content_hash': content_hash, 'size': VIDEO_FIXTURE_SIZE, 'poster_filename': poster_filename,
+                       'ref_count': 0})
+    return assets
+
+def write_thumbnail_placeholder(app):
+    content_hash = hashlib.sha256(b'benchmark-slide-thumbnail').hexdigest()
+    folder = app.config['SLIDE_THUMBNAIL_FOLDER']
+    os.makedirs(folder, exist_ok=True)
+    Image.new('RGB', (app.config['SLIDE_THUMBNAIL_WIDTH'], app.config['SLIDE_THUMBNAIL_WIDTH'] * 9 // 16), 'white').save(
+        os.path.join(folder, f"{content_hash}.{app.config['SLIDE_THUMBNAIL_FORMAT']}"))
+    return content_hash
+
+def flush(rows, model):
+    if rows:
+        db.session.execute(db.insert(model), rows)
+        rows.clear()
+
+def build_element(rng, slide_id, images, videos):
+    roll = rng.random()
+    element_type = 'TEXT'
+    for candidate, share in ELEMENT_MIX:
+        if roll < share:
+            element_type = candidate
+            break
+        roll -= share
+    if element_type == 'IMAGE' and not images or element_type == 'UPLOADED_VIDEO' and not videos:
+        element_type = 'TEXT'
+
+    row = {'id': random_id(rng), 'element_type': element_type, 'slide_id': slide_id,
+           'pos_x': rng.randrange(0, 1000), 'pos_y': rng.randrange(0, 600),
+           'width': rng.randrange(100, 600), 'height': rng.randrange(50, 400), 'font_size': rng.choice((18, 24, 28, 44))}
+    if element_type == 'TEXT':
+        row['content'] = ' '.join(rng.choice(('Квартальный', 'отчёт', 'рост', 'выручки', 'команда', 'план', 'итоги'))
+                                  for _ in range(rng.randrange(2, 24)))
+    else:
+        asset = rng.choice(images if element_type == 'IMAGE' else videos)
+        asset['ref_count'] += 1
+        row['content'] = media_url(asset['filename'])
+        row['media_id'] = asset['id']
+    return row
+
+def generate(app, workdir, users, decks, slides, elements, images, videos, seed=0):
+    rng = random.Random(seed)
+    upload_folder = app.config['UPLOAD_FOLDER']
+    os.makedirs(upload_folder, exist_ok=True)
+    started = time.perf_counter()
+
+    with app.app_context():
+        db.create_all()
+        password_hash = bcrypt.generate_password_hash(PASSWORD).decode('utf-8')
+        db.session.execute(db.insert(User), [
+            {'id': i + 1, 'email': user_email(i), 'password_hash': password_hash} for i in range(users)
+        ])
+
+        image_assets = write_image_fixtures(rng, upload_folder, images)
+        video_assets = write_video_fixtures(rng, upload_folder, videos)
+        thumbnail_hash = write_thumbnail_placeholder(app)
+        if image_assets or video_assets:
+            db.session.execute(db.insert(MediaAsset), image_assets + video_assets)
+
+        now = datetime.utcnow()
+        presentation_rows, slide_rows, element_rows = [], [], []
+        slide_id = 0
+        for deck in range(decks):
+            presentation_id = random_id(rng)
+            updated_at = now - timedelta(minutes=deck)
+            presentation_rows.append({'id': presentation_id, 'title': f'Презентация {deck}', 'user_id': deck % users + 1,
+                                      'created_at': updated_at, 'updated_at': updated_at})
+            for number in range(slides):
+                slide_id += 1
+                slide_rows.append({'id': slide_id, 'position': (number + 1) * POSITION_GAP, 'presentation_id': presentation_id,
+                                   'thumbnail_hash': thumbnail_hash})
+                for _ in range(elements):
+                    element_rows.append(build_element(rng, slide_id, image_assets, video_assets))
+                if len(element_rows) >= BATCH_SIZE:
+                    flush(presentation_rows, Presentation)
+                    flush(slide_rows, Slide)
+                    flush(element_rows, SlideElement)
+        flush(presentation_rows, Presentation)
+        flush(slide_rows, Slide)
+        flush(element_rows, SlideElement)
+        if image_assets or video_assets:
+            db.session.execute(db.update(MediaAsset), [{'id': a['id'], 'ref_count': a['ref_count']} for a in image_assets + video_assets])
+        db.session.commit()
+
+    manifest = {
+        'seed': seed,
+        'users': users,
+        'decks': decks,
+        'slides_per_deck': slides,
+        'elements_per_slide': elements,
+        'image_fixtures': images,
+        'video_fixtures': videos,
+        'password': PASSWORD,
+        'seconds': round(time.perf_counter() - started, 1)
+    }
+    with open(os.path.join(workdir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def load_manifest(workdir):
+    path = os.path.join(workdir, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def add_scale_arguments(parser):
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--decks', type=int, default=100)
+    parser.add_argument('--slides', type=int, default=20)
+    parser.add_argument('--elements', type=int, default=10)
+    parser.add_argument('--images', type=int, default=20)
+    parser.add_argument('--videos', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed a benchmark database with synthetic users, decks, slides and media')
+    parser.add_argument('--workdir', help='Directory for the database and media fixtures (default: new temporary directory)')
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='bench-seed-')
+    os.makedirs(workdir, exist_ok=True)
+    if load_manifest(workdir) is not None:
+        parser.error(f'{workdir} is already seeded')
+    app = make_app(workdir)
+    manifest = generate(app, workdir, args.users, args.decks, args.slides, args.elements, args.images, args.videos, args.seed)
+    print(json.dumps({'workdir': workdir, **manifest}, indent=2))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
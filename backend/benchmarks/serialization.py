@@ -0,0 +1,112 @@
+import argparse
+import gc
+import json
+import time
+import tempfile
+import uuid
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.orm import selectinload
+from api.extensions import db
+from api.json_provider import OrjsonProvider, orjson
+from api.models import User, Presentation, Slide, SlideElement
+from api.serializers import serialize_slide, load_slide_rows
+from api.services.slide_order import POSITION_GAP
+from .common import make_app, summarize
+
+ELEMENT_TYPES = ('TEXT', 'TEXT', 'TEXT', 'IMAGE', 'YOUTUBE_VIDEO')
+
+def seed(total_elements, slides):
+    user = User(email='bench@example.com', password_hash='x' * 60)
+    db.session.add(user)
+    db.session.commit()
+
+    presentation_id = str(uuid.uuid4())
+    db.session.execute(db.insert(Presentation), [{'id': presentation_id, 'title': 'Serialization', 'user_id': user.id}])
+    db.session.execute(db.insert(Slide), [
+        {'id': i + 1, 'position': (i + 1) * POSITION_GAP, 'presentation_id': presentation_id} for i in range(slides)
+    ])
+    rows = []
+    for i in range(total_elements):
+        element_type = ELEMENT_TYPES[i % len(ELEMENT_TYPES)]
+        content = {'TEXT': f'Текст элемента {i} ' * 4, 'IMAGE': f'http://localhost/api/media/files/{i:064x}.png',
+                   'YOUTUBE_VIDEO': 'dQw4w9WgXcQ'}[element_type]
+        rows.append({'id': str(uuid.uuid4()), 'element_type': element_type, 'content': content,
+                     'pos_x': i % 1280, 'pos_y': i % 720, 'slide_id': i % slides + 1})
+    db.session.execute(db.insert(SlideElement), rows)
+    db.session.commit()
+    return presentation_id
+
+def orm_slides(presentation_id):
+    slides = (Slide.query
+              .options(selectinload(Slide.elements))
+              .filter_by(presentation_id=presentation_id)
+              .order_by(Slide.position, Slide.id)
+              .all())
+    output = [serialize_slide(slide, number) for number, slide in enumerate(slides, 1)]
+    db.session.expunge_all()
+    return output
+
+def measure_phases(builders, providers, iterations):
+    runs = [(builder, provider) for builder in builders for provider in providers]
+    samples = {run: {'build': [], 'encode': [], 'total': []} for run in runs}
+    for iteration in range(iterations + 1):
+        for builder, provider in runs:
+            gc.collect()
+            started = time.perf_counter()
+            slides = builders[builder]()
+            built = time.perf_counter()
+            providers[provider].response({'slides': slides}).get_data()
+            finished = time.perf_counter()
+            if iteration:
+                samples[builder, provider]['build'].append((built - started) * 1000)
+                samples[builder, provider]['encode'].append((finished - built) * 1000)
+                samples[builder, provider]['total'].append((finished - started) * 1000)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description='Presentation tree serialization throughput')
+    parser.add_argument('--elements', type=int, default=5000)
+    parser.add_argument('--slides', type=int, default=50)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench-serialization-')
+    app = make_app(workdir)
+    providers = {'stdlib': DefaultJSONProvider(app)}
+    if orjson is not None:
+        providers['orjson'] = OrjsonProvider(app)
+
+    with app.app_context():
+        db.create_all()
+        presentation_id = seed(args.elements, args.slides)
+
+        with app.test_request_context():
+            payload = {'id': presentation_id, 'slides': load_slide_rows(presentation_id)}
+            builders = {
+                'orm_objects': lambda: orm_slides(presentation_id),
+                'column_rows': lambda: load_slide_rows(presentation_id)
+            }
+            samples = measure_phases(builders, providers, args.iterations)
+            results = {
+                'elements': args.elements,
+                'slides': args.slides,
+                'payload_bytes': len(providers['stdlib'].response(payload).get_data()),
+                'build': {builder: summarize([sample for (name, _), runs in samples.items() if name == builder
+                                              for sample in runs['build']])
+                          for builder in builders},
+                'encode': {provider: summarize([sample for (_, name), runs in samples.items() if name == provider
+                                                for sample in runs['encode']])
+                           for provider in providers},
+                'end_to_end': {f'{builder}_{provider}': summarize(runs['total'])
+                               for (builder, provider), runs in samples.items()}
+            }
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
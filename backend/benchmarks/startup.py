@@ -0,0 +1,152 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_MODULES = ('pptx', 'PIL.Image', 'ffmpeg', 'requests', 'lxml', 'numpy', 'cv2')
+
+def memory_stats():
+    stats = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, _sep, value = line.partition(':')
+                if key in ('Rss', 'Private_Clean', 'Private_Dirty'):
+                    stats[key] = int(value.split()[0])
+    except OSError:
+        return {}
+    return {'rss_mb': round(stats['Rss'] / 1024, 1),
+            'private_mb': round((stats['Private_Clean'] + stats['Private_Dirty']) / 1024, 1)}
+
+def loaded_heavy_modules():
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+def serve_auth_request(app):
+    client = app.test_client()
+    client.post('/api/register', json={'email': f'bench-{os.getpid()}@example.com', 'password': 'benchmark'})
+    response = client.post('/api/login', json={'email': f'bench-{os.getpid()}@example.com', 'password': 'benchmark'})
+    assert response.status_code == 200, response.status_code
+
+def worker(app, write_fd):
+    serve_auth_request(app)
+    after_auth = memory_stats()
+    heavy_after_auth = loaded_heavy_modules()
+    from api.preload import preload_heavy_modules
+    preload_heavy_modules()
+    os.write(write_fd, json.dumps({
+        'after_auth': after_auth,
+        'heavy_after_auth': heavy_after_auth,
+        'after_heavy': memory_stats()
+    }).encode() + b'\n')
+
+def probe(preload, workers):
+    started = time.perf_counter()
+    from api.extensions import db
+    from .common import make_app
+    workdir = tempfile.mkdtemp(prefix='bench-startup-')
+    app = make_app(workdir, PRELOAD_HEAVY_MODULES=preload)
+    startup_ms = (time.perf_counter() - started) * 1000
+    with app.app_context():
+        db.create_all()
+        db.session.remove()
+        db.engine.dispose()
+
+    result = {'startup_ms': round(startup_ms, 1), 'master': memory_stats(), 'heavy_at_startup': loaded_heavy_modules()}
+    read_fd, write_fd = os.pipe()
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            try:
+                worker(app, write_fd)
+            finally:
+                os._exit(0)
+        children.append(pid)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        result['workers'] = [json.loads(line) for line in f]
+    for pid in children:
+        os.waitpid(pid, 0)
+    print(json.dumps(result))
+
+def run_probe(preload, workers):
+    command = [sys.executable, '-m', 'benchmarks.startup', '--probe', '--workers', str(workers)]
+    if preload:
+        command.append('--preload')
+    output = subprocess.run(command, check=True, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def mean(values):
+    return round(sum(values) / len(values), 1) if values else 0.0
+
+def summarize_mode(probes):
+    from .common import summarize
+    workers = [w for p in probes for w in p['workers']]
+    return {
+        'startup': summarize([p['startup_ms'] for p in probes]),
+        'master_rss_mb': mean([p['master'].get('rss_mb', 0) for p in probes]),
+        'heavy_at_startup': sorted({m for p in probes for m in p['heavy_at_startup']}),
+        'heavy_after_auth': sorted({m for w in workers for m in w['heavy_after_auth']}),
+        'worker_after_auth': {
+            'rss_mb': mean([w['after_auth'].get('rss_mb', 0) for w in workers]),
+            'private_mb': mean([w['after_auth'].get('private_mb', 0) for w in workers])
+        },
+        'worker_after_heavy': {
+            'rss_mb': mean([w['after_heavy'].get('rss_mb', 0) for w in workers]),
+            'private_mb': mean([w['after_heavy'].get('private_mb', 0) for w in workers])
+        }
+    }
+
+def check(results, max_startup_ms, max_rss_mb):
+    failures = []
+    lazy = results['lazy']
+    if lazy['heavy_at_startup']:
+        failures.append(f"heavy modules imported at startup: {', '.join(lazy['heavy_at_startup'])}")
+    if lazy['heavy_after_auth']:
+        failures.append(f"heavy modules imported by auth requests: {', '.join(lazy['heavy_after_auth'])}")
+    if max_startup_ms and lazy['startup']['p50_ms'] > max_startup_ms:
+        failures.append(f"startup p50 {lazy['startup']['p50_ms']} ms exceeds {max_startup_ms} ms")
+    if max_rss_mb and lazy['worker_after_auth']['rss_mb'] > max_rss_mb:
+        failures.append(f"worker RSS {lazy['worker_after_auth']['rss_mb']} MB exceeds {max_rss_mb} MB")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description='Worker startup time and memory with lazy and preloaded heavy modules')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-startup-ms', type=float, default=0)
+    parser.add_argument('--max-rss-mb', type=float, default=0)
+    parser.add_argument('--check', action='store_true')
+    parser.add_argument('--probe', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--preload', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    if args.probe:
+        probe(args.preload, args.workers)
+        return
+
+    results = {
+        'runs': args.runs,
+        'workers': args.workers,
+        'lazy': summarize_mode([run_probe(False, args.workers) for _ in range(args.runs)]),
+        'preload': summarize_mode([run_probe(True, args.workers) for _ in range(args.runs)])
+    }
+    failures = check(results, args.max_startup_ms, args.max_rss_mb) if args.check else []
+    results['failures'] = failures
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+    if failures:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
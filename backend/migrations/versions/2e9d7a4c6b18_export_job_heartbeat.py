@@ -0,0 +1,31 @@
+"""track export job heartbeats
+
+Revision ID: 2e9d7a4c6b18
+Revises: f7b2d4e8a153
+Create Date: 2026-10-18 23:36:08.652931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e9d7a4c6b18'
+down_revision = 'f7b2d4e8a153'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('export_job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    op.execute('UPDATE export_job SET updated_at = COALESCE(finished_at, created_at)')
+
+    with op.batch_alter_table('export_job', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('export_job', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,39 @@
+"""add background export jobs
+
+Revision ID: 3c7e9a1d5b20
+Revises: 1ba685dfaba3
+Create Date: 2026-10-18 21:17:00.104233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7e9a1d5b20'
+down_revision = '1ba685dfaba3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('export_job',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('presentation_id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('slides_total', sa.Integer(), nullable=False),
+    sa.Column('slides_done', sa.Integer(), nullable=False),
+    sa.Column('file_name', sa.String(length=64), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['presentation_id'], ['presentation.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('export_job')
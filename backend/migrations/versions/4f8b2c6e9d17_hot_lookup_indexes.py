@@ -0,0 +1,44 @@
+"""index hot lookup columns
+
+Revision ID: 4f8b2c6e9d17
+Revises: 9a5c3e1f7d42
+Create Date: 2026-10-19 09:14:52.603118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f8b2c6e9d17'
+down_revision = '9a5c3e1f7d42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('presentation', schema=None) as batch_op:
+        batch_op.create_index('ix_presentation_user_id_updated_at', ['user_id', 'updated_at'], unique=False)
+
+    with op.batch_alter_table('slide', schema=None) as batch_op:
+        batch_op.create_index('ix_slide_presentation_id_position', ['presentation_id', 'position'], unique=False)
+
+    with op.batch_alter_table('slide_element', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_slide_element_slide_id'), ['slide_id'], unique=False)
+
+    with op.batch_alter_table('export_job', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_export_job_presentation_id'), ['presentation_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('export_job', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_export_job_presentation_id'))
+
+    with op.batch_alter_table('slide_element', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_slide_element_slide_id'))
+
+    with op.batch_alter_table('slide', schema=None) as batch_op:
+        batch_op.drop_index('ix_slide_presentation_id_position')
+
+    with op.batch_alter_table('presentation', schema=None) as batch_op:
+        batch_op.drop_index('ix_presentation_user_id_updated_at')
@@ -0,0 +1,44 @@
+"""order slides by gapped position keys
+
+Revision ID: 5d2c9a7e41b3
+Revises: 8d6f2b4e1a95
+Create Date: 2026-10-18 21:30:02.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2c9a7e41b3'
+down_revision = '8d6f2b4e1a95'
+branch_labels = None
+depends_on = None
+
+POSITION_GAP = 1 << 20
+
+
+def upgrade():
+    with op.batch_alter_table('slide', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('position', sa.BigInteger(), nullable=True))
+
+    op.execute(sa.text('UPDATE slide SET position = slide_number * :gap').bindparams(gap=POSITION_GAP))
+
+    with op.batch_alter_table('slide', schema=None) as batch_op:
+        batch_op.alter_column('position', existing_type=sa.BigInteger(), nullable=False)
+        batch_op.drop_column('slide_number')
+
+
+def downgrade():
+    with op.batch_alter_table('slide', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('slide_number', sa.Integer(), nullable=True))
+
+    op.execute(sa.text(
+        'UPDATE slide SET slide_number = (SELECT count(*) FROM slide o '
+        'WHERE o.presentation_id = slide.presentation_id '
+        'AND (o.position < slide.position OR (o.position = slide.position AND o.id <= slide.id)))'
+    ))
+
+    with op.batch_alter_table('slide', schema=None) as batch_op:
+        batch_op.alter_column('slide_number', existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_column('position')
@@ -0,0 +1,41 @@
+"""record an operation log per presentation
+
+Revision ID: 5e3a9c7d2f68
+Revises: 2b8f5d1a7e46
+Create Date: 2026-10-18 21:24:49.743732
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e3a9c7d2f68'
+down_revision = '2b8f5d1a7e46'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('presentation_change',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('presentation_id', sa.String(length=36), nullable=False),
+    sa.Column('revision', sa.Integer(), nullable=False),
+    sa.Column('op', sa.String(length=20), nullable=False),
+    sa.Column('target_id', sa.String(length=36), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['presentation_id'], ['presentation.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('presentation_change', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_presentation_change_created_at'), ['created_at'], unique=False)
+        batch_op.create_index('ix_presentation_change_presentation_id_revision', ['presentation_id', 'revision'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('presentation_change', schema=None) as batch_op:
+        batch_op.drop_index('ix_presentation_change_presentation_id_revision')
+        batch_op.drop_index(batch_op.f('ix_presentation_change_created_at'))
+
+    op.drop_table('presentation_change')
@@ -0,0 +1,28 @@
+"""claim upload offsets while a chunk is written
+
+Revision ID: 6c1d9e3f7a28
+Revises: 4f8b2c6e9d17
+Create Date: 2026-10-19 10:02:37.418526
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c1d9e3f7a28'
+down_revision = '4f8b2c6e9d17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('upload_session', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('claim_token', sa.String(length=36), nullable=True))
+        batch_op.add_column(sa.Column('claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('upload_session', schema=None) as batch_op:
+        batch_op.drop_column('claimed_at')
+        batch_op.drop_column('claim_token')
@@ -0,0 +1,34 @@
+"""track transcoded media assets
+
+Revision ID: 6f1b8d3e9a04
+Revises: 3c7e9a1d5b20
+Create Date: 2026-10-18 21:18:07.195590
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f1b8d3e9a04'
+down_revision = '3c7e9a1d5b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('media_asset',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('filename', sa.String(length=128), nullable=False),
+    sa.Column('poster_filename', sa.String(length=128), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('filename')
+    )
+
+
+def downgrade():
+    op.drop_table('media_asset')
@@ -0,0 +1,31 @@
+"""version presentations for ETags
+
+Revision ID: 7a2e6b9f4c31
+Revises: e8a5c1f3d972
+Create Date: 2026-10-18 21:21:28.469661
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a2e6b9f4c31'
+down_revision = 'e8a5c1f3d972'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('presentation', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=True))
+
+    op.execute('UPDATE presentation SET version = 1')
+
+    with op.batch_alter_table('presentation', schema=None) as batch_op:
+        batch_op.alter_column('version', existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('presentation', schema=None) as batch_op:
+        batch_op.drop_column('version')
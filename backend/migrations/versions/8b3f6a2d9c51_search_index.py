@@ -0,0 +1,60 @@
+"""create and fill the full-text search index
+
+Revision ID: 8b3f6a2d9c51
+Revises: 6c1d9e3f7a28
+Create Date: 2026-10-19 10:48:11.930264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from flask import current_app
+
+
+# revision identifiers, used by Alembic.
+revision = '8b3f6a2d9c51'
+down_revision = '6c1d9e3f7a28'
+branch_labels = None
+depends_on = None
+
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS slide_search USING fts5(content, tokenize='unicode61 remove_diacritics 2')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS presentation_search USING fts5(title, presentation_id UNINDEXED, "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "DELETE FROM slide_search",
+    "DELETE FROM presentation_search",
+    "INSERT INTO presentation_search (title, presentation_id) SELECT title, id FROM presentation",
+    "INSERT INTO slide_search (rowid, content) "
+    "SELECT slide_id, group_concat(content, char(10)) FROM slide_element "
+    "WHERE element_type = 'TEXT' AND content IS NOT NULL AND content != '' GROUP BY slide_id",
+]
+
+POSTGRES_UPGRADE = [
+    "CREATE TABLE IF NOT EXISTS slide_search (slide_id INTEGER PRIMARY KEY, content TEXT NOT NULL, document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_slide_search_document ON slide_search USING GIN (document)",
+    "CREATE TABLE IF NOT EXISTS presentation_search (presentation_id VARCHAR(36) PRIMARY KEY, title TEXT NOT NULL, "
+    "document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_presentation_search_document ON presentation_search USING GIN (document)",
+    "DELETE FROM slide_search",
+    "DELETE FROM presentation_search",
+    "INSERT INTO presentation_search (presentation_id, title, document) "
+    "SELECT id, title, to_tsvector(CAST(:config AS regconfig), title) FROM presentation",
+    "INSERT INTO slide_search (slide_id, content, document) "
+    "SELECT slide_id, string_agg(content, E'\\n' ORDER BY id), "
+    "to_tsvector(CAST(:config AS regconfig), string_agg(content, E'\\n' ORDER BY id)) FROM slide_element "
+    "WHERE element_type = 'TEXT' AND content IS NOT NULL AND content != '' GROUP BY slide_id",
+]
+
+UPGRADE = {'sqlite': SQLITE_UPGRADE, 'postgresql': POSTGRES_UPGRADE}
+
+
+def upgrade():
+    bind = op.get_bind()
+    params = {'config': current_app.config['SEARCH_TS_CONFIG']}
+    for sql in UPGRADE.get(bind.dialect.name, []):
+        bind.execute(sa.text(sql), params if ':config' in sql else {})
+
+
+def downgrade():
+    if op.get_bind().dialect.name in UPGRADE:
+        op.execute('DROP TABLE IF EXISTS slide_search')
+        op.execute('DROP TABLE IF EXISTS presentation_search')
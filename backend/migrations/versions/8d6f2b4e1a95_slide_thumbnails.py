@@ -0,0 +1,26 @@
+"""store rendered slide thumbnail hashes
+
+Revision ID: 8d6f2b4e1a95
+Revises: 5e3a9c7d2f68
+Create Date: 2026-10-18 21:25:56.835089
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d6f2b4e1a95'
+down_revision = '5e3a9c7d2f68'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('slide', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('thumbnail_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('slide', schema=None) as batch_op:
+        batch_op.drop_column('thumbnail_hash')
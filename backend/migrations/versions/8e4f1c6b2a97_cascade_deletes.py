@@ -0,0 +1,46 @@
+"""cascade presentation and slide deletes in the database
+
+Revision ID: 8e4f1c6b2a97
+Revises: 5d2c9a7e41b3
+Create Date: 2026-10-18 22:04:41.530917
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4f1c6b2a97'
+down_revision = '5d2c9a7e41b3'
+branch_labels = None
+depends_on = None
+
+# the baseline created unnamed foreign keys; name them the way PostgreSQL does
+# so the same names work for batch-reflected SQLite tables
+NAMING_CONVENTION = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+
+FOREIGN_KEYS = [
+    ('slide', 'presentation_id', 'presentation', 'CASCADE'),
+    ('slide_element', 'slide_id', 'slide', 'CASCADE'),
+    ('slide_element', 'media_id', 'media_asset', 'SET NULL'),
+    ('presentation_change', 'presentation_id', 'presentation', 'CASCADE'),
+    ('export_job', 'presentation_id', 'presentation', 'CASCADE'),
+]
+
+
+def replace_foreign_keys(cascade):
+    for table in dict.fromkeys(table for table, _column, _referent, _ondelete in FOREIGN_KEYS):
+        with op.batch_alter_table(table, schema=None, naming_convention=NAMING_CONVENTION) as batch_op:
+            for fk_table, column, referent, ondelete in FOREIGN_KEYS:
+                if fk_table != table:
+                    continue
+                name = f'{table}_{column}_fkey'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(name, referent, [column], ['id'], ondelete=ondelete if cascade else None)
+
+
+def upgrade():
+    replace_foreign_keys(cascade=True)
+
+
+def downgrade():
+    replace_foreign_keys(cascade=False)
@@ -0,0 +1,26 @@
+"""pin reused media assets against removal
+
+Revision ID: 9a5c3e1f7d42
+Revises: 2e9d7a4c6b18
+Create Date: 2026-10-19 00:12:40.318775
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a5c3e1f7d42'
+down_revision = '2e9d7a4c6b18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('media_asset', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('pinned_until', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('media_asset', schema=None) as batch_op:
+        batch_op.drop_column('pinned_until')
@@ -0,0 +1,39 @@
+"""store media as content-addressed, reference-counted blobs
+
+Revision ID: b4d2f7a8c615
+Revises: 6f1b8d3e9a04
+Create Date: 2026-10-18 21:19:14.286947
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d2f7a8c615'
+down_revision = '6f1b8d3e9a04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('media_asset', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('size', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('ref_count', sa.Integer(), nullable=True))
+
+    op.execute("UPDATE media_asset SET content_hash = '', size = 0, ref_count = 0")
+
+    with op.batch_alter_table('media_asset', schema=None) as batch_op:
+        batch_op.alter_column('content_hash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.alter_column('size', existing_type=sa.BigInteger(), nullable=False)
+        batch_op.alter_column('ref_count', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index(batch_op.f('ix_media_asset_content_hash'), ['content_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('media_asset', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_media_asset_content_hash'))
+        batch_op.drop_column('ref_count')
+        batch_op.drop_column('size')
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,99 @@
+"""link legacy media elements to their assets
+
+Revision ID: c3a81f5d9e20
+Revises: 8e4f1c6b2a97
+Create Date: 2026-10-18 22:41:17.904362
+
+"""
+import hashlib
+import os
+import uuid
+from datetime import datetime
+from alembic import op
+from flask import current_app
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a81f5d9e20'
+down_revision = '8e4f1c6b2a97'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+HASH_CHUNK_SIZE = 1024 * 1024
+ASSET_KINDS = {'IMAGE': 'image', 'UPLOADED_VIDEO': 'video'}
+
+media_asset = sa.table('media_asset', sa.column('id', sa.String), sa.column('kind', sa.String),
+                       sa.column('status', sa.String), sa.column('filename', sa.String),
+                       sa.column('content_hash', sa.String), sa.column('size', sa.BigInteger),
+                       sa.column('ref_count', sa.Integer), sa.column('created_at', sa.DateTime))
+slide_element = sa.table('slide_element', sa.column('id', sa.String), sa.column('element_type', sa.String),
+                         sa.column('content', sa.Text), sa.column('media_id', sa.String))
+
+
+def hash_upload(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def legacy_asset(filename, element_type):
+    path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+    if not os.path.isfile(path):
+        return None
+    return {'id': str(uuid.uuid4()), 'kind': ASSET_KINDS[element_type], 'status': 'ready', 'filename': filename,
+            'content_hash': hash_upload(path), 'size': os.path.getsize(path), 'ref_count': 0,
+            'created_at': datetime.utcnow()}
+
+
+def recount_references(connection):
+    references = (sa.select(sa.func.count(slide_element.c.id))
+                  .where(slide_element.c.media_id == media_asset.c.id)
+                  .scalar_subquery())
+    connection.execute(media_asset.update().values(ref_count=references))
+
+
+def upgrade():
+    connection = op.get_bind()
+    assets = dict(connection.execute(sa.select(media_asset.c.filename, media_asset.c.id)).all())
+    rows = connection.execute(
+        sa.select(slide_element.c.id, slide_element.c.element_type, slide_element.c.content)
+        .where(slide_element.c.element_type.in_(tuple(ASSET_KINDS)),
+               slide_element.c.media_id.is_(None), slide_element.c.content.isnot(None))
+    ).all()
+    links = []
+    created = []
+    for element_id, element_type, content in rows:
+        filename = content.split('?', 1)[0].split('/')[-1]
+        if filename and filename not in assets:
+            asset = legacy_asset(filename, element_type)
+            if asset is not None:
+                created.append(asset)
+                assets[filename] = asset['id']
+        asset_id = assets.get(filename)
+        if asset_id:
+            links.append({'element_id': element_id, 'media_id': asset_id})
+    for start in range(0, len(created), BATCH_SIZE):
+        connection.execute(media_asset.insert(), created[start:start + BATCH_SIZE])
+    update = (slide_element.update()
+              .where(slide_element.c.id == sa.bindparam('element_id'))
+              .values(media_id=sa.bindparam('media_id')))
+    for start in range(0, len(links), BATCH_SIZE):
+        connection.execute(update, links[start:start + BATCH_SIZE])
+    recount_references(connection)
+
+
+def downgrade():
+    connection = op.get_bind()
+    legacy_ids = [asset_id for (asset_id,) in connection.execute(
+        sa.select(media_asset.c.id)
+        .where(media_asset.c.content_hash != '', ~media_asset.c.filename.startswith(media_asset.c.content_hash))
+    )]
+    for start in range(0, len(legacy_ids), BATCH_SIZE):
+        batch = legacy_ids[start:start + BATCH_SIZE]
+        connection.execute(slide_element.update().where(slide_element.c.media_id.in_(batch)).values(media_id=None))
+        connection.execute(media_asset.delete().where(media_asset.c.id.in_(batch)))
+    recount_references(connection)
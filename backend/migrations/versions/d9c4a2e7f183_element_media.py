@@ -0,0 +1,30 @@
+"""link slide elements to media assets
+
+Revision ID: d9c4a2e7f183
+Revises: 7a2e6b9f4c31
+Create Date: 2026-10-18 21:22:35.561018
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9c4a2e7f183'
+down_revision = '7a2e6b9f4c31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('slide_element', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('media_id', sa.String(length=36), nullable=True))
+        batch_op.create_index(batch_op.f('ix_slide_element_media_id'), ['media_id'], unique=False)
+        batch_op.create_foreign_key('slide_element_media_id_fkey', 'media_asset', ['media_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('slide_element', schema=None) as batch_op:
+        batch_op.drop_constraint('slide_element_media_id_fkey', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_slide_element_media_id'))
+        batch_op.drop_column('media_id')
@@ -0,0 +1,28 @@
+"""store intrinsic media dimensions
+
+Revision ID: e8a5c1f3d972
+Revises: b4d2f7a8c615
+Create Date: 2026-10-18 21:20:21.378304
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a5c1f3d972'
+down_revision = 'b4d2f7a8c615'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('media_asset', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('width', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('height', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('media_asset', schema=None) as batch_op:
+        batch_op.drop_column('height')
+        batch_op.drop_column('width')
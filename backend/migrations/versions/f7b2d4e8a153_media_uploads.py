@@ -0,0 +1,36 @@
+"""record which users uploaded each media asset
+
+Revision ID: f7b2d4e8a153
+Revises: c3a81f5d9e20
+Create Date: 2026-10-18 23:02:55.271640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b2d4e8a153'
+down_revision = 'c3a81f5d9e20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('media_upload',
+    sa.Column('media_id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['media_id'], ['media_asset.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('media_id', 'user_id')
+    )
+    with op.batch_alter_table('media_upload', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_media_upload_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('media_upload', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_media_upload_user_id'))
+
+    op.drop_table('media_upload')
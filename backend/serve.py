@@ -0,0 +1,12 @@
+from gevent import monkey
+monkey.patch_all()
+
+import os
+from gevent.pywsgi import WSGIServer
+from api import create_app
+
+app = create_app()
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT') or 5000)
+    WSGIServer(('0.0.0.0', port), app).serve_forever()
\ No newline at end of file
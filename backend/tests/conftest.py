@@ -0,0 +1,26 @@
+import pytest
+from api import create_app
+from api.config import Config
+from api.extensions import db
+
+@pytest.fixture
+def make_app(tmp_path):
+    def make(create_schema=True, **overrides):
+        class TestConfig(Config):
+            TESTING = True
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+            UPLOAD_FOLDER = str(tmp_path / 'uploads')
+            UPLOAD_INCOMING_FOLDER = str(tmp_path / 'incoming')
+            EXPORT_FOLDER = str(tmp_path / 'exports')
+            SLIDE_THUMBNAIL_FOLDER = str(tmp_path / 'slides')
+            METRICS_ENABLED = False
+
+        for name, value in overrides.items():
+            setattr(TestConfig, name, value)
+        app = create_app(TestConfig)
+        if create_schema:
+            with app.app_context():
+                db.create_all()
+        return app
+
+    return make
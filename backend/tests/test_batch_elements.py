@@ -0,0 +1,95 @@
+import pytest
+from api.extensions import db
+from api.models import SlideElement
+from api.routes.elements import MAX_BATCH_OPERATIONS
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+def login(client, email):
+    client.post('/api/register', json={'email': email, 'password': 'secret1'})
+    token = client.post('/api/login', json={'email': email, 'password': 'secret1'}).get_json()['token']
+    return {'Authorization': f'Bearer {token}'}
+
+def create_deck(client, headers):
+    presentation_id = client.post('/api/presentations', json={'title': 'Batch'}, headers=headers).get_json()['id']
+    slide_id = client.get(f'/api/presentations/{presentation_id}', headers=headers).get_json()['slides'][0]['id']
+    element_id = client.post(f'/api/slides/{slide_id}/elements', json={'element_type': 'TEXT', 'content': 'Old'},
+                             headers=headers).get_json()['id']
+    return presentation_id, slide_id, element_id
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def headers(client):
+    return login(client, 'batch@example.com')
+
+def test_batch_reports_partial_failures(app, client, headers):
+    presentation_id, slide_id, element_id = create_deck(client, headers)
+    operations = [
+        {'op': 'update', 'id': element_id, 'data': {'pos_x': 42}},
+        {'op': 'create', 'slide_id': slide_id, 'data': {'element_type': 'TEXT', 'content': 'New'}},
+        {'op': 'update', 'id': 'missing'},
+        {'op': 'create', 'slide_id': slide_id, 'data': {'content': 'No type'}},
+        {'op': 'update', 'id': element_id, 'data': ['not', 'a', 'dict']},
+        'not an operation',
+        {'op': 'move'},
+    ]
+
+    response = client.patch(f'/api/presentations/{presentation_id}/elements', json={'operations': operations}, headers=headers)
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['status'] for result in results] == [200, 201, 404, 400, 400, 400, 400]
+    with app.app_context():
+        assert db.session.get(SlideElement, element_id).pos_x == 42
+        assert db.session.get(SlideElement, results[1]['id']).content == 'New'
+
+def test_batch_rejects_malformed_bodies(client, headers):
+    presentation_id, _slide_id, _element_id = create_deck(client, headers)
+    url = f'/api/presentations/{presentation_id}/elements'
+
+    assert client.patch(url, json=[{'op': 'delete', 'id': 'x'}], headers=headers).status_code == 400
+    assert client.patch(url, json={'operations': {'op': 'delete'}}, headers=headers).status_code == 400
+    assert client.patch(url, json={'operations': []}, headers=headers).status_code == 400
+    assert client.patch(url, data='not json', content_type='application/json', headers=headers).status_code == 400
+
+def test_batch_operation_limit(client, headers):
+    presentation_id, _slide_id, _element_id = create_deck(client, headers)
+    url = f'/api/presentations/{presentation_id}/elements'
+
+    at_limit = [{'op': 'delete', 'id': f'missing-{index}'} for index in range(MAX_BATCH_OPERATIONS)]
+    response = client.patch(url, json={'operations': at_limit}, headers=headers)
+    assert response.status_code == 200
+    assert len(response.get_json()['results']) == MAX_BATCH_OPERATIONS
+
+    over_limit = at_limit + [{'op': 'delete', 'id': 'one-more'}]
+    assert client.patch(url, json={'operations': over_limit}, headers=headers).status_code == 400
+
+def test_batch_only_touches_own_elements(app, client, headers):
+    presentation_id, slide_id, element_id = create_deck(client, headers)
+    other_headers = login(client, 'other@example.com')
+    other_presentation_id, _other_slide_id, other_element_id = create_deck(client, other_headers)
+
+    assert client.patch(f'/api/presentations/{presentation_id}/elements',
+                        json={'operations': [{'op': 'delete', 'id': element_id}]}, headers=other_headers).status_code == 403
+
+    operations = [
+        {'op': 'update', 'id': other_element_id, 'data': {'content': 'Hijacked'}},
+        {'op': 'delete', 'id': other_element_id},
+    ]
+    response = client.patch(f'/api/presentations/{presentation_id}/elements', json={'operations': operations}, headers=headers)
+    assert [result['status'] for result in response.get_json()['results']] == [404, 404]
+
+    with app.app_context():
+        slide_elements = db.session.query(SlideElement).filter_by(slide_id=slide_id).count()
+    operations = [{'op': 'create', 'slide_id': slide_id, 'data': {'element_type': 'TEXT'}}]
+    response = client.patch(f'/api/presentations/{other_presentation_id}/elements',
+                            json={'operations': operations}, headers=other_headers)
+    assert [result['status'] for result in response.get_json()['results']] == [404]
+    with app.app_context():
+        assert db.session.get(SlideElement, other_element_id).content == 'Old'
+        assert db.session.query(SlideElement).filter_by(slide_id=slide_id).count() == slide_elements
@@ -0,0 +1,137 @@
+import hashlib
+import io
+import os
+import pytest
+from PIL import Image
+from api.extensions import db
+from api.models import UploadSession
+from api.services import uploads
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def headers(client):
+    client.post('/api/register', json={'email': 'uploads@example.com', 'password': 'secret1'})
+    token = client.post('/api/login', json={'email': 'uploads@example.com', 'password': 'secret1'}).get_json()['token']
+    return {'Authorization': f'Bearer {token}'}
+
+def png_bytes():
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 48), 'blue').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+def incoming_files(app):
+    return sorted(os.listdir(app.config['UPLOAD_INCOMING_FOLDER']))
+
+def session_file(app, upload_id):
+    with app.app_context():
+        return uploads.session_path(db.session.get(UploadSession, upload_id))
+
+def start_upload(client, headers, data):
+    response = client.post('/api/uploads', json={'kind': 'image', 'filename': 'deck.png', 'size': len(data)}, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+def test_chunks_are_written_in_place(app, client, headers):
+    data = png_bytes()
+    upload_id = start_upload(client, headers, data)
+    half = len(data) // 2
+
+    response = client.put(f'/api/uploads/{upload_id}?offset=0', data=data[:half], headers=headers)
+
+    assert response.status_code == 200 and response.get_json()['received'] == half
+    assert incoming_files(app) == [os.path.basename(session_file(app, upload_id))]
+    with open(session_file(app, upload_id), 'rb') as f:
+        assert f.read() == data[:half]
+
+def test_corrupt_chunk_is_truncated_and_not_counted(app, client, headers):
+    data = png_bytes()
+    upload_id = start_upload(client, headers, data)
+    half = len(data) // 2
+    client.put(f'/api/uploads/{upload_id}?offset=0', data=data[:half], headers=headers)
+
+    response = client.put(f'/api/uploads/{upload_id}?offset={half}', data=data[half:],
+                          headers={**headers, 'X-Chunk-SHA256': '0' * 64})
+
+    assert response.status_code == 400 and response.get_json()['received'] == half
+    assert os.path.getsize(session_file(app, upload_id)) == half
+    with app.app_context():
+        assert db.session.get(UploadSession, upload_id).claim_token is None
+
+def test_claimed_offset_is_rejected(app, client, headers):
+    data = png_bytes()
+    upload_id = start_upload(client, headers, data)
+    with app.app_context():
+        assert uploads.claim_offset(db.session.get(UploadSession, upload_id), 0, 'other-writer')
+
+    response = client.put(f'/api/uploads/{upload_id}?offset=0', data=data, headers=headers)
+
+    assert response.status_code == 409
+    assert os.path.getsize(session_file(app, upload_id)) == 0
+
+def test_failed_write_leaves_file_alone_once_claim_is_lost(app, client, headers):
+    data = png_bytes()
+    upload_id = start_upload(client, headers, data)
+    half = len(data) // 2
+    client.put(f'/api/uploads/{upload_id}?offset=0', data=data[:half], headers=headers)
+
+    class StolenClaimStream(io.BytesIO):
+        def read(self, size=-1):
+            chunk = super().read(size)
+            if not chunk:
+                UploadSession.query.filter_by(id=upload_id).update({UploadSession.claim_token: 'other-writer'})
+                db.session.commit()
+            return chunk
+
+    with app.test_request_context():
+        session = db.session.get(UploadSession, upload_id)
+        with pytest.raises(uploads.InvalidChunk):
+            uploads.append_chunk(session, StolenClaimStream(data[half:]), half, len(data) - half, '0' * 64)
+        db.session.refresh(session)
+        assert session.received == half and session.claim_token == 'other-writer'
+    assert os.path.getsize(session_file(app, upload_id)) == len(data)
+
+def test_finalize_consumes_the_session_file(app, client, headers):
+    data = png_bytes()
+    upload_id = start_upload(client, headers, data)
+    client.put(f'/api/uploads/{upload_id}?offset=0', data=data,
+               headers={**headers, 'X-Chunk-SHA256': hashlib.sha256(data).hexdigest()})
+
+    response = client.post(f'/api/uploads/{upload_id}/finalize', headers=headers)
+
+    assert response.status_code == 200 and response.get_json()['width'] == 64
+    assert incoming_files(app) == []
+
+def test_failed_finalize_releases_the_handoff_file(app, client, headers, monkeypatch):
+    data = png_bytes()
+    upload_id = start_upload(client, headers, data)
+    client.put(f'/api/uploads/{upload_id}?offset=0', data=data, headers=headers)
+
+    def broken_store(*args):
+        raise RuntimeError('storage unavailable')
+
+    monkeypatch.setattr('api.routes.media.store_image', broken_store)
+    with pytest.raises(RuntimeError):
+        client.post(f'/api/uploads/{upload_id}/finalize', headers=headers)
+
+    assert incoming_files(app) == [os.path.basename(session_file(app, upload_id))]
+    assert client.get(f'/api/uploads/{upload_id}', headers=headers).get_json()['received'] == len(data)
+
+def test_release_removes_handoff_of_a_cancelled_upload(app, client, headers):
+    data = png_bytes()
+    upload_id = start_upload(client, headers, data)
+    client.put(f'/api/uploads/{upload_id}?offset=0', data=data, headers=headers)
+
+    with app.app_context():
+        session = db.session.get(UploadSession, upload_id)
+        handoff_path = uploads.claim_session_file(session)
+        uploads.close_session(session)
+        uploads.release_session_file(session, handoff_path)
+
+    assert incoming_files(app) == []
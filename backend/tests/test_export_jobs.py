@@ -0,0 +1,104 @@
+import os
+import pytest
+from PIL import Image
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from api.extensions import db
+from api.models import ExportJob, MediaAsset, Presentation, Slide, SlideElement, User
+from api.services import export_jobs
+from api.services.export import load_export_slides, presentation_fingerprint
+from api.services.pptx_builder import build_pptx
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def deck(app):
+    with app.app_context():
+        user = User(email='exports@example.com', password_hash='x' * 60)
+        db.session.add(user)
+        db.session.flush()
+        presentation = Presentation(title='Export', user_id=user.id)
+        db.session.add(presentation)
+        db.session.flush()
+        slide = Slide(presentation_id=presentation.id, position=1)
+        db.session.add(slide)
+        db.session.flush()
+        db.session.add(SlideElement(slide_id=slide.id, element_type='UPLOADED_VIDEO', content='clip.mp4'))
+        db.session.add(MediaAsset(kind='video', status='processing', filename='clip.mp4', content_hash='clip', size=1))
+        db.session.commit()
+        return presentation.id, user.id
+
+def queue_job(app, deck):
+    presentation_id, user_id = deck
+    with app.app_context():
+        job = ExportJob(presentation_id=presentation_id, user_id=user_id, fingerprint='f' * 64)
+        db.session.add(job)
+        db.session.commit()
+        return job.id
+
+def part_files(app):
+    folder = app.config['EXPORT_FOLDER']
+    return [name for name in os.listdir(folder) if name.endswith('.part')] if os.path.isdir(folder) else []
+
+def test_failed_export_removes_partial_file(app, deck, monkeypatch):
+    job_id = queue_job(app, deck)
+
+    def broken_export(slides, path, on_slide=None, timings=None):
+        with open(path, 'wb') as f:
+            f.write(b'partial')
+        raise RuntimeError('disk full')
+
+    monkeypatch.setattr(export_jobs, 'export_pptx', broken_export)
+    export_jobs.run_export(app, job_id)
+
+    with app.app_context():
+        job = db.session.get(ExportJob, job_id)
+        assert job.status == 'failed' and job.error == 'disk full'
+    assert part_files(app) == []
+
+def test_presentation_deleted_during_export(app, deck, monkeypatch):
+    job_id = queue_job(app, deck)
+    presentation_id, _user_id = deck
+
+    def export_while_deleted(slides, path, on_slide=None, timings=None):
+        with open(path, 'wb') as f:
+            f.write(b'partial')
+        with db.engine.begin() as connection:
+            connection.execute(ExportJob.__table__.delete().where(ExportJob.id == job_id))
+            connection.execute(Presentation.__table__.delete().where(Presentation.id == presentation_id))
+        on_slide(1, 1)
+
+    monkeypatch.setattr(export_jobs, 'export_pptx', export_while_deleted)
+    export_jobs.run_export(app, job_id)
+
+    with app.app_context():
+        assert db.session.get(ExportJob, job_id) is None
+    assert part_files(app) == []
+
+def test_fingerprint_changes_when_media_becomes_ready(app, deck):
+    presentation_id, _user_id = deck
+    with app.app_context():
+        presentation = db.session.get(Presentation, presentation_id)
+        processing = presentation_fingerprint(presentation, load_export_slides(presentation_id))
+
+        asset = MediaAsset.query.filter_by(filename='clip.mp4').one()
+        asset.status = 'ready'
+        asset.poster_filename = 'clip_poster.jpg'
+        db.session.commit()
+
+        assert presentation_fingerprint(presentation, load_export_slides(presentation_id)) != processing
+
+def test_export_embeds_images_referenced_by_signed_urls(app, deck):
+    presentation_id, _user_id = deck
+    with app.app_context():
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        Image.new('RGB', (32, 16), 'red').save(os.path.join(app.config['UPLOAD_FOLDER'], 'photo.png'))
+        slide = Slide.query.filter_by(presentation_id=presentation_id).one()
+        db.session.add(SlideElement(slide_id=slide.id, element_type='IMAGE',
+                                    content='http://localhost/api/media/files/photo.png?expires=1&signature=abc'))
+        db.session.commit()
+
+        prs, _deferred_media = build_pptx(load_export_slides(presentation_id))
+
+        assert [shape.shape_type for shape in prs.slides[0].shapes] == [MSO_SHAPE_TYPE.PICTURE]
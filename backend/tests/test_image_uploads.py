@@ -0,0 +1,88 @@
+import io
+import os
+import pytest
+from PIL import Image
+from api.extensions import db
+from api.models import MediaAsset
+from api.services.images import rendition_filenames
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def headers(client):
+    client.post('/api/register', json={'email': 'images@example.com', 'password': 'secret1'})
+    token = client.post('/api/login', json={'email': 'images@example.com', 'password': 'secret1'}).get_json()['token']
+    return {'Authorization': f'Bearer {token}'}
+
+def image_bytes(size, image_format):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'green').save(buffer, image_format)
+    return buffer.getvalue()
+
+def upload(client, headers, data, filename):
+    return client.post('/api/upload/image', data={'file': (io.BytesIO(data), filename)}, headers=headers,
+                       content_type='multipart/form-data')
+
+def uploaded_files(app):
+    folder = app.config['UPLOAD_FOLDER']
+    return sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+
+def fetch(client, url):
+    return client.get(url.replace('http://localhost', ''), follow_redirects=True)
+
+def test_non_image_upload_is_rejected(app, client, headers):
+    response = upload(client, headers, b'%PDF-1.4 not an image', 'slides.png')
+
+    assert response.status_code == 400
+    assert uploaded_files(app) == []
+    with app.app_context():
+        assert MediaAsset.query.count() == 0
+
+def test_non_image_chunked_upload_is_rejected(app, client, headers):
+    data = b'plain text pretending to be a picture'
+    upload_id = client.post('/api/uploads', json={'kind': 'image', 'filename': 'a.png', 'size': len(data)},
+                            headers=headers).get_json()['id']
+    client.put(f'/api/uploads/{upload_id}?offset=0', data=data, headers=headers)
+
+    assert client.post(f'/api/uploads/{upload_id}/finalize', headers=headers).status_code == 400
+    assert uploaded_files(app) == []
+    assert os.listdir(app.config['UPLOAD_INCOMING_FOLDER']) == []
+
+def test_image_is_stored_under_its_real_format(app, client, headers):
+    response = upload(client, headers, image_bytes((40, 30), 'PNG'), 'photo.jpg')
+
+    assert response.status_code == 200
+    with app.app_context():
+        assert MediaAsset.query.one().filename.endswith('.png')
+
+def test_webp_upload_gets_a_pptx_export_rendition(app, client, headers):
+    response = upload(client, headers, image_bytes((40, 30), 'WEBP'), 'small.webp')
+
+    export = fetch(client, response.get_json()['renditions']['export'])
+    assert export.status_code == 200
+    assert Image.open(io.BytesIO(export.data)).format == 'PNG'
+    assert fetch(client, response.get_json()['renditions']['thumb']).status_code == 200
+
+def test_webp_toggle_keeps_existing_renditions_reachable(app, client, headers):
+    asset = upload(client, headers, image_bytes((2000, 1000), 'PNG'), 'large.png').get_json()
+    app.config['IMAGE_RENDITIONS_WEBP'] = True
+
+    thumb = client.get(f"/api/media/{asset['id']}", headers=headers).get_json()['renditions']['thumb']
+    assert thumb.split('?', 1)[0].endswith('_thumb.png')
+    assert fetch(client, thumb).status_code == 200
+
+    result = app.test_cli_runner().invoke(args=['media', 'renditions'])
+    assert 'Created renditions for 1 images' in result.output
+    thumb = client.get(f"/api/media/{asset['id']}", headers=headers).get_json()['renditions']['thumb']
+    assert thumb.split('?', 1)[0].endswith('_thumb.webp')
+    assert fetch(client, thumb).status_code == 200
+
+    with app.app_context():
+        files = rendition_filenames(db.session.get(MediaAsset, asset['id']))
+    assert {name for name in uploaded_files(app) if '_' in name} <= files
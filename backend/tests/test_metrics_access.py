@@ -0,0 +1,24 @@
+def test_metrics_denied_without_token(make_app):
+    client = make_app(METRICS_ENABLED=True, METRICS_TOKEN='').test_client()
+
+    assert client.get('/metrics').status_code == 403
+    assert client.get('/metrics/slow').status_code == 403
+    assert client.get('/metrics', headers={'Authorization': 'Bearer '}).status_code == 403
+
+def test_metrics_require_matching_token(make_app):
+    client = make_app(METRICS_ENABLED=True, METRICS_TOKEN='secret').test_client()
+
+    assert client.get('/metrics').status_code == 403
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+    assert client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200
+    assert client.get('/metrics/slow', headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+def test_slow_requests_are_logged_with_structured_fields(make_app, caplog):
+    app = make_app(METRICS_ENABLED=True, METRICS_TOKEN='secret', SLOW_REQUEST_THRESHOLD_MS=0)
+
+    with caplog.at_level('WARNING', logger=app.logger.name):
+        app.test_client().post('/api/login', json={'email': 'nobody@example.com', 'password': 'secret1'})
+
+    record = next(record for record in caplog.records if record.getMessage().startswith('Slow request POST /api/login'))
+    assert record.slow_request['status'] == 401
+    assert record.slow_request['statements'] >= 1
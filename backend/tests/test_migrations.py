@@ -0,0 +1,114 @@
+import hashlib
+import os
+import sqlalchemy as sa
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import stamp, upgrade, downgrade
+from api.extensions import db
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations')
+LEGACY_UPLOAD = '3f2b8c1e-6a4d-4f0e-9b7a-2c5d8e1f4a90.png'
+LEGACY_UPLOAD_DATA = b'legacy image bytes'
+
+LEGACY_SCHEMA = [
+    """CREATE TABLE user (
+        id INTEGER NOT NULL, email VARCHAR(120) NOT NULL, password_hash VARCHAR(60) NOT NULL, created_at DATETIME,
+        PRIMARY KEY (id), UNIQUE (email))""",
+    """CREATE TABLE presentation (
+        id VARCHAR(36) NOT NULL, title VARCHAR(150) NOT NULL, created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL, user_id INTEGER NOT NULL,
+        PRIMARY KEY (id), FOREIGN KEY(user_id) REFERENCES user (id))""",
+    """CREATE TABLE slide (
+        id INTEGER NOT NULL, slide_number INTEGER NOT NULL, background_color VARCHAR(7) NOT NULL,
+        presentation_id VARCHAR(36) NOT NULL,
+        PRIMARY KEY (id), FOREIGN KEY(presentation_id) REFERENCES presentation (id))""",
+    """CREATE TABLE slide_element (
+        id VARCHAR(36) NOT NULL, element_type VARCHAR(10) NOT NULL, pos_x INTEGER NOT NULL, pos_y INTEGER NOT NULL,
+        width INTEGER NOT NULL, height INTEGER NOT NULL, content TEXT, font_size INTEGER NOT NULL,
+        slide_id INTEGER NOT NULL,
+        PRIMARY KEY (id), FOREIGN KEY(slide_id) REFERENCES slide (id))""",
+    "CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL, PRIMARY KEY (version_num))",
+    "INSERT INTO alembic_version VALUES ('0f3e2a1b9c8d')",
+    "INSERT INTO user VALUES (1, 'old@example.com', '" + 'x' * 60 + "', '2025-01-01 00:00:00')",
+    "INSERT INTO presentation VALUES ('p1', 'Old deck', '2025-01-01 00:00:00', '2025-01-02 00:00:00', 1)",
+    "INSERT INTO slide VALUES (10, 2, '#FFFFFF', 'p1')",
+    "INSERT INTO slide VALUES (11, 1, '#000000', 'p1')",
+    "INSERT INTO slide_element VALUES ('e1', 'TEXT', 1, 2, 3, 4, 'Hello', 24, 10)",
+    f"INSERT INTO slide_element VALUES ('e2', 'IMAGE', 1, 2, 3, 4, 'http://localhost:5000/static/uploads/{LEGACY_UPLOAD}', 24, 10)",
+    "INSERT INTO slide_element VALUES ('e3', 'IMAGE', 1, 2, 3, 4, 'http://localhost:5000/static/uploads/missing.png', 24, 10)",
+]
+
+def include_name(name, type_, parent_names):
+    return type_ != 'table' or not name.startswith(('slide_search', 'presentation_search'))
+
+def create_legacy_database(app):
+    with app.app_context(), db.engine.begin() as connection:
+        for sql in LEGACY_SCHEMA:
+            connection.exec_driver_sql(sql)
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    with open(os.path.join(app.config['UPLOAD_FOLDER'], LEGACY_UPLOAD), 'wb') as f:
+        f.write(LEGACY_UPLOAD_DATA)
+
+def test_legacy_database_upgrades_from_baseline(make_app):
+    app = make_app(create_schema=False)
+    create_legacy_database(app)
+
+    with app.app_context():
+        stamp(directory=MIGRATIONS, revision='1ba685dfaba3', purge=True)
+        upgrade(directory=MIGRATIONS)
+
+        inspector = sa.inspect(db.engine)
+        assert {'export_job', 'media_asset', 'media_upload', 'upload_session', 'presentation_change'} <= set(inspector.get_table_names())
+        slides = db.session.execute(sa.text('SELECT id FROM slide ORDER BY position')).scalars().all()
+        assert slides == [11, 10]
+        assert db.session.execute(sa.text('SELECT version FROM presentation')).scalar() == 1
+        assert db.session.execute(sa.text("SELECT presentation_id FROM presentation_search WHERE presentation_search MATCH 'old'")).scalar() == 'p1'
+        assert db.session.execute(sa.text("SELECT rowid FROM slide_search WHERE slide_search MATCH 'hello'")).scalar() == 10
+        asset = db.session.execute(sa.text('SELECT id, kind, status, content_hash, size, ref_count FROM media_asset')).one()
+        assert tuple(asset[1:]) == ('image', 'ready', hashlib.sha256(LEGACY_UPLOAD_DATA).hexdigest(), len(LEGACY_UPLOAD_DATA), 1)
+        links = db.session.execute(sa.text("SELECT id, media_id FROM slide_element WHERE element_type = 'IMAGE' ORDER BY id")).all()
+        assert [tuple(row) for row in links] == [('e2', asset.id), ('e3', None)]
+        db.session.execute(sa.text('PRAGMA foreign_keys=ON'))
+        db.session.execute(sa.text("DELETE FROM presentation WHERE id = 'p1'"))
+        assert db.session.execute(sa.text('SELECT count(*) FROM slide_element')).scalar() == 0
+        db.session.rollback()
+
+def test_upgraded_legacy_database_matches_models(make_app):
+    app = make_app(create_schema=False)
+    create_legacy_database(app)
+
+    with app.app_context():
+        stamp(directory=MIGRATIONS, revision='1ba685dfaba3', purge=True)
+        upgrade(directory=MIGRATIONS)
+
+        with db.engine.connect() as connection:
+            context = MigrationContext.configure(connection, opts={'include_name': include_name})
+            assert compare_metadata(context, db.metadata) == []
+
+def test_migrations_downgrade_to_baseline(make_app):
+    app = make_app(create_schema=False)
+    create_legacy_database(app)
+
+    with app.app_context():
+        stamp(directory=MIGRATIONS, revision='1ba685dfaba3', purge=True)
+        upgrade(directory=MIGRATIONS)
+        downgrade(directory=MIGRATIONS, revision='1ba685dfaba3')
+
+        assert set(sa.inspect(db.engine).get_table_names()) == {'alembic_version', 'user', 'presentation', 'slide', 'slide_element'}
+        rows = db.session.execute(sa.text('SELECT id, slide_number FROM slide ORDER BY id')).all()
+        assert [tuple(row) for row in rows] == [(10, 2), (11, 1)]
+
+def test_legacy_media_backfill_downgrades(make_app):
+    app = make_app(create_schema=False)
+    create_legacy_database(app)
+
+    with app.app_context():
+        stamp(directory=MIGRATIONS, revision='1ba685dfaba3', purge=True)
+        upgrade(directory=MIGRATIONS, revision='c3a81f5d9e20')
+        db.session.execute(sa.text("INSERT INTO media_asset (id, kind, status, filename, content_hash, size, ref_count, created_at) "
+                                   "VALUES ('m1', 'image', 'ready', '" + 'b' * 64 + ".png', '" + 'b' * 64 + "', 1, 0, '2025-01-01')"))
+        db.session.commit()
+        downgrade(directory=MIGRATIONS, revision='8e4f1c6b2a97')
+
+        assert db.session.execute(sa.text('SELECT id FROM media_asset')).scalars().all() == ['m1']
+        assert db.session.execute(sa.text("SELECT media_id FROM slide_element WHERE id = 'e2'")).scalar() is None
@@ -0,0 +1,49 @@
+import pytest
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+def login(client, email):
+    client.post('/api/register', json={'email': email, 'password': 'secret1'})
+    token = client.post('/api/login', json={'email': email, 'password': 'secret1'}).get_json()['token']
+    return token, {'Authorization': f'Bearer {token}'}
+
+@pytest.fixture
+def presentation(app):
+    client = app.test_client()
+    token, headers = login(client, 'events@example.com')
+    presentation_id = client.post('/api/presentations', json={'title': 'Events'}, headers=headers).get_json()['id']
+    return presentation_id, token, headers
+
+def test_events_accept_only_a_scoped_ticket(app, presentation):
+    presentation_id, token, headers = presentation
+    client = app.test_client()
+
+    assert client.get(f'/api/presentations/{presentation_id}/events?token={token}').status_code == 401
+    assert client.get(f'/api/presentations/{presentation_id}/events?ticket={token}').status_code == 401
+
+    ticket = client.post(f'/api/presentations/{presentation_id}/events/ticket', headers=headers).get_json()['ticket']
+    response = client.get(f'/api/presentations/{presentation_id}/events?ticket={ticket}', buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    response.close()
+
+    other = client.post('/api/presentations', json={'title': 'Other'}, headers=headers).get_json()['id']
+    assert client.get(f'/api/presentations/{other}/events?ticket={ticket}').status_code == 401
+    assert client.get('/api/presentations', headers={'Authorization': f'Bearer {ticket}'}).status_code == 401
+
+def test_events_ticket_requires_ownership(app, presentation):
+    presentation_id, _token, _headers = presentation
+    client = app.test_client()
+    _other_token, other_headers = login(client, 'intruder@example.com')
+
+    assert client.post(f'/api/presentations/{presentation_id}/events/ticket', headers=other_headers).status_code == 403
+
+def test_events_ticket_expires(app, presentation):
+    presentation_id, _token, headers = presentation
+    app.config['EVENTS_TICKET_TTL'] = -1
+    client = app.test_client()
+
+    ticket = client.post(f'/api/presentations/{presentation_id}/events/ticket', headers=headers).get_json()['ticket']
+    assert client.get(f'/api/presentations/{presentation_id}/events?ticket={ticket}').status_code == 401
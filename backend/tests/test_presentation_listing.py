@@ -0,0 +1,82 @@
+import base64
+from datetime import datetime, timedelta
+import pytest
+from api.extensions import db
+from api.models import Presentation, User
+from api.routes.presentations import MAX_PAGE_SIZE
+
+@pytest.fixture
+def app(make_app, monkeypatch):
+    monkeypatch.setattr('api.routes.presentations.schedule_regeneration', lambda app, slide_ids: None)
+    return make_app()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def headers(client):
+    client.post('/api/register', json={'email': 'listing@example.com', 'password': 'secret1'})
+    token = client.post('/api/login', json={'email': 'listing@example.com', 'password': 'secret1'}).get_json()['token']
+    return {'Authorization': f'Bearer {token}'}
+
+def create_presentations(app, count, tied=0):
+    started = datetime(2026, 1, 1)
+    with app.app_context():
+        user_id = User.query.filter_by(email='listing@example.com').one().id
+        for index in range(count):
+            updated_at = started if index < tied else started + timedelta(minutes=index)
+            db.session.add(Presentation(title=f'Deck {index}', user_id=user_id, updated_at=updated_at))
+        db.session.commit()
+        return [p.id for p in Presentation.query.order_by(Presentation.updated_at.desc(), Presentation.id.desc())]
+
+def list_page(client, headers, **params):
+    response = client.get('/api/presentations', query_string=params, headers=headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+def encoded(raw):
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def test_cursor_pages_cover_every_presentation_once(app, client, headers):
+    expected = create_presentations(app, 7, tied=4)
+
+    seen = []
+    page = list_page(client, headers, limit=2)
+    while True:
+        seen.extend(item['id'] for item in page['presentations'])
+        if page['next_cursor'] is None:
+            break
+        page = list_page(client, headers, limit=2, cursor=page['next_cursor'])
+
+    assert seen == expected
+
+def test_limit_is_clamped(app, client, headers):
+    create_presentations(app, MAX_PAGE_SIZE + 1)
+
+    page = list_page(client, headers, limit=MAX_PAGE_SIZE * 10)
+    assert len(page['presentations']) == MAX_PAGE_SIZE
+    assert page['next_cursor'] is not None
+    assert client.get('/api/presentations?limit=0', headers=headers).status_code == 400
+    assert client.get('/api/presentations?limit=-5', headers=headers).status_code == 400
+
+@pytest.mark.parametrize('cursor', ['%%%', encoded('no separator'), encoded('yesterday|abc'), '____'])
+def test_invalid_cursor_is_rejected(app, client, headers, cursor):
+    create_presentations(app, 1)
+
+    response = client.get('/api/presentations', query_string={'cursor': cursor}, headers=headers)
+
+    assert response.status_code == 400
+
+def test_unchanged_listing_is_not_modified(app, client, headers):
+    presentation_id = create_presentations(app, 3)[0]
+
+    first = client.get('/api/presentations', headers=headers)
+    etag = first.headers['ETag']
+    assert client.get('/api/presentations', headers={**headers, 'If-None-Match': etag}).status_code == 304
+    assert client.get('/api/presentations?limit=1', headers={**headers, 'If-None-Match': etag}).status_code == 200
+
+    client.put(f'/api/presentations/{presentation_id}', json={'title': 'Renamed'}, headers=headers)
+    changed = client.get('/api/presentations', headers={**headers, 'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
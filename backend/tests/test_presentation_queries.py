@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import event
+from api.extensions import db
+from api.models import Slide, SlideElement
+from api.services.slide_order import POSITION_GAP
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def headers(app):
+    client = app.test_client()
+    client.post('/api/register', json={'email': 'queries@example.com', 'password': 'secret1'})
+    token = client.post('/api/login', json={'email': 'queries@example.com', 'password': 'secret1'}).get_json()['token']
+    return {'Authorization': f'Bearer {token}'}
+
+def create_deck(app, headers, slides):
+    client = app.test_client()
+    presentation_id = client.post('/api/presentations', json={'title': f'{slides} slides'}, headers=headers).get_json()['id']
+    with app.app_context():
+        for number in range(2, slides + 1):
+            slide = Slide(presentation_id=presentation_id, position=number * POSITION_GAP)
+            db.session.add(slide)
+            db.session.flush()
+            for index in range(3):
+                db.session.add(SlideElement(slide_id=slide.id, element_type='TEXT', content=f'{number}.{index}',
+                                            pos_x=0, pos_y=0))
+        db.session.commit()
+    return presentation_id
+
+def count_queries(app, headers, presentation_id):
+    client = app.test_client()
+    assert client.get(f'/api/presentations/{presentation_id}', headers=headers).status_code == 200
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(f'/api/presentations/{presentation_id}', headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert response.status_code == 200
+    return len(statements), len(response.get_json()['slides'])
+
+def test_presentation_query_count_does_not_grow_with_slides(app, headers):
+    small, small_slides = count_queries(app, headers, create_deck(app, headers, 1))
+    large, large_slides = count_queries(app, headers, create_deck(app, headers, 50))
+
+    assert (small_slides, large_slides) == (1, 50)
+    assert small == large
@@ -0,0 +1,43 @@
+import pytest
+
+@pytest.fixture
+def client(make_app):
+    return make_app().test_client()
+
+@pytest.fixture
+def headers(client):
+    client.post('/api/register', json={'email': 'search@example.com', 'password': 'secret1'})
+    token = client.post('/api/login', json={'email': 'search@example.com', 'password': 'secret1'}).get_json()['token']
+    return {'Authorization': f'Bearer {token}'}
+
+def create_deck(client, headers, title, text=None):
+    presentation = client.post('/api/presentations', json={'title': title}, headers=headers).get_json()
+    if text is None:
+        return None
+    slide_id = client.get(f"/api/presentations/{presentation['id']}", headers=headers).get_json()['slides'][0]['id']
+    response = client.post(f'/api/slides/{slide_id}/elements', headers=headers,
+                           json={'element_type': 'TEXT', 'content': text, 'pos_x': 0, 'pos_y': 0})
+    assert response.status_code == 201
+    return slide_id
+
+def test_title_and_slide_hits_share_one_ranking(client, headers):
+    create_deck(client, headers, 'Бюджет')
+    create_deck(client, headers, 'Отчёт о продажах за квартал и бюджет отдела маркетинга')
+    create_deck(client, headers, 'Итоги')
+    focused = create_deck(client, headers, 'Рабочая', 'Бюджет бюджет бюджет на год')
+    passing = create_deck(client, headers, 'Другая', 'В этом разделе мы обсуждаем продажи, клиентов, рынок, '
+                                                      'команду, найм, сроки и между прочим бюджет')
+
+    results = client.get('/api/search?q=бюджет', headers=headers).get_json()['results']
+
+    assert [(result['title'], result['slide_id']) for result in results] == [
+        ('Бюджет', None),
+        ('Рабочая', focused),
+        ('Отчёт о продажах за квартал и бюджет отдела маркетинга', None),
+        ('Другая', passing),
+    ]
+    scores = [result['score'] for result in results]
+    assert scores[0] == 1.0 and scores == sorted(scores, reverse=True) and len(set(scores)) == len(scores)
+
+    limited = client.get('/api/search?q=бюджет&limit=2', headers=headers).get_json()['results']
+    assert [(result['title'], result['slide_id']) for result in limited] == [('Бюджет', None), ('Рабочая', focused)]
@@ -0,0 +1,49 @@
+import pytest
+from api.extensions import db
+from api.models import MediaAsset, Slide, SlideElement
+from api.services.slide_thumbnails import (invalidate_media_thumbnails, load_snapshot, regenerate_slide, snapshot_hash,
+                                           thumbnail_url)
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def slide_id(app):
+    client = app.test_client()
+    client.post('/api/register', json={'email': 'thumbs@example.com', 'password': 'secret1'})
+    token = client.post('/api/login', json={'email': 'thumbs@example.com', 'password': 'secret1'}).get_json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+    presentation_id = client.post('/api/presentations', json={'title': 'Thumbs'}, headers=headers).get_json()['id']
+    return client.get(f'/api/presentations/{presentation_id}', headers=headers).get_json()['slides'][0]['id']
+
+def test_thumbnail_requires_signed_url(app, slide_id):
+    with app.test_request_context():
+        url = thumbnail_url(regenerate_slide(slide_id)).replace('http://localhost', '')
+
+    client = app.test_client()
+    assert client.get(url.split('?', 1)[0]).status_code == 403
+    assert client.get(url.replace('signature=', 'signature=0')).status_code == 403
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'].startswith('private,')
+
+def test_thumbnail_hash_follows_media_state(app, slide_id):
+    with app.test_request_context():
+        asset = MediaAsset(kind='video', status='processing', filename=f"{'a' * 64}.mp4", content_hash='a' * 64, size=1)
+        db.session.add(asset)
+        db.session.flush()
+        db.session.add(SlideElement(slide_id=slide_id, element_type='UPLOADED_VIDEO', content=f'/media/files/{asset.filename}',
+                                    media_id=asset.id, pos_x=0, pos_y=0))
+        db.session.commit()
+        processing = snapshot_hash(load_snapshot(slide_id))
+        db.session.query(Slide).filter_by(id=slide_id).update({Slide.thumbnail_hash: processing})
+        db.session.commit()
+
+        asset.status = 'ready'
+        asset.poster_filename = f"{'a' * 64}_poster.jpg"
+        invalidate_media_thumbnails(asset)
+        db.session.commit()
+
+        assert db.session.get(Slide, slide_id).thumbnail_hash is None
+        assert snapshot_hash(load_snapshot(slide_id)) != processing
@@ -0,0 +1,93 @@
+import http.server
+import logging
+import threading
+import time
+import pytest
+from api.services.youtube_thumbnails import ThumbnailFetcher, THUMBNAIL_NAMES
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        _empty, video_id, name = self.path.split('/')
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.connections.add(self.client_address)
+            statuses = server.statuses.get(video_id, [404] * len(THUMBNAIL_NAMES))
+            status = statuses[THUMBNAIL_NAMES.index(name)]
+        if status == 'slow':
+            time.sleep(server.delay)
+            status = 200
+        body = b'jpeg' if status == 200 else b''
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.connections = set()
+    server.statuses = {}
+    server.delay = 1
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def make_fetcher(stub_server, tmp_path):
+    fetchers = []
+
+    def make(timeout=2, max_workers=1):
+        fetcher = ThumbnailFetcher(f'http://127.0.0.1:{stub_server.server_port}', str(tmp_path), 60, 60, timeout, max_workers,
+                                   logging.getLogger(__name__))
+        fetchers.append(fetcher)
+        return fetcher
+
+    yield make
+    for fetcher in fetchers:
+        fetcher.session.close()
+
+@pytest.mark.parametrize('statuses, content, cached', [
+    ([404, 404, 404], None, True),
+    ([404, 429, 404], None, False),
+    ([503, 404, 404], None, False),
+    ([500, 200, 404], b'jpeg', True),
+])
+def test_only_not_found_is_cached_as_missing(stub_server, make_fetcher, statuses, content, cached):
+    stub_server.statuses['abcdefghijk'] = statuses
+    fetcher = make_fetcher()
+
+    assert fetcher.fetch('abcdefghijk') == content
+    first_requests = len(stub_server.requests)
+    assert fetcher.fetch('abcdefghijk') == content
+    assert (len(stub_server.requests) == first_requests) == cached
+
+def test_slow_server_times_out_without_caching(stub_server, make_fetcher):
+    stub_server.statuses['slowslowslo'] = ['slow'] * len(THUMBNAIL_NAMES)
+    fetcher = make_fetcher(timeout=0.2)
+
+    started = time.monotonic()
+    assert fetcher.fetch('slowslowslo') is None
+    assert time.monotonic() - started < len(THUMBNAIL_NAMES) * stub_server.delay
+
+    stub_server.statuses['slowslowslo'] = [200] * len(THUMBNAIL_NAMES)
+    assert fetcher.fetch('slowslowslo') == b'jpeg'
+
+def test_connections_are_pooled_across_downloads(stub_server, make_fetcher):
+    video_ids = [f'video{index:06d}' for index in range(12)]
+    for video_id in video_ids:
+        stub_server.statuses[video_id] = [404, 200, 404]
+    fetcher = make_fetcher(max_workers=3)
+
+    assert fetcher.fetch_many(video_ids) == {video_id: b'jpeg' for video_id in video_ids}
+    assert len(stub_server.requests) == 2 * len(video_ids)
+    assert len(stub_server.connections) <= 3
@@ -3,6 +3,7 @@ import { Rnd, RndDragCallback, RndResizeCallback } from 'react-rnd';
 import { Box } from '@mui/material';
 import TextareaAutosize from 'react-textarea-autosize';
 import { SlideElement } from '../../hooks/usePresentation';
+import { renditionUrl } from '../../services/apiService';
 
 interface EditableElementProps {
   element: SlideElement;
@@ -87,7 +88,7 @@ export const EditableElement: React.FC<EditableElementProps> = ({
       case 'IMAGE':
         return element.content ? (
           <img 
-            src={element.content} 
+            src={renditionUrl(element.content, 'editor')} 
             alt="slide element" 
             style={{ width: '100%', height: '100%', objectFit: 'contain', pointerEvents: 'none' }}
             onDragStart={(e) => e.preventDefault()}
@@ -5,11 +5,12 @@ import EditIcon from '@mui/icons-material/Edit';
 import TextFieldsIcon from '@mui/icons-material/TextFields';
 import ImageIcon from '@mui/icons-material/Image';
 import VideoLibraryIcon from '@mui/icons-material/VideoLibrary';
-import { useAuth } from '../../context/AuthContext';
-import apiClient from '../../services/apiService';
+import apiClient, { uploadInChunks } from '../../services/apiService';
 import { useNotification } from '../../context/NotificationContext';
 import { SlideElement } from '../../hooks/usePresentation';
 
+const EXPORT_POLL_INTERVAL = 1000;
+
 interface EditorToolbarProps {
   title: string;
   presentationId: string;
@@ -19,18 +20,23 @@ interface EditorToolbarProps {
 }
 
 export const EditorToolbar: React.FC<EditorToolbarProps> = ({ title, presentationId, onRenameClick, onAddElement, onAddVideoClick }) => {
-  const { token } = useAuth();
   const { showNotification } = useNotification();
   const fileInputRef = useRef<HTMLInputElement>(null);
 
-  const handleDownload = () => {
-    const url = `http://127.0.0.1:5000/api/presentations/${presentationId}/download`;
-    fetch(url, {
-      headers: { 'Authorization': `Bearer ${token}` }
-    })
-    .then(res => res.blob())
-    .then(blob => {
-      const href = window.URL.createObjectURL(blob);
+  const handleDownload = async () => {
+    try {
+      let { data: job } = await apiClient.post(`/presentations/${presentationId}/exports`);
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, EXPORT_POLL_INTERVAL));
+        ({ data: job } = await apiClient.get(`/exports/${job.id}`));
+      }
+      if (job.status !== 'done') {
+        showNotification('Не удалось экспортировать презентацию', 'error');
+        return;
+      }
+
+      const response = await apiClient.get(`/exports/${job.id}/file`, { responseType: 'blob' });
+      const href = window.URL.createObjectURL(response.data);
       const link = document.createElement('a');
       link.href = href;
       link.setAttribute('download', `${title}.pptx`);
@@ -38,21 +44,18 @@ export const EditorToolbar: React.FC<EditorToolbarProps> = ({ title, presentatio
       link.click();
       document.body.removeChild(link);
       window.URL.revokeObjectURL(href);
-    });
+    } catch (error) {
+      showNotification('Не удалось экспортировать презентацию', 'error');
+    }
   };
 
   const handleImageUpload = async (event: React.ChangeEvent<HTMLInputElement>) => {
     const file = event.target.files?.[0];
     if (!file) return;
 
-    const formData = new FormData();
-    formData.append('file', file);
-
     try {
-      const response = await apiClient.post('/upload/image', formData, {
-        headers: { 'Content-Type': 'multipart/form-data' },
-      });
-      onAddElement('IMAGE', response.data.url);
+      const media = await uploadInChunks(file, 'image');
+      onAddElement('IMAGE', media.url);
     } catch (error) {
       showNotification('Не удалось загрузить изображение', 'error');
     }
@@ -26,7 +26,7 @@ interface SlideListProps {
   onSelectSlide: (id: number) => void;
   onAddSlide: () => void;
   onDeleteSlide: (id: number) => void;
-  onReorderSlides: (reorderedSlides: Slide[]) => void;
+  onReorderSlides: (reorderedSlides: Slide[], movedSlideId: number) => void;
 }
 
 const THUMBNAIL_WIDTH = 140;
@@ -62,14 +62,18 @@ const SortableSlideItem = ({ slide, index, activeSlideId, onSelectSlide, onDelet
             display: 'block',
           }}
         >
-          <Box sx={{
-            transform: `scale(${SCALE_FACTOR})`,
-            transformOrigin: 'top left',
-            width: BASE_SLIDE_WIDTH,
-            height: BASE_SLIDE_WIDTH * (9 / 16),
-          }}>
-            <SlidePreview slide={slide} />
-          </Box>
+          {slide.thumbnail_url ? (
+            <img src={slide.thumbnail_url} alt="" style={{ width: '100%', height: '100%', display: 'block' }} />
+          ) : (
+            <Box sx={{
+              transform: `scale(${SCALE_FACTOR})`,
+              transformOrigin: 'top left',
+              width: BASE_SLIDE_WIDTH,
+              height: BASE_SLIDE_WIDTH * (9 / 16),
+            }}>
+              <SlidePreview slide={slide} />
+            </Box>
+          )}
         </Box>
       </Box>
       <Tooltip title="Удалить слайд">
@@ -91,7 +95,7 @@ export const SlideList: React.FC<SlideListProps> = ({ slides, activeSlideId, onS
       const oldIndex = slides.findIndex((s) => s.id === active.id);
       const newIndex = slides.findIndex((s) => s.id === over.id);
       const reorderedSlides = arrayMove(slides, oldIndex, newIndex);
-      onReorderSlides(reorderedSlides);
+      onReorderSlides(reorderedSlides, active.id as number);
     }
   };
 
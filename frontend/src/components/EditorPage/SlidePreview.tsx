@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { Paper, Box, CircularProgress } from '@mui/material';
 import PlayCircleOutlineIcon from '@mui/icons-material/PlayCircleOutline';
 import { Slide, SlideElement } from '../../hooks/usePresentation';
+import { renditionUrl } from '../../services/apiService';
 
 const ElementPreview: React.FC<{ element: SlideElement }> = ({ element }) => {
     const [thumb, setThumb] = useState<string | null>(null);
@@ -37,7 +38,7 @@ const ElementPreview: React.FC<{ element: SlideElement }> = ({ element }) => {
         case 'IMAGE':
             content = element.content ? (
                 <img 
-                    src={element.content} 
+                    src={renditionUrl(element.content, 'thumb')} 
                     alt=""
                     style={{ width: '100%', height: '100%', objectFit: 'contain' }}
                 />
@@ -4,14 +4,13 @@ import MoreVertIcon from '@mui/icons-material/MoreVert';
 import { Link } from 'react-router-dom';
 import apiClient from '../../services/apiService';
 import { useNotification } from '../../context/NotificationContext';
-import { SlidePreview } from '../EditorPage/SlidePreview';
-import { Slide } from '../../hooks/usePresentation';
 
 interface Presentation {
   id: string;
   title: string;
   updated_at: string;
-  first_slide: Slide | null;
+  background_color: string | null;
+  thumbnail_url: string | null;
 }
 
 interface PresentationCardProps {
@@ -20,10 +19,6 @@ interface PresentationCardProps {
   onUpdate: (presentation: Presentation) => void;
 }
 
-const BASE_SLIDE_WIDTH = 1280; 
-const THUMBNAIL_WIDTH = 270; 
-const SCALE_FACTOR = THUMBNAIL_WIDTH / BASE_SLIDE_WIDTH;
-
 
 export const PresentationCard: React.FC<PresentationCardProps> = ({ presentation, onDelete, onUpdate }) => {
   const { showNotification } = useNotification();
@@ -86,15 +81,15 @@ export const PresentationCard: React.FC<PresentationCardProps> = ({ presentation
             position: 'relative',
           }}
         >
-          {presentation.first_slide ? (
-             <Box sx={{
-                transform: `scale(${SCALE_FACTOR})`,
-                transformOrigin: 'top left',
-                width: BASE_SLIDE_WIDTH,
-                height: BASE_SLIDE_WIDTH * (9 / 16),
-              }}>
-                <SlidePreview slide={presentation.first_slide} />
-              </Box>
+          {presentation.thumbnail_url ? (
+            <img
+              src={presentation.thumbnail_url}
+              alt=""
+              loading="lazy"
+              style={{ width: '100%', height: '100%', objectFit: 'cover', display: 'block' }}
+            />
+          ) : presentation.background_color ? (
+            <Box sx={{ height: '100%', bgcolor: presentation.background_color }} />
           ) : (
             <Box sx={{ height: '100%', display: 'flex', alignItems: 'center', justifyContent: 'center' }}>
               <Typography variant="caption" color="text.secondary">Пустая презентация</Typography>
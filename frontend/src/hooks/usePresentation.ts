@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import apiClient from '../services/apiService';
 import { useNotification } from '../context/NotificationContext';
 import { useDebounce } from './useDebounce';
@@ -19,15 +19,87 @@ export interface Slide {
   id: number;
   slide_number: number;
   background_color: string;
+  thumbnail_url?: string | null;
   elements: SlideElement[];
 }
 
 export interface PresentationData {
   id: string;
   title: string;
+  version: number;
   slides: Slide[];
 }
 
+interface PresentationChange {
+  revision: number;
+  op: 'element.create' | 'element.update' | 'element.delete' | 'slide.create' | 'slide.update' | 'slide.delete' | 'slide.reorder' | 'slide.move' | 'presentation.update';
+  target_id: string;
+  payload: any;
+}
+
+interface ChangesResponse {
+  revision: number;
+  reset: boolean;
+  changes: PresentationChange[];
+}
+
+const CHANGES_POLL_INTERVAL = 30000;
+const EVENTS_RECONNECT_DELAY = 3000;
+
+const applyChange = (state: PresentationData, change: PresentationChange): PresentationData => {
+  const { payload } = change;
+  switch (change.op) {
+    case 'element.create':
+    case 'element.update': {
+      const { slide_id, ...element } = payload;
+      return {
+        ...state,
+        slides: state.slides.map(s => {
+          if (s.id !== slide_id) return s;
+          const exists = s.elements.some(e => e.id === element.id);
+          return { ...s, thumbnail_url: null, elements: exists ? s.elements.map(e => e.id === element.id ? element : e) : [...s.elements, element] };
+        }),
+      };
+    }
+    case 'element.delete':
+      return { ...state, slides: state.slides.map(s => s.id === payload.slide_id ? { ...s, thumbnail_url: null, elements: s.elements.filter(e => e.id !== change.target_id) } : s) };
+    case 'slide.create': {
+      if (state.slides.some(s => s.id === payload.id)) return state;
+      const slides = [...state.slides];
+      slides.splice(payload.slide_number - 1, 0, payload);
+      return { ...state, slides: slides.map((s, index) => ({ ...s, slide_number: index + 1 })) };
+    }
+    case 'slide.update':
+      return { ...state, slides: state.slides.map(s => String(s.id) === change.target_id ? { ...s, ...payload, thumbnail_url: null } : s) };
+    case 'slide.delete':
+      return { ...state, slides: state.slides.filter(s => String(s.id) !== change.target_id) };
+    case 'slide.reorder': {
+      const order: number[] = payload.slide_ids;
+      const slides = [...state.slides].sort((a, b) => order.indexOf(a.id) - order.indexOf(b.id));
+      return { ...state, slides: slides.map((s, index) => ({ ...s, slide_number: index + 1 })) };
+    }
+    case 'slide.move': {
+      const moved = state.slides.find(s => String(s.id) === change.target_id);
+      if (!moved) return state;
+      const slides = state.slides.filter(s => s !== moved);
+      slides.splice(payload.after_slide_id === null ? 0 : slides.findIndex(s => s.id === payload.after_slide_id) + 1, 0, moved);
+      return { ...state, slides: slides.map((s, index) => ({ ...s, slide_number: index + 1 })) };
+    }
+    case 'presentation.update':
+      return { ...state, ...payload };
+    default:
+      return state;
+  }
+};
+
+interface BatchResult {
+  op: 'create' | 'update' | 'delete' | null;
+  id?: string;
+  status: number;
+  message?: string;
+  element?: SlideElement;
+}
+
 export const usePresentation = (presentationId?: string) => {
   const [presentation, setPresentation] = useState<PresentationData | null>(null);
   const [activeSlide, setActiveSlide] = useState<Slide | null>(null);
@@ -35,12 +107,14 @@ export const usePresentation = (presentationId?: string) => {
   const { showNotification } = useNotification();
   const [pendingUpdates, setPendingUpdates] = useState<Record<string, Partial<SlideElement>>>({});
   const debouncedUpdates = useDebounce(pendingUpdates, 500);
+  const revisionRef = useRef(0);
 
   const fetchPresentation = useCallback(async () => {
     if (!presentationId) return;
     try {
       setLoading(true);
       const response = await apiClient.get<PresentationData>(`/presentations/${presentationId}`);
+      revisionRef.current = response.data.version;
       setPresentation(response.data);
       if (response.data.slides.length > 0) {
         setActiveSlide(response.data.slides[0]);
@@ -56,6 +130,72 @@ export const usePresentation = (presentationId?: string) => {
     fetchPresentation();
   }, [fetchPresentation]);
 
+  const syncChanges = useCallback(async () => {
+    if (!presentationId || revisionRef.current === 0) return;
+    try {
+      const { data } = await apiClient.get<ChangesResponse>(`/presentations/${presentationId}/changes`, {
+        params: { since: revisionRef.current },
+      });
+      if (data.reset) {
+        fetchPresentation();
+        return;
+      }
+      if (data.changes.length === 0) return;
+      revisionRef.current = data.revision;
+      setPresentation(prev => {
+        if (!prev) return null;
+        const newState = data.changes.reduce(applyChange, prev);
+        setActiveSlide(active => newState.slides.find(s => s.id === active?.id) || newState.slides[0] || null);
+        return newState;
+      });
+    } catch (error) {
+      console.error('Failed to sync presentation changes', error);
+    }
+  }, [presentationId, fetchPresentation]);
+
+  useEffect(() => {
+    if (!presentationId) return;
+    let source: EventSource | null = null;
+    let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+    let closed = false;
+
+    const connect = async () => {
+      try {
+        const { data } = await apiClient.post<{ ticket: string }>(`/presentations/${presentationId}/events/ticket`);
+        if (closed) return;
+        const ticket = encodeURIComponent(data.ticket);
+        source = new EventSource(`${apiClient.defaults.baseURL}/presentations/${presentationId}/events?ticket=${ticket}`);
+        source.onmessage = (event) => {
+          const { revision } = JSON.parse(event.data);
+          if (revision > revisionRef.current) syncChanges();
+        };
+        source.onerror = () => {
+          source?.close();
+          if (!closed) reconnectTimer = setTimeout(connect, EVENTS_RECONNECT_DELAY);
+        };
+      } catch (error) {
+        console.error('Failed to open presentation events', error);
+        if (!closed) reconnectTimer = setTimeout(connect, EVENTS_RECONNECT_DELAY);
+      }
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(reconnectTimer);
+      source?.close();
+    };
+  }, [presentationId, syncChanges]);
+
+  useEffect(() => {
+    const interval = setInterval(syncChanges, CHANGES_POLL_INTERVAL);
+    window.addEventListener('focus', syncChanges);
+    return () => {
+      clearInterval(interval);
+      window.removeEventListener('focus', syncChanges);
+    };
+  }, [syncChanges]);
+
   const updatePresentationState = (updateFunc: (prev: PresentationData | null) => PresentationData | null) => {
     setPresentation(prev => {
         const newState = updateFunc(prev);
@@ -67,6 +207,16 @@ export const usePresentation = (presentationId?: string) => {
     });
   };
 
+  const saveElementUpdates = useCallback(async (updates: Record<string, Partial<SlideElement>>) => {
+    if (!presentationId) return;
+    const operations = Object.entries(updates).map(([id, data]) => ({ op: 'update', id, data }));
+    if (operations.length === 0) return;
+    const response = await apiClient.patch<{ results: BatchResult[] }>(`/presentations/${presentationId}/elements`, { operations });
+    if (response.data.results.some(result => result.status >= 400)) {
+      throw new Error('Some element updates failed');
+    }
+  }, [presentationId]);
+
   useEffect(() => {
     const savePendingUpdates = async () => {
         if (Object.keys(debouncedUpdates).length === 0) return;
@@ -75,18 +225,14 @@ export const usePresentation = (presentationId?: string) => {
         setPendingUpdates({});
 
         try {
-            await Promise.all(
-                Object.entries(updatesToSave).map(([id, data]) => 
-                    apiClient.put(`/elements/${id}`, data)
-                )
-            );
+            await saveElementUpdates(updatesToSave);
         } catch (error) {
             showNotification('Ошибка сохранения элементов', 'error');
         }
     };
 
     savePendingUpdates();
-  }, [debouncedUpdates, showNotification]);
+  }, [debouncedUpdates, saveElementUpdates, showNotification]);
 
   const handleUpdateMultipleElements = useCallback((updates: Record<string, Partial<SlideElement>>, saveImmediately: boolean) => {
     if (!activeSlide) return;
@@ -97,6 +243,7 @@ export const usePresentation = (presentationId?: string) => {
             if (s.id === activeSlide.id) {
                 return {
                     ...s,
+                    thumbnail_url: null,
                     elements: s.elements.map(e => updates[e.id] ? { ...e, ...updates[e.id] } : e)
                 };
             }
@@ -106,17 +253,13 @@ export const usePresentation = (presentationId?: string) => {
     });
 
     if (saveImmediately) {
-        Object.entries(updates).forEach(async ([id, data]) => {
-            try {
-                await apiClient.put(`/elements/${id}`, data);
-            } catch (error) {
-                showNotification('Ошибка сохранения элемента', 'error');
-            }
+        saveElementUpdates(updates).catch(() => {
+            showNotification('Ошибка сохранения элемента', 'error');
         });
     } else {
         setPendingUpdates(prev => ({...prev, ...updates}));
     }
-  }, [activeSlide]);
+  }, [activeSlide, saveElementUpdates, showNotification]);
 
   const handleUpdateElement = useCallback((elementId: string, data: Partial<SlideElement>) => {
     handleUpdateMultipleElements({ [elementId]: data }, true);
@@ -170,15 +313,16 @@ export const usePresentation = (presentationId?: string) => {
     }
   };
   
-  const handleReorderSlides = useCallback(async (reorderedSlides: Slide[]) => {
+  const handleReorderSlides = useCallback(async (reorderedSlides: Slide[], movedSlideId: number) => {
     if (!presentation) return;
 
     const originalSlides = presentation.slides;
-    updatePresentationState(prev => prev ? { ...prev, slides: reorderedSlides } : null);
+    updatePresentationState(prev => prev ? { ...prev, slides: reorderedSlides.map((s, index) => ({ ...s, slide_number: index + 1 })) } : null);
 
-    const slideIds = reorderedSlides.map(s => s.id);
+    const newIndex = reorderedSlides.findIndex(s => s.id === movedSlideId);
+    const afterSlideId = newIndex > 0 ? reorderedSlides[newIndex - 1].id : null;
     try {
-      await apiClient.put(`/presentations/${presentation.id}/slides/reorder`, { slide_ids: slideIds });
+      await apiClient.put(`/slides/${movedSlideId}/move`, { after_slide_id: afterSlideId });
     } catch (error) {
       showNotification('Не удалось сохранить порядок', 'error');
       updatePresentationState(prev => prev ? { ...prev, slides: originalSlides } : null);
@@ -223,7 +367,7 @@ export const usePresentation = (presentationId?: string) => {
       
       updatePresentationState(prev => {
         if (!prev) return null;
-        const newSlides = prev.slides.map(s => s.id === activeSlide.id ? { ...s, elements: [...s.elements, createdElement] } : s);
+        const newSlides = prev.slides.map(s => s.id === activeSlide.id ? { ...s, thumbnail_url: null, elements: [...s.elements, createdElement] } : s);
         return { ...prev, slides: newSlides };
       });
     } catch (error: any) {
@@ -238,7 +382,7 @@ export const usePresentation = (presentationId?: string) => {
       await apiClient.delete(`/elements/${elementId}`);
       updatePresentationState(prev => {
         if (!prev) return null;
-        const newSlides = prev.slides.map(s => s.id === activeSlide.id ? { ...s, elements: s.elements.filter(e => e.id !== elementId) } : s);
+        const newSlides = prev.slides.map(s => s.id === activeSlide.id ? { ...s, thumbnail_url: null, elements: s.elements.filter(e => e.id !== elementId) } : s);
         return { ...prev, slides: newSlides };
       });
     } catch (error) { showNotification('Не удалось удалить элемент', 'error'); }
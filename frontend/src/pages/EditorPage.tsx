@@ -5,11 +5,12 @@ import { usePresentation, SlideElement } from '../hooks/usePresentation';
 import { SlideList } from '../components/EditorPage/SlideList';
 import { SlideEditor } from '../components/EditorPage/SlideEditor';
 import { EditorToolbar } from '../components/EditorPage/EditorToolbar';
-import apiClient from '../services/apiService';
+import apiClient, { uploadInChunks } from '../services/apiService';
 import { useNotification } from '../context/NotificationContext';
 
 const BASE_WIDTH = 1280;
 const BASE_HEIGHT = 720;
+const MEDIA_POLL_INTERVAL = 1500;
 
 const VisuallyHiddenInput = styled('input')({
     clip: 'rect(0 0 0 0)',
@@ -116,14 +117,19 @@ export const EditorPage = () => {
     const file = event.target.files?.[0];
     if (!file) return;
 
-    const formData = new FormData();
-    formData.append('file', file);
     setIsUploading(true);
     try {
-        const response = await apiClient.post('/upload/video', formData, {
-            headers: { 'Content-Type': 'multipart/form-data' },
-        });
-        handleAddElement('UPLOADED_VIDEO', response.data.url);
+        let media = await uploadInChunks(file, 'video');
+        while (media.status === 'processing') {
+            await new Promise(resolve => setTimeout(resolve, MEDIA_POLL_INTERVAL));
+            ({ data: media } = await apiClient.get(`/media/${media.id}`));
+        }
+        if (media.status !== 'ready') {
+            showNotification(media.error || 'Не удалось обработать видео', 'error');
+            setIsUploading(false);
+            return;
+        }
+        handleAddElement('UPLOADED_VIDEO', media.url);
         handleCloseVideoModal();
     } catch (error) {
         showNotification('Не удалось загрузить видео', 'error');
@@ -1,25 +1,33 @@
 import React, { useState, useEffect, useCallback } from 'react';
-import { Container, Typography, Grid, Box, Divider, CircularProgress } from '@mui/material';
+import { Container, Typography, Grid, Box, Divider, CircularProgress, Button } from '@mui/material';
 import apiClient from '../services/apiService';
 import { CreatePresentationCard } from '../components/HomePage/CreatePresentationCard';
 import { PresentationCard } from '../components/HomePage/PresentationCard';
-import { Slide } from '../hooks/usePresentation';
 
 interface Presentation {
   id: string;
   title: string;
   updated_at: string;
-  first_slide: Slide | null;
+  background_color: string | null;
+  thumbnail_url: string | null;
+}
+
+interface PresentationPage {
+  presentations: Presentation[];
+  next_cursor: string | null;
 }
 
 export const HomePage = () => {
   const [presentations, setPresentations] = useState<Presentation[]>([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const fetchPresentations = useCallback(async () => {
     try {
-      const response = await apiClient.get('/presentations');
-      setPresentations(response.data);
+      const response = await apiClient.get<PresentationPage>('/presentations');
+      setPresentations(response.data.presentations);
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       console.error("Failed to fetch presentations:", error);
     } finally {
@@ -27,6 +35,20 @@ export const HomePage = () => {
     }
   }, []);
 
+  const fetchMorePresentations = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await apiClient.get<PresentationPage>('/presentations', { params: { cursor: nextCursor } });
+      setPresentations(prev => [...prev, ...response.data.presentations]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error("Failed to fetch presentations:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchPresentations();
   }, [fetchPresentations]);
@@ -73,6 +95,13 @@ export const HomePage = () => {
             ))}
           </Grid>
         )}
+        {nextCursor && (
+          <Box sx={{ display: 'flex', justifyContent: 'center', mt: 4 }}>
+            <Button variant="outlined" onClick={fetchMorePresentations} disabled={loadingMore}>
+              {loadingMore ? <CircularProgress size={24} /> : 'Показать еще'}
+            </Button>
+          </Box>
+        )}
       </Box>
     </Container>
   );
@@ -34,4 +34,41 @@ export const setupInterceptors = (logout: () => void) => {
   );
 };
 
+export type RenditionSize = 'thumb' | 'editor' | 'export';
+
+export const renditionUrl = (url: string, size: RenditionSize) => {
+  const marker = '/media/files/';
+  const index = url.indexOf(marker);
+  if (index === -1) return url;
+  return `${apiClient.defaults.baseURL}/media/renditions/${size}/${url.slice(index + marker.length)}`;
+};
+
+const UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024;
+const UPLOAD_MAX_RETRIES = 5;
+
+export type UploadKind = 'image' | 'video';
+
+export const uploadInChunks = async (file: File, kind: UploadKind) => {
+  const { data: session } = await apiClient.post('/uploads', { kind, filename: file.name, size: file.size });
+  let offset = session.received;
+  let retries = 0;
+  while (offset < file.size) {
+    const chunk = file.slice(offset, offset + UPLOAD_CHUNK_SIZE);
+    try {
+      const { data } = await apiClient.put(`/uploads/${session.id}`, chunk, {
+        params: { offset },
+        headers: { 'Content-Type': 'application/octet-stream' },
+      });
+      offset = data.received;
+      retries = 0;
+    } catch (error) {
+      if (++retries > UPLOAD_MAX_RETRIES) throw error;
+      await new Promise(resolve => setTimeout(resolve, 1000 * retries));
+      ({ data: { received: offset } } = await apiClient.get(`/uploads/${session.id}`));
+    }
+  }
+  const response = await apiClient.post(`/uploads/${session.id}/finalize`);
+  return response.data;
+};
+
 export default apiClient;
\ No newline at end of file